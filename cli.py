@@ -1,22 +1,57 @@
 #!/usr/bin/env python
 
+import asyncio
 import logging
 import sys
-from time import time
-from typing import List
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, List
 
 import click
 from progress.bar import Bar
 from tabulate import tabulate
 
-from wordle.config import DATA_ROOT, LOG_LEVEL, MAX_ATTEMPTS
-from wordle.game import Wordle
+from wordle.benchmark import (
+    BenchmarkProfiler,
+    RecordWriter,
+    load_allowed,
+    load_benchmark,
+    run_benchmark,
+    sample_secrets,
+    summarize,
+)
+from wordle.bulk import run_bulk
+from wordle.config import (
+    DATA_ROOT,
+    LOG_LEVEL,
+    MAX_ATTEMPTS,
+    PARALLEL_TREE_DEPTH,
+    PERF_THRESHOLD,
+    TREE_SUFFIX,
+)
+from wordle.dictionary import load_named_dictionary
+from wordle.game import MultiWordle, Wordle
+from wordle.perf import (
+    BASELINES,
+    PERF_DICTIONARIES,
+    baselines_environments,
+    compare,
+    environment,
+    load_baselines,
+    perf_cases,
+    run_suite,
+    save_baselines,
+)
+from wordle.server import HintServer
+from wordle.tree_analysis import analyze_tree
+from wordle.player.multi_player import MultiPlayer
 from wordle.player.player import Player
-from wordle.strategy import Strategy, StrategyError
-from wordle.strategy.heuristic_strategy import HeuristicStrategy
-from wordle.strategy.minmax_strategy import MinMaxStrategy
+from wordle.strategy import StrategyError
+from wordle.strategy.factory import precomputed_filename, select_strategy
+from wordle.strategy.multi_board_strategy import MultiBoardStrategy
+from wordle.strategy.optimal_solver import OBJECTIVES, OptimalSolver, SolverStats
 from wordle.strategy.precomputed_strategy import PrecomputedStrategy
-from wordle.utils import load_words
 
 
 @click.group()
@@ -28,7 +63,15 @@ def cli():
 @click.option("--secret", "-s", help="Secret word.")
 @click.option("--strategy", "-S", default="heuristic", help="Strategy type to use.")
 @click.option(
-    "--dictionary", "-d", default="words_cfreshman.txt", help="Dictionary file."
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
+@click.option(
+    "--guesses",
+    "-g",
+    help="Dictionary file of the guesses allowed besides the dictionary words.",
 )
 @click.option(
     "--precomputed",
@@ -38,12 +81,15 @@ def cli():
     default=False,
     help="Load a precomputed strategy.",
 )
-def run(dictionary: str, secret: str, strategy: str, precomputed: bool) -> int:
+def run(
+    dictionary: str, guesses: str, secret: str, strategy: str, precomputed: bool
+) -> int:
     logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
-    words = load_words(DATA_ROOT / "dictionaries" / dictionary)
+    words = load_named_dictionary(dictionary)
     game = Wordle(words=words, secret=secret) if secret else Wordle(words=words)
     try:
-        strategy = select_strategy(strategy, words, precomputed)
+        allowed = load_allowed(guesses, words)
+        strategy = select_strategy(strategy, words, precomputed, allowed)
         player = Player(game, strategy)
         guesses, feedback = player.play()
     except (ValueError, StrategyError) as e:
@@ -54,39 +100,236 @@ def run(dictionary: str, secret: str, strategy: str, precomputed: bool) -> int:
     return 0
 
 
-def select_strategy(strategy: str, words: List[str], precomputed: bool) -> Strategy:
-    if precomputed:
-        PrecomputedStrategy(
-            filename=DATA_ROOT / "strategies" / "{}.json".format(strategy)
+@cli.command()
+@click.option(
+    "--secret",
+    "-s",
+    multiple=True,
+    help="Secret word of a board, repeated for each board.",
+)
+@click.option(
+    "--boards",
+    "-n",
+    type=int,
+    default=4,
+    show_default=True,
+    help="Number of boards, when the secrets are not given.",
+)
+@click.option(
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
+@click.option(
+    "--guesses",
+    "-g",
+    help="Dictionary file of the guesses allowed besides the dictionary words.",
+)
+def multi(secret: List[str], boards: int, dictionary: str, guesses: str) -> int:
+    logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
+    words = load_named_dictionary(dictionary)
+    try:
+        if secret:
+            game = MultiWordle(words, secrets=list(secret))
+        else:
+            game = MultiWordle(words, boards)
+        strategy = MultiBoardStrategy(
+            words, len(game.get_secrets()), load_allowed(guesses, words)
         )
-    if strategy == "heuristic":
-        return HeuristicStrategy(words)
-    elif strategy == "minmax":
-        return MinMaxStrategy(words)
-    else:
-        raise ValueError("unknown strategy: %s" % strategy)
+        player = MultiPlayer(game, strategy)
+        guesses, feedback = player.play()
+    except (ValueError, StrategyError) as e:
+        logging.error(e)
+        return 1
+    for i, (g, f) in enumerate(zip(guesses, feedback)):
+        print("guess %d: %s => %s" % (i + 1, g, " ".join(f)))
+    return 0
 
 
 @cli.command()
 @click.argument("filename", type=str)
 @click.option("--strategy", "-S", default="heuristic", help="Strategy type to use.")
 @click.option(
-    "--dictionary", "-d", default="words_cfreshman.txt", help="Dictionary file."
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
+@click.option(
+    "--guesses",
+    "-g",
+    help="Dictionary file of the guesses allowed besides the dictionary words.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of worker processes, -1 to use all the cores.",
+)
+@click.option(
+    "--depth",
+    type=int,
+    default=PARALLEL_TREE_DEPTH,
+    show_default=True,
+    help="Depth of the tree below which subtrees are built in parallel.",
+)
+@click.option(
+    "--binary",
+    "-b",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Save the tree in the binary format instead of JSON.",
+)
+def precompute(
+    filename: str,
+    strategy: str,
+    dictionary: str,
+    guesses: str,
+    jobs: int,
+    depth: int,
+    binary: bool,
+) -> int:
+    logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
+    words = load_named_dictionary(dictionary)
+    try:
+        strategy = select_strategy(strategy, words, False, load_allowed(guesses, words))
+        precomputed_strategy = PrecomputedStrategy(
+            words, strategy, jobs=jobs, depth=depth
+        )
+    except StrategyError as e:
+        logging.error(e)
+        return 1
+
+    suffix = TREE_SUFFIX if binary else ".json"
+    precomputed_strategy.save(DATA_ROOT / "strategies" / (filename + suffix))
+
+    return 0
+
+
+@cli.command()
+@click.argument("filename", type=str)
+@click.option(
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
+@click.option(
+    "--objective",
+    type=click.Choice(OBJECTIVES),
+    default="expected",
+    show_default=True,
+    help="Minimize the average or the worst number of guesses.",
+)
+@click.option(
+    "--width",
+    "-w",
+    type=int,
+    help="Number of guesses tried at each node, by default all of them.",
+)
+@click.option(
+    "--time-budget",
+    "-t",
+    type=float,
+    help="Seconds after which the best tree found so far is returned.",
+)
+@click.option(
+    "--binary",
+    "-b",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Save the tree in the binary format instead of JSON.",
 )
-def precompute(filename: str, strategy: str, dictionary: str) -> int:
+def solve(
+    filename: str,
+    dictionary: str,
+    objective: str,
+    width: int,
+    time_budget: float,
+    binary: bool,
+) -> int:
     logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
-    words = load_words(DATA_ROOT / "dictionaries" / dictionary)
+    words = load_named_dictionary(dictionary)
+
+    def progress(stats: SolverStats):
+        print(
+            "nodes: {} hits: {} pruned: {} elapsed: {:.1f}s".format(
+                stats.nodes, stats.hits, stats.pruned, stats.elapsed
+            ),
+            file=sys.stderr,
+        )
+
+    solver = OptimalSolver(words, objective, width, time_budget, progress)
     try:
-        strategy = select_strategy(strategy, words, False)
-        precomputed_strategy = PrecomputedStrategy(words, strategy)
+        tree, cost = solver.solve()
     except StrategyError as e:
         logging.error(e)
         return 1
 
-    filename = DATA_ROOT / "strategies" / "{}.json".format(filename)
-    with open(filename, "w", encoding="utf8") as f:
-        f.write(precomputed_strategy.json())
+    suffix = TREE_SUFFIX if binary else ".json"
+    PrecomputedStrategy(words, decision_tree=tree).save(
+        DATA_ROOT / "strategies" / (filename + suffix)
+    )
 
+    rows = [["metric", "value"], ["cost", cost]]
+    if objective == "expected":
+        rows.append(["avg guesses", cost / len(words)])
+    rows += [
+        ["optimal", "yes" if solver.optimal else "no"],
+        ["nodes", solver.stats.nodes],
+        ["elapsed", solver.stats.elapsed],
+    ]
+    print(tabulate(rows, headers="firstrow", tablefmt="grid"))
+    return 0
+
+
+@cli.command()
+@click.argument("tree", type=str)
+@click.option(
+    "--verbose",
+    "-v",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="List the secrets that fail or have no branch.",
+)
+def analyze(tree: str, verbose: bool) -> int:
+    """Report the number of guesses of a precomputed TREE, a file or the name of
+    a strategy in data/strategies, for every secret without playing the games."""
+    logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
+    filename = Path(tree)
+    if not filename.exists():
+        filename = precomputed_filename(tree)
+    try:
+        strategy = PrecomputedStrategy(filename=filename)
+        report = analyze_tree(strategy.decision_tree, strategy.dictionary)
+    except (ValueError, FileNotFoundError, StrategyError) as e:
+        logging.error(e)
+        return 1
+
+    rows = [
+        ["metric", "value"],
+        ["secrets", report["secrets"]],
+        ["nodes", report["nodes"]],
+        ["avg guesses", report["avg guesses"]],
+        ["worst guesses", report["worst guesses"]],
+    ]
+    rows += [["{} guesses".format(n), c] for n, c in report["histogram"].items()]
+    rows += [
+        ["failures number", len(report["failures"])],
+        ["no branch number", len(report["no branch"])],
+    ]
+    print(tabulate(rows, headers="firstrow", tablefmt="grid"))
+    if verbose:
+        if report["failures"]:
+            print("failures: {}".format(" ".join(report["failures"])))
+        if report["no branch"]:
+            print("no branch: {}".format(" ".join(report["no branch"])))
     return 0
 
 
@@ -94,7 +337,15 @@ def precompute(filename: str, strategy: str, dictionary: str) -> int:
 @click.argument("history", type=str, nargs=-1)
 @click.option("--strategy", "-S", default="heuristic", help="Strategy type to use.")
 @click.option(
-    "--dictionary", "-d", default="words_cfreshman.txt", help="Dictionary file."
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
+@click.option(
+    "--guesses",
+    "-g",
+    help="Dictionary file of the guesses allowed besides the dictionary words.",
 )
 @click.option(
     "--precomputed",
@@ -104,7 +355,21 @@ def precompute(filename: str, strategy: str, dictionary: str) -> int:
     default=False,
     help="Load a precomputed strategy.",
 )
-def play(history: List[str], strategy: str, dictionary: str, precomputed: bool) -> int:
+@click.option(
+    "--save-cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Save the guesses of the strategy, to be reused by the next runs.",
+)
+def play(
+    history: List[str],
+    strategy: str,
+    dictionary: str,
+    guesses: str,
+    precomputed: bool,
+    save_cache: bool,
+) -> int:
     logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
 
     rounds = len(history) / 2
@@ -112,24 +377,93 @@ def play(history: List[str], strategy: str, dictionary: str, precomputed: bool)
         logging.error("arguments must be <= 2 * %d", MAX_ATTEMPTS)
         return 1
 
-    guesses = [g for i, g in enumerate(history) if i % 2 == 0]
-    feedback = [f for i, f in enumerate(history) if i % 2 == 1]
-    words = load_words(DATA_ROOT / "dictionaries" / dictionary)
+    words = load_named_dictionary(dictionary)
     try:
-        strategy = select_strategy(strategy, words, precomputed)
-        strategy.set_history(guesses, feedback)
+        allowed = load_allowed(guesses, words)
+        strategy = select_strategy(strategy, words, precomputed, allowed)
+        strategy.set_history(list(history[::2]), list(history[1::2]))
         print("hint: {}".format(strategy.guess()))
     except (ValueError, StrategyError) as e:
         logging.error(e)
         return 1
+    if save_cache and strategy.cache is not None:
+        strategy.cache.save()
+    return 0
+
+
+@cli.command()
+@click.argument("input", type=click.File("r"), default="-")
+@click.option("--strategy", "-S", default="heuristic", help="Strategy type to use.")
+@click.option(
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
+@click.option(
+    "--guesses",
+    "-g",
+    help="Dictionary file of the guesses allowed besides the dictionary words.",
+)
+@click.option(
+    "--precomputed",
+    "-p",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Load a precomputed strategy.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w"),
+    default="-",
+    help="JSONL file of the hints, the standard output by default.",
+)
+def bulk(
+    input: IO,
+    strategy: str,
+    dictionary: str,
+    guesses: str,
+    precomputed: bool,
+    output: IO,
+) -> int:
+    """Read JSONL requests {"guesses": [...], "feedback": [...]} from the INPUT
+    file, or the standard input, and write each request with its hint, or its
+    error, in the same order."""
+    logging.basicConfig(stream=sys.stderr, level=LOG_LEVEL)
+    words = load_named_dictionary(dictionary)
+    try:
+        allowed = load_allowed(guesses, words)
+        strategy = select_strategy(strategy, words, precomputed, allowed)
+    except (ValueError, StrategyError) as e:
+        logging.error(e)
+        return 1
+    run_bulk(strategy, input, output)
     return 0
 
 
+def check_records_format(ctx: click.Context, param: click.Parameter, value: str):
+    """Reject the records files of an unknown format before they are opened."""
+    if value is not None and RecordWriter.format_of(value) not in RecordWriter.FORMATS:
+        raise click.BadParameter("expected a .jsonl or .csv file")
+    return value
+
+
 @cli.command()
 @click.argument("strategy", type=str)
 @click.option("--sample", "-n", type=int, default=100, help="Sample size.")
+@click.option("--seed", type=int, default=0, show_default=True, help="Sample seed.")
+@click.option(
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
 @click.option(
-    "--dictionary", "-d", default="words_cfreshman.txt", help="Dictionary file."
+    "--guesses",
+    "-g",
+    help="Dictionary file of the guesses allowed besides the dictionary words.",
 )
 @click.option(
     "--precomputed",
@@ -139,75 +473,273 @@ def play(history: List[str], strategy: str, dictionary: str, precomputed: bool)
     default=False,
     help="Run precomputed strategies.",
 )
-def benchmark(strategy: str, sample: int, dictionary: str, precomputed: bool) -> int:
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of worker processes, -1 to use all the cores.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True),
+    callback=check_records_format,
+    help="Stream the game records to a .jsonl or .csv file.",
+)
+@click.option(
+    "--save-cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Save the guesses of the strategy, to be reused by the next runs.",
+)
+@click.option(
+    "--profile",
+    type=click.Path(file_okay=False, writable=True),
+    help="Profile the games in this process and write the reports to a directory.",
+)
+@click.option(
+    "--adversarial",
+    "-a",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Play a single game against Absurdle, that dodges the guesses.",
+)
+def benchmark(
+    strategy: str,
+    sample: int,
+    seed: int,
+    dictionary: str,
+    guesses: str,
+    precomputed: bool,
+    jobs: int,
+    output: str,
+    save_cache: bool,
+    profile: str,
+    adversarial: bool,
+) -> int:
 
     logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
+    if profile is not None and jobs != 1:
+        logging.warning("profiling plays the games in a single process")
+        jobs = 1
 
-    words = load_words(DATA_ROOT / "dictionaries" / dictionary)[:sample]
-
-    strategy = select_strategy(strategy, words, precomputed)
+    try:
+        words, s = load_benchmark(strategy, dictionary, precomputed, guesses)
+    except (ValueError, StrategyError) as e:
+        logging.error(e)
+        return 1
+    # the adversary answers deterministically, a single game is its worst case
+    secrets = [None] if adversarial else sample_secrets(words, sample, seed)
     results = []
-    with Bar(strategy.__class__.__name__, max=len(words)) as bar:
-        for secret in words:
-            player = Player(Wordle(words=words, secret=secret), strategy)
-            start = time()
-            try:
-                guesses, feedback = player.play()
-            except StrategyError as se:
-                results.append(
-                    {
-                        "secret": secret,
-                        "status": "error",
-                        "message": str(se),
-                    }
-                )
-                continue
-            finally:
-                bar.next()
-            execution_time = time() - start
-            player.strategy.reset()
-            results.append(
-                {
-                    "secret": secret,
-                    "guesses": guesses,
-                    "feedback": feedback,
-                    "execution_time": execution_time,
-                    "status": "complete",
-                }
+    # cache counters summed over the processes playing the games
+    counters = {}
+    with ExitStack() as stack:
+        writer = None
+        if output is not None:
+            writer = RecordWriter(
+                stack.enter_context(open(output, "w", encoding="utf8", newline="")),
+                RecordWriter.format_of(output),
             )
+        bar = stack.enter_context(Bar(s.__class__.__name__, max=len(secrets)))
+        profiler = None
+        if profile is not None:
+            profiler = stack.enter_context(BenchmarkProfiler(profile))
+        for record in run_benchmark(
+            strategy,
+            dictionary,
+            secrets,
+            precomputed,
+            jobs,
+            save_cache,
+            guesses,
+            adversarial,
+            counters,
+        ):
+            results.append(record)
+            if writer is not None:
+                writer.write(record)
+            bar.next()
 
-    complete_records = len([r for r in results if r["status"] == "complete"])
-    if complete_records == 0:
+    summary = summarize(results)
+    if summary["avg time"] is None:
         print("There are no complete records")
         return 0
 
-    print(
-        tabulate(
-            [
-                ["metric", "value"],
-                [
-                    "avg time",
-                    sum(
-                        r["execution_time"]
-                        for r in results
-                        if r["status"] == "complete"
-                    )
-                    / len([r for r in results if r["status"] == "complete"]),
-                ],
-                [
-                    "avg guesses",
-                    sum(len(r["guesses"]) for r in results if r["status"] == "complete")
-                    / len([r for r in results if r["status"] == "complete"]),
-                ],
-                [
-                    "errors number",
-                    len([r for r in results if r["status"] == "error"]),
-                ],
-            ],
-            headers="firstrow",
-            tablefmt="grid",
+    rows = [
+        ["metric", "value"],
+        ["games", summary["games"]],
+        ["avg time", summary["avg time"]],
+        ["avg guesses", summary["avg guesses"]],
+    ]
+    for latency in ("game latency", "guess latency"):
+        rows += [["{} {}".format(latency, k), v] for k, v in summary[latency].items()]
+    rows += [["{} guesses".format(n), c] for n, c in summary["histogram"].items()]
+    rows += [
+        ["failures number", len(summary["failures"])],
+        ["errors number", len(summary["errors"])],
+    ]
+    rows += [[name, value] for name, value in counters.items()]
+    print(tabulate(rows, headers="firstrow", tablefmt="grid"))
+    if summary["failures"]:
+        print("failures: {}".format(" ".join(summary["failures"])))
+    if profiler is not None:
+        report = profiler.report
+        rows = [["phase", "calls", "time", "% of wall time"]]
+        for name, phase in sorted(report["phases"].items()):
+            time = phase["time"]
+            rows.append([name, phase["calls"], time, 100 * time / report["wall time"]])
+        rows += [[name, value, "", ""] for name, value in report["counters"].items()]
+        rows.append(["tracemalloc peak (bytes)", report["tracemalloc peak"], "", ""])
+        print(tabulate(rows, headers="firstrow", tablefmt="grid"))
+        rows = [["move", "guesses", "avg candidates", "max candidates"]]
+        for move, sizes in report["candidates"].items():
+            rows.append([move + 1, sizes["moves"], sizes["avg"], sizes["max"]])
+        print(tabulate(rows, headers="firstrow", tablefmt="grid"))
+        print("profile written to {}".format(profile))
+    return 0
+
+
+@cli.command()
+@click.option(
+    "--strategy",
+    "-S",
+    multiple=True,
+    default=["heuristic"],
+    show_default=True,
+    help="Strategy to serve, the first one is the default. Can be repeated.",
+)
+@click.option(
+    "--dictionary",
+    "-d",
+    default="words_cfreshman.txt",
+    help="Dictionary file, as FILE or FILE:LENGTH to pick another word length.",
+)
+@click.option(
+    "--precomputed",
+    "-p",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Serve precomputed strategies.",
+)
+@click.option("--host", default="127.0.0.1", show_default=True, help="Bind address.")
+@click.option("--port", type=int, default=8000, show_default=True, help="Bind port.")
+@click.option(
+    "--unix",
+    type=click.Path(dir_okay=False),
+    help="Serve on a Unix socket instead of host and port.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of worker processes, 1 to score in a thread of the server.",
+)
+def serve(
+    strategy: List[str],
+    dictionary: str,
+    precomputed: bool,
+    host: str,
+    port: int,
+    unix: str,
+    jobs: int,
+) -> int:
+    logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
+    server = HintServer([(s, dictionary, precomputed) for s in strategy], jobs)
+    try:
+        server.start()
+        asyncio.run(server.serve(host, port, unix))
+    except (ValueError, StrategyError) as e:
+        logging.error(e)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+@cli.command()
+@click.option(
+    "--dictionary",
+    "-d",
+    multiple=True,
+    default=PERF_DICTIONARIES,
+    show_default=True,
+    help="Dictionary file of the cases. Can be repeated.",
+)
+@click.option("--select", "-k", help="Run only the cases whose name contains this.")
+@click.option(
+    "--repeat", type=int, default=3, show_default=True, help="Rounds of each case."
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=PERF_THRESHOLD,
+    show_default=True,
+    help="Fraction of its baseline by which a case can be slower.",
+)
+@click.option(
+    "--baselines",
+    type=click.Path(dir_okay=False),
+    default=str(BASELINES),
+    help="Baselines file.",
+)
+@click.option(
+    "--update",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Save the results as the new baselines instead of comparing them.",
+)
+def perf(
+    dictionary: List[str],
+    select: str,
+    repeat: int,
+    threshold: float,
+    baselines: str,
+    update: bool,
+):
+    """Time the hot paths and compare them with the baselines, exiting with an
+    error when a case regresses."""
+    logging.basicConfig(stream=sys.stdout, level=LOG_LEVEL)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = [c for d in dictionary for c in perf_cases(d, Path(workdir))]
+        cases = [c for c in cases if select is None or select in c[0]]
+        with Bar("perf", max=len(cases)) as bar:
+            for name, seconds in run_suite(cases, repeat):
+                results[name] = seconds
+                bar.next()
+
+    if update:
+        save_baselines(results, baselines)
+        print("baselines saved to {}".format(baselines))
+        return
+
+    recorded = load_baselines(baselines)
+    if not recorded:
+        # timings of other Python or numpy versions are not comparable
+        logging.warning(
+            "no baselines recorded with %s, only with %s: record them with --update",
+            environment(),
+            baselines_environments(baselines) or "no versions",
         )
-    )
+        return
+    report = compare(results, recorded, threshold)
+    rows = [["case", "baseline", "time", "ratio", "status"]]
+    rows += [[r[k] for k in rows[0]] for r in report]
+    print(tabulate(rows, headers="firstrow", tablefmt="grid"))
+    regressions = [r["case"] for r in report if r["status"] == "regression"]
+    if regressions:
+        print("regressions: {}".format(" ".join(regressions)))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from wordle.benchmark import (
+    BenchmarkProfiler,
+    RecordWriter,
+    load_benchmark,
+    play_game,
+    run_benchmark,
+    sample_secrets,
+    summarize,
+)
+from wordle.config import GUESS_CACHE_SIZE
+from wordle.strategy.cache import GuessCache
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_play_game(self):
+        words, strategy = load_benchmark("heuristic", "words_cfreshman.txt", False)
+        record = play_game(strategy, words, words[3])
+        self.assertEqual(record["status"], "complete")
+        self.assertEqual(record["secret"], words[3])
+        self.assertEqual(record["guesses"][-1], words[3])
+        self.assertTrue(record["solved"])
+        self.assertEqual(len(record["guess_times"]), len(record["guesses"]))
+
+    def test_play_game_adversarial(self):
+        words, strategy = load_benchmark("minmax", "words_cfreshman.txt", False)
+        record = play_game(strategy, words, None, adversarial=True)
+        self.assertEqual(record["status"], "complete")
+        self.assertTrue(record["solved"])
+        self.assertEqual(record["guesses"][-1], record["secret"])
+        self.assertEqual(
+            record, dict(play_game(strategy, words, None, True), **{
+                k: record[k] for k in ("execution_time", "guess_times")})
+        )
+
+    def test_sample_secrets(self):
+        words = ["aaaaa", "bbbbb", "ccccc", "ddddd", "eeeee"]
+        self.assertEqual(sample_secrets(words, 3, 0), sample_secrets(words, 3, 0))
+        self.assertEqual(len(set(sample_secrets(words, 3, 0))), 3)
+        self.assertEqual(sample_secrets(words, 10, 0), words)
+
+    def test_run_benchmark_jobs(self):
+        def strip(records):
+            timings = ("execution_time", "guess_times")
+            return [
+                {k: v for k, v in r.items() if k not in timings} for r in records
+            ]
+
+        words, _ = load_benchmark("minmax", "words_cfreshman.txt", False)
+        secrets = sample_secrets(words, 30, 1)
+        serial_counters, parallel_counters = {}, {}
+        serial = list(
+            run_benchmark(
+                "minmax",
+                "words_cfreshman.txt",
+                secrets,
+                False,
+                counters=serial_counters,
+            )
+        )
+        parallel = list(
+            run_benchmark(
+                "minmax",
+                "words_cfreshman.txt",
+                secrets,
+                False,
+                2,
+                counters=parallel_counters,
+            )
+        )
+        self.assertEqual([r["secret"] for r in serial], secrets)
+        self.assertEqual(strip(serial), strip(parallel))
+        # every guess is a hit or a miss of the guess cache, in whatever process
+        guesses = sum(len(r["guesses"]) for r in serial)
+        for counters in (serial_counters, parallel_counters):
+            self.assertEqual(
+                counters["guess cache hits"] + counters["guess cache misses"], guesses
+            )
+
+    def test_run_benchmark_jobs_save_cache(self):
+        words, s = load_benchmark("minmax", "words_cfreshman.txt", False)
+        secrets = sample_secrets(words, 20, 2)
+        filename = s.cache.filename
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                s.cache.filename = Path(tmp) / "guesses.json"
+                s.cache.clear()
+                records = run_benchmark(
+                    "minmax", "words_cfreshman.txt", secrets, False, 2, True
+                )
+                self.assertEqual(len(list(records)), 20)
+                # the parent saves the guesses computed by the workers
+                saved = GuessCache(
+                    GUESS_CACHE_SIZE, s.cache.filename, s.cache.fingerprint
+                )
+                saved.load()
+                self.assertGreater(len(saved), 0)
+                self.assertEqual(len(saved), len(s.cache))
+            finally:
+                s.cache.filename = filename
+
+    def test_summarize(self):
+        records = [
+            {
+                "secret": "aaaaa",
+                "guesses": ["bbbbb", "aaaaa"],
+                "feedback": ["_____", "XXXXX"],
+                "execution_time": 0.2,
+                "guess_times": [0.1, 0.1],
+                "solved": True,
+                "status": "complete",
+            },
+            {
+                "secret": "ccccc",
+                "guesses": ["bbbbb"] * 6,
+                "feedback": ["_____"] * 6,
+                "execution_time": 0.6,
+                "guess_times": [0.1] * 6,
+                "solved": False,
+                "status": "complete",
+            },
+            {"secret": "ddddd", "status": "error", "message": "error"},
+        ]
+        summary = summarize(records)
+        self.assertEqual(summary["games"], 3)
+        self.assertAlmostEqual(summary["avg time"], 0.4)
+        self.assertEqual(summary["avg guesses"], 4)
+        self.assertEqual(summary["game latency"]["max"], 0.6)
+        self.assertAlmostEqual(summary["guess latency"]["p99"], 0.1)
+        self.assertEqual(summary["histogram"][2], 1)
+        self.assertEqual(summary["failures"], ["ccccc"])
+        self.assertEqual(summary["errors"], ["ddddd"])
+
+    def test_record_writer(self):
+        record = {
+            "secret": "aaaaa",
+            "guesses": ["aaaaa"],
+            "feedback": ["XXXXX"],
+            "execution_time": 0.1,
+            "guess_times": [0.1],
+            "solved": True,
+            "status": "complete",
+        }
+        file = io.StringIO()
+        RecordWriter(file, "jsonl").write(record)
+        self.assertEqual(json.loads(file.getvalue()), record)
+
+        file = io.StringIO()
+        RecordWriter(file, "csv").write(record)
+        self.assertEqual(
+            file.getvalue().splitlines()[1],
+            "aaaaa,complete,True,1,aaaaa,XXXXX,0.1,0.1,",
+        )
+
+        self.assertEqual(RecordWriter.format_of("records.CSV"), "csv")
+        with self.assertRaises(ValueError):
+            RecordWriter(file, "xml")
+
+    def test_profiler(self):
+        words, strategy = load_benchmark("heuristic", "words_cfreshman.txt", False)
+        with tempfile.TemporaryDirectory() as tmp:
+            with BenchmarkProfiler(tmp) as profiler:
+                play_game(strategy, words, words[3])
+            self.assertEqual(
+                sorted(p.name for p in Path(tmp).iterdir()),
+                ["phases.json", "profile.pstats", "profile.txt"],
+            )
+            with open(Path(tmp) / "phases.json") as file:
+                self.assertEqual(
+                    json.load(file)["phases"].keys(),
+                    profiler.report["phases"].keys(),
+                )
+        self.assertIn("strategy.guess", profiler.report["phases"])
+        self.assertGreater(profiler.report["tracemalloc peak"], 0)
@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import select
+import threading
+import unittest
+from pathlib import Path
+
+from wordle.bulk import HistoryTrie, bulk_hints, run_bulk
+from wordle.strategy.heuristic_strategy import HeuristicStrategy
+from wordle.strategy.precomputed_strategy import PrecomputedStrategy
+from wordle.utils import evaluate_feedback, load_words
+
+DATA_ROOT = Path(__file__).parent / "data"
+
+
+class CountingStrategy(HeuristicStrategy):
+    def __init__(self, dictionary):
+        super().__init__(dictionary)
+        self.pushes = 0
+
+    def push(self, guess, feedback, candidates=None):
+        self.pushes += 1
+        super().push(guess, feedback, candidates)
+
+
+def request(secret, guesses, **kwargs):
+    return json.dumps(
+        dict(
+            guesses=guesses,
+            feedback=[evaluate_feedback(secret, g) for g in guesses],
+            **kwargs
+        )
+    )
+
+
+class TestBulk(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.dictionary = load_words(DATA_ROOT / "words_test.txt")
+
+    def test_trie(self):
+        trie = HistoryTrie()
+        trie.insert([("a", "1"), ("b", "2")], 0)
+        trie.insert([("c", "3")], 1)
+        trie.insert([("a", "1")], 2)
+        trie.insert([("a", "1"), ("b", "2")], 3)
+        trie.insert([], 4)
+        self.assertEqual(
+            list(trie.walk()),
+            [
+                ((), [4]),
+                ((("a", "1"),), [2]),
+                ((("a", "1"), ("b", "2")), [0, 3]),
+                ((("c", "3"),), [1]),
+            ],
+        )
+
+    def test_bulk_hints(self):
+        lines = [
+            request("tacit", ["arose", "unity"], id=0),
+            request("spoke", ["arose"], id=1),
+            request("tacit", ["arose"], id=2),
+            "not json",
+            request("tacit", ["arose", "unity"], id=4),
+            json.dumps({"guesses": ["arose"], "feedback": []}),
+            request("tacit", [], id=6),
+        ]
+        s = CountingStrategy(self.dictionary)
+        records = bulk_hints(s, lines)
+
+        self.assertEqual(len(records), len(lines))
+        # each of the two arose feedback is filtered once, unity once
+        self.assertEqual(s.pushes, 3)
+        for line, record in zip(lines, records):
+            if record.get("id") is None:
+                self.assertIn("error", record)
+                continue
+            expected = HeuristicStrategy(self.dictionary)
+            content = json.loads(line)
+            expected.set_history(content["guesses"], content["feedback"])
+            self.assertEqual(record["hint"], expected.guess())
+            self.assertEqual(record["id"], content["id"])
+
+    def test_bulk_errors(self):
+        words = ["abccc", "abbbb", "aaaaa"]
+        s = PrecomputedStrategy(words, HeuristicStrategy(words))
+        records = bulk_hints(
+            s,
+            [
+                json.dumps({"guesses": ["abccc"], "feedback": ["X____"]}),
+                json.dumps({"guesses": ["aaaaa"], "feedback": ["XXXX_"]}),
+                json.dumps({"guesses": ["aaaaa"], "feedback": ["X____"]}),
+            ],
+        )
+        self.assertIn("error", records[0])
+        self.assertIn("error", records[1])
+        self.assertEqual(records[2]["hint"], "abbbb")
+
+    def test_run_bulk(self):
+        secrets = self.dictionary[:50]
+        lines = [request(s, ["arose", "unity"][: i % 3]) for i, s in enumerate(secrets)]
+        output = io.StringIO()
+        count = run_bulk(
+            HeuristicStrategy(self.dictionary),
+            io.StringIO("\n".join(lines) + "\n\n"),
+            output,
+            batch_size=7,
+        )
+        self.assertEqual(count, 50)
+        expected = bulk_hints(HeuristicStrategy(self.dictionary), lines)
+        self.assertEqual(
+            [json.loads(line) for line in output.getvalue().splitlines()], expected
+        )
+
+    def test_run_bulk_interactive(self):
+        # hints of a pipe are written before the input is closed
+        read_in, write_in = os.pipe()
+        read_out, write_out = os.pipe()
+        with open(read_in, "r") as input, open(write_out, "w") as output:
+            strategy = HeuristicStrategy(self.dictionary)
+            thread = threading.Thread(target=run_bulk, args=(strategy, input, output))
+            thread.start()
+            with open(read_out, "r") as hints:
+                with open(write_in, "w") as requests:
+                    for secret in self.dictionary[:3]:
+                        requests.write(request(secret, ["arose"]) + "\n")
+                        requests.flush()
+                        ready, _, _ = select.select([hints], [], [], 10)
+                        self.assertTrue(ready, "no hint before the input is closed")
+                        self.assertIn("hint", json.loads(hints.readline()))
+                thread.join()
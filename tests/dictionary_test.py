@@ -0,0 +1,77 @@
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from wordle import dictionary
+from wordle.dictionary import (
+    Dictionary,
+    dictionary_hash,
+    encode_words,
+    intern_dictionary,
+    load_dictionary,
+    load_words,
+    read_header,
+)
+
+
+class TestDictionary(unittest.TestCase):
+
+    def test_dictionary(self):
+        words = ["crate", "aaaaa", "abbbb"]
+        d = Dictionary.from_words(words)
+        self.assertEqual(len(d), 3)
+        self.assertEqual(d.word_length, 5)
+        self.assertEqual(d, words)
+        self.assertEqual(list(d), words)
+        self.assertEqual(d[1], "aaaaa")
+        self.assertEqual(d[1:], ["aaaaa", "abbbb"])
+        self.assertIn("abbbb", d)
+        self.assertNotIn("zzzzz", d)
+        self.assertEqual(d.index("abbbb"), 2)
+        with self.assertRaises(ValueError):
+            d.index("zzzzz")
+        self.assertEqual(d.digest, dictionary_hash(words))
+        self.assertEqual(dictionary_hash(d), dictionary_hash(words))
+        self.assertIs(encode_words(d), d.letters)
+        self.assertEqual(d, Dictionary.from_words(words))
+        self.assertNotEqual(d, Dictionary.from_words(words[:2]))
+
+    def test_intern(self):
+        words = ["intrn", "aaaaa"]
+        d = intern_dictionary(words)
+        self.assertIs(intern_dictionary(list(words)), d)
+        self.assertIs(intern_dictionary(Dictionary.from_words(words)), d)
+        self.assertIs(pickle.loads(pickle.dumps(d)), d)
+
+    def test_load_dictionary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "words.txt"
+            source.write_text("crane\nslate\ntoolong\nabc\n")
+            d = load_dictionary(source, Path(tmp) / "cache")
+            self.assertEqual(d, ["crane", "slate"])
+            self.assertIsNotNone(d.filename)
+            self.assertIs(load_dictionary(source, Path(tmp) / "cache"), d)
+            self.assertIs(pickle.loads(pickle.dumps(d)), d)
+
+            _, _, length, size, _, _, digest = read_header(d.filename)
+            self.assertEqual((length, size), (5, 2))
+            self.assertEqual(digest.hex(), dictionary_hash(["crane", "slate"]))
+
+            # a modified source is compiled again by a new process
+            source.write_text("crane\nslate\nadieu\n")
+            stat = os.stat(source)
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            del dictionary._sources[(source.resolve(), None)]
+            d = load_dictionary(source, Path(tmp) / "cache")
+            self.assertEqual(d, ["crane", "slate", "adieu"])
+
+            source.write_text("crane\nslate\nsilent\ntoolong\nlisten\ntinsel\n")
+            self.assertEqual(load_words(source), ["silent", "listen", "tinsel"])
+            self.assertEqual(load_words(source, 5), ["crane", "slate"])
+            d = load_dictionary(source, Path(tmp) / "cache", 7)
+            self.assertEqual((d, d.word_length), (["toolong"], 7))
+
+        with self.assertRaises(ValueError):
+            read_header(Path(__file__))
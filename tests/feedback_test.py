@@ -0,0 +1,137 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from wordle.feedback import (
+    FeedbackMatrix,
+    compute_feedback_matrix,
+    decode_feedback,
+    encode_feedback,
+    evaluate_feedback_guesses,
+    evaluate_feedback_many,
+    evaluate_feedback_pairs,
+    partition_counts,
+)
+from wordle.dictionary import encode_words
+from wordle.strategy.utils import filter_candidates
+from wordle.utils import evaluate_feedback, evaluate_feedback_code, load_words
+
+DATA_ROOT = Path(__file__).parent / "data"
+WORDS = [
+    "house", "wrong", "abide", "speed", "erase", "steal", "crepe", "pearl",
+    "eerie", "rinse", "talon", "salsa", "aaaaa", "aabbb", "babab",
+]
+
+
+class TestFeedback(unittest.TestCase):
+
+    def test_encode_feedback(self):
+        self.assertEqual(encode_feedback("_____"), 0)
+        self.assertEqual(encode_feedback("XXXXX"), 242)
+        self.assertEqual(encode_feedback(".____"), 1)
+        self.assertEqual(encode_feedback("____X"), 162)
+        with self.assertRaises(ValueError):
+            encode_feedback("X?___")
+
+    def test_decode_feedback(self):
+        for code in range(243):
+            self.assertEqual(encode_feedback(decode_feedback(code, 5)), code)
+        self.assertEqual(decode_feedback(3**7 - 1, 7), "XXXXXXX")
+
+    def test_compute_feedback_matrix(self):
+        codes = compute_feedback_matrix(WORDS)
+        self.assertEqual(codes.shape, (len(WORDS), len(WORDS)))
+        self.assertEqual(codes.dtype, np.uint8)
+        for i, guess in enumerate(WORDS):
+            for j, target in enumerate(WORDS):
+                self.assertEqual(
+                    decode_feedback(int(codes[i, j]), 5),
+                    evaluate_feedback(target, guess),
+                )
+
+    def test_word_lengths(self):
+        rng = random.Random(0)
+        for length, dtype in ((4, np.uint8), (6, np.uint16), (8, np.uint16)):
+            # few letters, so that most words repeat some
+            words = sorted(
+                {"".join(rng.choices("abcde", k=length)) for _ in range(60)}
+            )
+            codes = compute_feedback_matrix(words)
+            self.assertEqual(codes.dtype, dtype)
+            self.assertEqual(
+                codes.tolist(),
+                [[evaluate_feedback_code(t, g) for t in words] for g in words],
+            )
+
+    def test_matrix_on_demand(self):
+        words = load_words(DATA_ROOT / "words_test.txt")[:200]
+        stored = FeedbackMatrix(words, compute_feedback_matrix(words))
+        computed = FeedbackMatrix(words)
+        indices = np.arange(0, 200, 3)
+        self.assertEqual(
+            computed.feedback(words[7], words[3]),
+            evaluate_feedback(words[7], words[3]),
+        )
+        self.assertTrue(
+            np.array_equal(computed.row(5, indices), stored.row(5, indices))
+        )
+        # tiles of a few targets at a time
+        with mock.patch("wordle.feedback.BLOCK_CELLS", 1000):
+            counts = np.concatenate(list(partition_counts(computed, indices, indices)))
+        expected = np.concatenate(list(partition_counts(stored, indices, indices)))
+        self.assertTrue(np.array_equal(counts, expected))
+
+    def test_evaluate_feedback_many(self):
+        for word in WORDS:
+            self.assertEqual(
+                evaluate_feedback_many(word, WORDS).tolist(),
+                [encode_feedback(evaluate_feedback(t, word)) for t in WORDS],
+            )
+            self.assertEqual(
+                evaluate_feedback_guesses(WORDS, word).tolist(),
+                [encode_feedback(evaluate_feedback(word, g)) for g in WORDS],
+            )
+        self.assertEqual(len(evaluate_feedback_many("house", [])), 0)
+        with self.assertRaises(ValueError):
+            evaluate_feedback_many("house", ["tree"])
+
+    def test_evaluate_feedback_pairs(self):
+        targets = WORDS[::-1]
+        with mock.patch("wordle.feedback.BLOCK_CELLS", 100):
+            codes = evaluate_feedback_pairs(encode_words(WORDS), encode_words(targets))
+        self.assertEqual(
+            codes.tolist(),
+            [encode_feedback(evaluate_feedback(t, g)) for g, t in zip(WORDS, targets)],
+        )
+        with self.assertRaises(ValueError):
+            evaluate_feedback_pairs(encode_words(WORDS), encode_words(targets[1:]))
+
+    def test_feedback_matrix(self):
+        matrix = FeedbackMatrix(WORDS, compute_feedback_matrix(WORDS))
+        self.assertEqual(matrix.feedback("abide", "speed"), "__._.")
+        self.assertEqual(matrix.code("house", "house"), 242)
+
+    def test_load_feedback_matrix(self):
+        words = load_words(DATA_ROOT / "words_test.txt")
+        with tempfile.TemporaryDirectory() as cache_root:
+            matrix = FeedbackMatrix.load(words, cache_root)
+            self.assertEqual(len(list(Path(cache_root).glob("*.npy"))), 1)
+            loaded = FeedbackMatrix.load(words, cache_root)
+            self.assertIsInstance(loaded.codes, np.memmap)
+            self.assertTrue(np.array_equal(matrix.codes, loaded.codes))
+            del matrix, loaded
+
+    def test_filter_candidates_matrix(self):
+        matrix = FeedbackMatrix(WORDS, compute_feedback_matrix(WORDS))
+        for guess in WORDS:
+            for target in WORDS:
+                f = evaluate_feedback(target, guess)
+                self.assertEqual(
+                    filter_candidates(WORDS, [guess], [f], matrix),
+                    filter_candidates(WORDS, [guess], [f]),
+                )
+        self.assertEqual(filter_candidates(WORDS, ["house"], ["XXXX"], matrix), [])
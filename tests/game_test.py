@@ -1,6 +1,7 @@
 import unittest
 
-from wordle.game import Wordle
+from wordle.config import MAX_ATTEMPTS
+from wordle.game import Absurdle, MultiWordle, Wordle
 from wordle.utils import load_words
 
 
@@ -15,6 +16,37 @@ class TestGame(unittest.TestCase):
 
         feedback = game.evaluate("aaaaa")
         self.assertEqual(feedback, "XXXXX")
+        self.assertEqual(
+            game.evaluate_many(["aaaaa", "abbba", "bbbbb"]),
+            ["XXXXX", "X___X", "_____"],
+        )
+
+    def test_multi_game(self):
+        words = ["aaaaa", "bbbbb", "ccccc"]
+        game = MultiWordle(words=words, secrets=["aaaaa", "bbbbb"])
+        self.assertEqual(game.get_secrets(), ["aaaaa", "bbbbb"])
+        self.assertEqual(game.attempts, MAX_ATTEMPTS + 1)
+        self.assertEqual(game.evaluate("abcab"), ["X__X_", "_X__X"])
+
+        game = MultiWordle(words=words, boards=3)
+        self.assertEqual(sorted(game.get_secrets()), words)
+        self.assertEqual(game.attempts, MAX_ATTEMPTS + 2)
+
+    def test_absurdle(self):
+        words = ["bbbbb", "ccccc", "abbbb", "acccc", "ddddd"]
+        game = Absurdle(words)
+        # 3 words don't start with "a", 2 do
+        self.assertEqual(game.evaluate("aeeee"), "_____")
+        self.assertEqual(game.candidates, ["bbbbb", "ccccc", "ddddd"])
+        # a tie goes to the lowest feedback code
+        self.assertEqual(game.evaluate("bcccc"), "_____")
+        self.assertEqual(game.get_secret(), "ddddd")
+        self.assertEqual(game.evaluate("ddddd"), "XXXXX")
+        with self.assertRaises(ValueError):
+            game.evaluate("dddd")
+
+        game.reset()
+        self.assertEqual(game.candidates, words)
 
     def test_load_words(self):
         words = load_words("tests/words.txt")
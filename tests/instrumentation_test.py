@@ -0,0 +1,75 @@
+import unittest
+
+from wordle.game import Wordle
+from wordle.instrumentation import (
+    Instrumentation,
+    PhaseProfile,
+    instrumentation,
+    instrumented,
+)
+from wordle.player.player import Player
+from wordle.strategy.heuristic_strategy import HeuristicStrategy
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_subscribe(self):
+        hooks = Instrumentation()
+        events = []
+        self.assertFalse(hooks.enabled)
+
+        def listener(event, **data):
+            events.append((event, data))
+
+        hooks.subscribe(listener)
+        self.assertTrue(hooks.enabled)
+        hooks.count("calls", 2)
+        with hooks.phase("outer"):
+            with hooks.phase("outer"):
+                pass
+        hooks.unsubscribe(listener)
+        self.assertFalse(hooks.enabled)
+        hooks.count("calls")
+
+        self.assertEqual(events[0], ("count", {"name": "calls", "value": 2}))
+        # nested calls of the same phase are timed once
+        self.assertEqual([e for e, _ in events], ["count", "phase"])
+
+    def test_instrumented(self):
+        @instrumented("double")
+        def double(x):
+            return 2 * x
+
+        profile = PhaseProfile()
+        self.assertEqual(double(2), 4)
+        instrumentation.subscribe(profile)
+        try:
+            self.assertEqual(double(3), 6)
+        finally:
+            instrumentation.unsubscribe(profile)
+        self.assertEqual(double(4), 8)
+        self.assertEqual(profile.phases["double"]["calls"], 1)
+
+    def test_player(self):
+        words = ["abccc", "abbbb", "aaaaa"]
+        profile = PhaseProfile()
+        instrumentation.subscribe(profile)
+        try:
+            Player(Wordle(words, "abccc"), HeuristicStrategy(words)).play()
+        finally:
+            instrumentation.unsubscribe(profile)
+
+        report = profile.to_dict()
+        # the override of the heuristic strategy is timed as well
+        self.assertEqual(report["phases"]["strategy.guess"]["calls"], 3)
+        self.assertEqual(report["phases"]["player.guess"]["calls"], 3)
+        self.assertEqual(report["phases"]["strategy.update"]["calls"], 2)
+        self.assertEqual(report["counters"]["evaluate_feedback"], 3)
+        self.assertEqual(
+            report["candidates"],
+            {
+                0: {"moves": 1, "avg": 3, "max": 3},
+                1: {"moves": 1, "avg": 2, "max": 2},
+                2: {"moves": 1, "avg": 1, "max": 1},
+            },
+        )
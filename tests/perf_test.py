@@ -0,0 +1,72 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from wordle.perf import (
+    baselines_environments,
+    compare,
+    environment,
+    load_baselines,
+    measure,
+    perf_cases,
+    save_baselines,
+)
+
+
+class TestPerf(unittest.TestCase):
+
+    def test_compare(self):
+        report = compare(
+            {"a": 1.0, "b": 2.0, "c": 0.5, "d": 1.0},
+            {"a": 1.0, "b": 1.0, "c": 1.0},
+            threshold=0.5,
+        )
+        self.assertEqual(
+            [r["status"] for r in report], ["ok", "regression", "improvement", "new"]
+        )
+        self.assertEqual(report[1]["ratio"], 2.0)
+
+    def test_baselines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / "baselines.json"
+            self.assertEqual(load_baselines(filename), {})
+            save_baselines({"a": 1.0, "b": 2.0}, filename)
+            save_baselines({"b": 3.0}, filename)
+            self.assertEqual(load_baselines(filename), {"a": 1.0, "b": 3.0})
+            self.assertEqual(baselines_environments(filename), [environment()])
+
+    def test_baselines_other_environment(self):
+        major, minor = environment()["numpy"].split(".")
+        other = dict(environment(), numpy="{}.{}".format(major, int(minor) + 1))
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / "baselines.json"
+            with open(filename, "w") as file:
+                json.dump(
+                    {"environments": [{"environment": other, "results": {"a": 1.0}}]},
+                    file,
+                )
+            self.assertEqual(load_baselines(filename), {})
+            # baselines of other versions are kept apart, not merged
+            save_baselines({"b": 2.0}, filename)
+            self.assertEqual(load_baselines(filename), {"b": 2.0})
+            self.assertCountEqual(
+                baselines_environments(filename), [other, environment()]
+            )
+
+    def test_measure(self):
+        calls = []
+        seconds = measure(lambda: calls.append(1), repeat=2, min_time=0.001)
+        self.assertGreater(seconds, 0)
+        self.assertGreater(len(calls), 2)
+
+    def test_cases(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cases = dict(perf_cases("words_cfreshman.txt", Path(tmp)))
+            self.assertEqual(len(cases), 21)
+            for name in (
+                "words_cfreshman.txt/guess/heuristic/10",
+                "words_cfreshman.txt/constraints/filter",
+                "words_cfreshman.txt/load_precomputed/tree",
+            ):
+                self.assertGreater(measure(cases[name](), 1, 0), 0)
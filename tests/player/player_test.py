@@ -2,9 +2,11 @@ import unittest
 from unittest.mock import MagicMock
 
 from wordle.config import MAX_ATTEMPTS
-from wordle.game import Wordle
+from wordle.game import MultiWordle, Wordle
+from wordle.player.multi_player import MultiPlayer
 from wordle.player.player import Player
 from wordle.strategy import Strategy, StrategyError
+from wordle.strategy.multi_board_strategy import MultiBoardStrategy
 
 
 class TestPlayer(unittest.TestCase):
@@ -47,3 +49,18 @@ class TestPlayer(unittest.TestCase):
         player = Player(game=self.game, strategy=self.strategy)
         guesses, feedback = player.play()
         self.assertEqual(guesses[0], "aaaaa")
+        self.assertEqual(len(player.timings), len(guesses))
+
+    def test_multi_player(self):
+        words = ["aaaaa", "abbbb", "aabbb", "ccccc", "bbbbb"]
+        game = MultiWordle(words=words, secrets=["aabbb", "ccccc", "abbbb"])
+        player = MultiPlayer(game=game, strategy=MultiBoardStrategy(words, 3))
+        guesses, feedback = player.play()
+        self.assertTrue(set(game.get_secrets()) <= set(guesses))
+        self.assertEqual(feedback[-1], game.evaluate(guesses[-1]))
+        self.assertIn("XXXXX", feedback[-1])
+        self.assertTrue(all(player.strategy.solved))
+        self.assertEqual(len(player.timings), len(guesses))
+
+        with self.assertRaises(ValueError):
+            MultiPlayer(game=game, strategy=None)
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from wordle.dictionary import load_named_dictionary
+from wordle.server import HintServer, RequestError
+from wordle.utils import evaluate_feedback
+
+KEY = ("heuristic", "words_cfreshman.txt", False)
+
+
+class TestHintServer(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.server = HintServer([KEY])
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.close()
+        super().tearDown()
+
+    async def test_hint(self):
+        route, payload = await self.server.handle("POST", "/hint", {})
+        self.assertEqual(route, "hint")
+        first = payload["hint"]
+
+        _, payload = await self.server.handle(
+            "POST", "/hint", {"guesses": [first], "feedback": ["_____"]}
+        )
+        self.assertNotIn(first[0], payload["hint"])
+
+        with self.assertRaises(RequestError):
+            await self.server.handle("POST", "/hint", {"strategy": "minmax"})
+        with self.assertRaises(RequestError):
+            await self.server.handle("POST", "/hint", {"guesses": [first]})
+        with self.assertRaises(RequestError):
+            await self.server.handle("GET", "/nowhere", {})
+
+    async def test_sessions(self):
+        _, session = await self.server.handle("POST", "/sessions", {})
+        path = "/sessions/{}".format(session["session"])
+        self.assertEqual(session["guesses"], [])
+
+        _, updated = await self.server.handle(
+            "POST", path + "/update", {"guess": session["hint"], "feedback": "_____"}
+        )
+        self.assertEqual(updated["guesses"], [session["hint"]])
+        self.assertNotEqual(updated["hint"], session["hint"])
+
+        # inconsistent feedback leaves the session as it was
+        with self.assertRaises(RequestError):
+            await self.server.handle(
+                "POST", path + "/update", {"guess": "zzzzz", "feedback": "XXXX_"}
+            )
+        _, current = await self.server.handle("GET", path, {})
+        self.assertEqual(current, updated)
+
+        await self.server.handle("DELETE", path, {})
+        with self.assertRaises(RequestError):
+            await self.server.handle("GET", path, {})
+
+    async def test_concurrent_updates(self):
+        _, session = await self.server.handle("POST", "/sessions", {})
+        path = "/sessions/{}/update".format(session["session"])
+        words = load_named_dictionary(KEY[1])
+        secret = words[100]
+        guesses = [session["hint"], words[200]]
+        first, second = await asyncio.gather(
+            *(
+                self.server.handle(
+                    "POST",
+                    path,
+                    {"guess": g, "feedback": evaluate_feedback(secret, g)},
+                )
+                for g in guesses
+            )
+        )
+        # the second update waits for the first one and extends its history
+        self.assertEqual(first[1]["guesses"], guesses[:1])
+        self.assertEqual(second[1]["guesses"], guesses)
+        self.assertEqual(self.server.sessions[session["session"]].guesses, guesses)
+
+    async def test_expire_sessions(self):
+        self.server.session_ttl = -1
+        _, session = await self.server.handle("POST", "/sessions", {})
+        with self.assertRaises(RequestError):
+            await self.server.handle(
+                "GET", "/sessions/{}".format(session["session"]), {}
+            )
+
+    async def test_expire_sessions_by_access(self):
+        self.server.session_ttl = 10
+        with mock.patch("wordle.server.monotonic", return_value=0):
+            _, first = await self.server.handle("POST", "/sessions", {})
+            _, second = await self.server.handle("POST", "/sessions", {})
+        first, second = first["session"], second["session"]
+        with mock.patch("wordle.server.monotonic", return_value=5):
+            await self.server.handle("GET", "/sessions/" + first, {})
+        with mock.patch("wordle.server.monotonic", return_value=12):
+            self.server.expire_sessions()
+        self.assertEqual(list(self.server.sessions), [first])
+
+    async def test_http(self):
+        server = await asyncio.start_server(
+            self.server.handle_connection, "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(method, path, body=None):
+            data = json.dumps(body).encode() if body is not None else b""
+            writer.write(
+                "{} {} HTTP/1.1\r\nContent-Length: {}\r\n\r\n".format(
+                    method, path, len(data)
+                ).encode()
+                + data
+            )
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.lower()] = value.strip()
+            content = await reader.readexactly(int(headers["content-length"]))
+            return status, json.loads(content)
+
+        status, payload = await request("POST", "/hint", {})
+        self.assertEqual(status, 200)
+        self.assertIn("hint", payload)
+        status, payload = await request("POST", "/hint", {"guesses": "crane"})
+        self.assertEqual(status, 400)
+        status, payload = await request("GET", "/missing")
+        self.assertEqual(status, 404)
+        # unexpected failures are answered and recorded against their route
+        with mock.patch.object(self.server, "hint", side_effect=RuntimeError):
+            with self.assertLogs(level="ERROR"):
+                status, payload = await request("POST", "/hint", {})
+        self.assertEqual(status, 500)
+        self.assertIn("error", payload)
+        status, metrics = await request("GET", "/metrics")
+        self.assertEqual(metrics["routes"]["hint"]["requests"], 3)
+        self.assertEqual(metrics["routes"]["hint"]["errors"], 2)
+        self.assertEqual(metrics["routes"]["error"]["errors"], 1)
+        self.assertEqual(metrics["queue depth"], 0)
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,118 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from wordle.dictionary import dictionary_hash
+from wordle.strategy.binary_tree import MappedTree, write_tree
+from wordle.strategy.minmax_strategy import MinMaxStrategy
+from wordle.strategy.precomputed_strategy import DecisionTree, PrecomputedStrategy
+from wordle.utils import load_words
+
+DATA_ROOT = Path(__file__).parent.parent / "data"
+
+
+class TestBinaryTree(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmp.name) / "strategy.tree"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_write_tree(self):
+        leaf = DecisionTree("aabbb", {})
+        tree = DecisionTree("aaaaa", {
+            "X____": DecisionTree("abbbb", {"XX___": leaf}),
+            "XX___": leaf,
+        })
+        write_tree(tree, ["aaaaa", "abbbb", "aabbb"], self.filename)
+
+        mapped = MappedTree(self.filename)
+        # the shared leaf is written once
+        self.assertEqual(mapped.nodes, 3)
+        self.assertEqual(list(mapped.words), ["aaaaa", "abbbb", "aabbb"])
+        self.assertEqual(mapped.root.guess, "aaaaa")
+        self.assertEqual(list(mapped.root.choice), ["X____", "XX___"])
+        self.assertEqual(mapped.root.choice["XX___"].guess, "aabbb")
+        self.assertEqual(mapped.root.to_dict(), tree.to_dict())
+
+    def test_mapped_tree_lazy_words(self):
+        words = ["aaaaa", "abbbb", "aabbb"]
+        tree = DecisionTree("aaaaa", {"X____": DecisionTree("abbbb", {})})
+        write_tree(tree, words, self.filename)
+        mapped = MappedTree(self.filename)
+        # the digest comes from the header, and the words are not decoded
+        self.assertEqual(mapped.words.digest, dictionary_hash(words))
+        self.assertEqual(mapped.root.choice["X____"].guess, "abbbb")
+        self.assertIsNone(mapped.words._words)
+        self.assertIsNone(mapped.guesses._words)
+
+    def test_mapped_node_child(self):
+        tree = DecisionTree("aaaaa", {
+            "X____": DecisionTree("aabbb", {}),
+            "XX___": DecisionTree("abbbb", {}),
+        })
+        write_tree(tree, ["aaaaa", "abbbb", "aabbb"], self.filename)
+        root = MappedTree(self.filename).root
+        self.assertEqual(root.child("X____").guess, "aabbb")
+        self.assertEqual(root.child("XX___").guess, "abbbb")
+        self.assertIsNone(root.child("XXX__"))
+        self.assertIsNone(root.child("X___"))
+        self.assertIsNone(root.child("?????"))
+
+    def test_write_tree_long_words(self):
+        # 6 letter feedback codes don't fit in a byte
+        tree = DecisionTree("aaaaaa", {"_____X": DecisionTree("bbbbba", {})})
+        write_tree(tree, ["aaaaaa", "bbbbba"], self.filename)
+        mapped = MappedTree(self.filename)
+        self.assertEqual(mapped.word_length, 6)
+        self.assertEqual(mapped.root.to_dict(), tree.to_dict())
+
+    def test_write_tree_other_guesses(self):
+        # guesses that are not words, e.g. allowed guesses, follow the words
+        tree = DecisionTree("zzzzz", {"_____": DecisionTree("aaaaa", {})})
+        write_tree(tree, ["aaaaa"], self.filename)
+        mapped = MappedTree(self.filename)
+        self.assertEqual(list(mapped.words), ["aaaaa"])
+        self.assertEqual(list(mapped.guesses), ["aaaaa", "zzzzz"])
+        self.assertEqual(mapped.root.to_dict(), tree.to_dict())
+
+    def test_write_tree_invalid_guess(self):
+        with self.assertRaises(ValueError):
+            write_tree(DecisionTree("zzzz", {}), ["aaaaa"], self.filename)
+        # no partial tree is left behind
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+
+    def test_mapped_tree_invalid_file(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"not a decision tree file")
+        with self.assertRaises(ValueError):
+            MappedTree(self.filename)
+
+    def test_precomputed_strategy(self):
+        words = load_words(DATA_ROOT / "words_test.txt")[:300]
+        s = PrecomputedStrategy(words, MinMaxStrategy(words))
+        s.save(self.filename)
+
+        loaded = PrecomputedStrategy(filename=self.filename)
+        self.assertEqual(list(loaded.dictionary), words)
+        self.assertEqual(json.loads(loaded.json()), json.loads(s.json()))
+
+        g = loaded.guess()
+        f = next(iter(s._decision_tree.choice))
+        loaded.update(g, f)
+        s.update(g, f)
+        self.assertEqual(loaded.guess(), s.guess())
+
+    def test_precomputed_strategy_allowed(self):
+        words = load_words(DATA_ROOT / "words_test.txt")
+        s = PrecomputedStrategy(words[:100], MinMaxStrategy(words[:100], words))
+        s.save(self.filename)
+
+        loaded = PrecomputedStrategy(filename=self.filename)
+        self.assertEqual(list(loaded.dictionary), words[:100])
+        self.assertEqual(json.loads(loaded.json()), json.loads(s.json()))
@@ -0,0 +1,121 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from wordle.strategy.cache import GuessCache, get_guess_cache
+from wordle.strategy.minmax_strategy import MinMaxStrategy
+
+
+class TestGuessCache(unittest.TestCase):
+
+    def test_key(self):
+        a = GuessCache.key(np.array([3, 1, 2], dtype=np.int32))
+        b = GuessCache.key(np.array([1, 2, 3], dtype=np.int32))
+        c = GuessCache.key(np.array([1, 2], dtype=np.int32))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_get(self):
+        cache = GuessCache(2)
+        calls = []
+
+        def compute(guess):
+            def f():
+                calls.append(guess)
+                return guess
+            return f
+
+        self.assertEqual(cache.get(np.array([0, 1]), compute("aaaaa")), "aaaaa")
+        self.assertEqual(cache.get(np.array([1, 0]), compute("bbbbb")), "aaaaa")
+        cache.get(np.array([2]), compute("ccccc"))
+        cache.get(np.array([0, 1]), compute("ddddd"))
+        # [2] is now the least recently used and gets evicted
+        cache.get(np.array([3]), compute("eeeee"))
+        cache.get(np.array([2]), compute("fffff"))
+
+        self.assertEqual(calls, ["aaaaa", "ccccc", "eeeee", "fffff"])
+        self.assertEqual(
+            cache.stats(), {"entries": 2, "hits": 2, "misses": 4, "evictions": 2}
+        )
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / "guesses.json"
+            cache = GuessCache(10, filename)
+            cache.get(np.array([0, 1]), lambda: "aaaaa")
+            cache.save()
+
+            loaded = GuessCache(10, filename)
+            loaded.load()
+            self.assertEqual(loaded.get(np.array([0, 1]), lambda: "bbbbb"), "aaaaa")
+            self.assertEqual(loaded.hits, 1)
+
+        with self.assertRaises(ValueError):
+            GuessCache(10).save()
+
+    def test_load_other_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / "guesses.json"
+            cache = GuessCache(10, filename, "minmax/1")
+            cache.get(np.array([0, 1]), lambda: "aaaaa")
+            cache.save()
+
+            # guesses of another version of the strategy are not reused
+            loaded = GuessCache(10, filename, "minmax/2")
+            loaded.load()
+            self.assertEqual(len(loaded), 0)
+            loaded = GuessCache(10, filename, "minmax/1")
+            loaded.load()
+            self.assertEqual(len(loaded), 1)
+
+    def test_merge(self):
+        worker = GuessCache(10)
+        worker.get(np.array([0, 1]), lambda: "aaaaa")
+        worker.get(np.array([0, 1]), lambda: "bbbbb")
+        worker.get(np.array([2]), lambda: "ccccc")
+        added = worker.take_added()
+        self.assertEqual(sorted(added.values()), ["aaaaa", "ccccc"])
+        self.assertEqual(worker.take_added(), {})
+
+        parent = GuessCache(10)
+        parent.merge(added)
+        self.assertEqual(parent.get(np.array([1, 0]), lambda: "ddddd"), "aaaaa")
+        self.assertEqual(parent.take_added(), {})
+
+    def test_strategy(self):
+        words = ["abccc", "abbbb", "aaaaa", "acccc", "bbbbb"]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = get_guess_cache("minmax", words, cache_root=tmp)
+            self.assertIs(get_guess_cache("minmax", words, cache_root=tmp), cache)
+            self.assertIsNot(get_guess_cache("entropy", words, cache_root=tmp), cache)
+            allowed = get_guess_cache("minmax", words[:3], words[3:], tmp)
+            self.assertIsNot(get_guess_cache("minmax", words, cache_root=tmp), allowed)
+            self.assertNotEqual(allowed.filename, cache.filename)
+
+        s = MinMaxStrategy(words)
+        s.cache.clear()
+        guess = s.guess()
+        s.update(guess, "X____")
+        s.guess()
+        s.reset()
+
+        self.assertEqual(s.guess(), guess)
+        self.assertEqual(s.cache.stats()["hits"], 1)
+        self.assertEqual(s.cache.stats()["misses"], 2)
+
+    def test_strategy_allowed(self):
+        words = ["aaaab", "aaaac", "aaaad", "aaaae"]
+        allowed = MinMaxStrategy(words, ["bcdez", "bcdef"])
+        self.assertEqual(allowed.guess(), "bcdez")
+
+        # same guess pool, but guessing among the candidates only
+        s = MinMaxStrategy(words + ["bcdez", "bcdef"])
+        self.assertIsNot(s.cache, allowed.cache)
+        s.push("", "", np.arange(len(words), dtype=np.int32))
+        self.assertIn(s.guess(), words)
@@ -0,0 +1,45 @@
+import itertools
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from wordle.strategy.constraints import ConstraintIndex
+from wordle.strategy.utils import filter_candidates, is_candidate
+from wordle.utils import load_words
+
+DATA_ROOT = Path(__file__).parent.parent / "data"
+
+
+class TestConstraintIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.dictionary = load_words(DATA_ROOT / "words_test.txt")[:500]
+        self.index = ConstraintIndex(self.dictionary)
+        self.candidates = np.arange(len(self.dictionary))
+
+    def assertFilter(self, guess, feedback):
+        self.assertEqual(
+            [self.dictionary[i] for i in self.index.filter(
+                self.candidates, guess, feedback)],
+            [w for w in self.dictionary if is_candidate(w, [guess], [feedback])],
+        )
+
+    def test_filter(self):
+        for guess in ["speed", "eerie", "salsa", "arose", "zzzzz"]:
+            for feedback in itertools.product("_.X", repeat=5):
+                self.assertFilter(guess, "".join(feedback))
+
+    def test_filter_invalid_feedback(self):
+        self.assertFilter("speed", "XXXX")
+        self.assertFilter("speed", "XX?__")
+        self.assertEqual(len(self.index.filter(self.candidates, "spee", "XXXX")), 0)
+
+    def test_filter_candidates(self):
+        guesses = ["unity", "arose", "plait", "habit"]
+        feedback = ["__.._", ".____", "__.XX", "_X_XX"]
+        self.assertEqual(
+            filter_candidates(self.dictionary, guesses, feedback),
+            [w for w in self.dictionary if is_candidate(w, guesses, feedback)],
+        )
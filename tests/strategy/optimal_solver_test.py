@@ -0,0 +1,122 @@
+import functools
+import unittest
+from pathlib import Path
+
+from wordle.config import MAX_ATTEMPTS, SYMBOL_MATCH
+from wordle.strategy import StrategyError
+from wordle.strategy.optimal_solver import OptimalSolver
+from wordle.strategy.precomputed_strategy import PrecomputedStrategy
+from wordle.utils import evaluate_feedback, load_words
+
+DATA_ROOT = Path(__file__).parent.parent / "data"
+
+
+def brute_force(words, objective):
+    """Cost of the best decision tree, trying every guess at every node."""
+
+    @functools.lru_cache(maxsize=None)
+    def best(candidates, attempts):
+        if attempts == 0:
+            return float("inf")
+        if len(candidates) == 1:
+            return 1
+        cost = float("inf")
+        for guess in words:
+            parts = {}
+            for target in candidates:
+                parts.setdefault(evaluate_feedback(target, guess), []).append(target)
+            if len(parts) == 1 and guess not in candidates:
+                continue
+            costs = [
+                best(tuple(p), attempts - 1)
+                for f, p in parts.items()
+                if f != SYMBOL_MATCH * len(guess)
+            ]
+            if objective == "expected":
+                cost = min(cost, len(candidates) + sum(costs))
+            else:
+                cost = min(cost, 1 + max(costs, default=0))
+        return cost
+
+    return best(tuple(words), MAX_ATTEMPTS)
+
+
+class TestOptimalSolver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.dictionary = load_words(DATA_ROOT / "words_test.txt")
+
+    def play(self, words, tree):
+        """Return the number of guesses to find each word following the tree."""
+        s = PrecomputedStrategy(words, decision_tree=tree)
+        attempts = []
+        for secret in words:
+            s.reset()
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                guess = s.guess()
+                feedback = evaluate_feedback(secret, guess)
+                if guess == secret:
+                    break
+                s.update(guess, feedback)
+            attempts.append(attempt)
+        return attempts
+
+    def test_expected(self):
+        for start in (0, 40, 400):
+            words = self.dictionary[start : start + 12]
+            solver = OptimalSolver(words)
+            tree, cost = solver.solve()
+            self.assertTrue(solver.optimal)
+            self.assertEqual(cost, brute_force(words, "expected"))
+            self.assertEqual(sum(self.play(words, tree)), cost)
+
+    def test_worst(self):
+        words = self.dictionary[100:112]
+        tree, cost = OptimalSolver(words, "worst").solve()
+        self.assertEqual(cost, brute_force(words, "worst"))
+        self.assertEqual(max(self.play(words, tree)), cost)
+
+    def test_worst_splitting(self):
+        # best trees of 3 and 4 guesses, and words differing by their first
+        # letters, where most guesses are ruled out by the sets they don't split
+        cluster = "batch catch hatch latch match patch watch".split()
+        cluster += "fight light might night right sight tight chomp blimp".split()
+        for words in (self.dictionary[1000:1040], self.dictionary[200:230], cluster):
+            solver = OptimalSolver(words, "worst")
+            tree, cost = solver.solve()
+            self.assertEqual(cost, brute_force(words, "worst"))
+            self.assertEqual(max(self.play(words, tree)), cost)
+            for witness in solver._witnesses:
+                secrets = [words[i] for i in witness]
+                for guess in words:
+                    feedback = {evaluate_feedback(w, guess) for w in secrets}
+                    self.assertLess(len(feedback), len(secrets))
+        self.assertTrue(solver._witnesses)
+
+    def test_width(self):
+        words = self.dictionary[:300]
+        solver = OptimalSolver(words, width=2)
+        tree, cost = solver.solve()
+        self.assertFalse(solver.optimal)
+        self.assertEqual(sum(self.play(words, tree)), cost)
+
+    def test_time_budget(self):
+        words = self.dictionary[:1000]
+        reports = []
+        solver = OptimalSolver(words, time_budget=0, progress=reports.append)
+        tree, cost = solver.solve()
+        self.assertTrue(solver.stats.timeout)
+        self.assertFalse(solver.optimal)
+        self.assertTrue(reports)
+        self.assertEqual(sum(self.play(words, tree)), cost)
+
+    def test_infeasible(self):
+        # each guess rules out a single word
+        words = [c + "xxxx" for c in "abcdefgh"]
+        with self.assertRaises(StrategyError):
+            OptimalSolver(words).solve()
+
+    def test_unknown_objective(self):
+        with self.assertRaises(ValueError):
+            OptimalSolver(["aaaaa"], "average")
@@ -1,13 +1,22 @@
 import json
+import math
 import unittest
 from pathlib import Path
 
+import numpy as np
+
+from wordle.dictionary import encode_words
 from wordle.strategy import Strategy, StrategyError
+from wordle.strategy.entropy_strategy import EntropyStrategy, entropy
 from wordle.strategy.heuristic_strategy import HeuristicStrategy
 from wordle.strategy.minmax_strategy import MinMaxStrategy
+from wordle.strategy.multi_board_strategy import MultiBoardStrategy
+from wordle.strategy.partition_strategy import resolved_guesses
 from wordle.strategy.precomputed_strategy import (
-    PrecomputedStrategy, DecisionTree, build_tree_from_dict, build_tree)
-from wordle.utils import load_words
+    PrecomputedStrategy, DecisionTree, build_tree_from_dict, build_tree,
+    build_tree_parallel, candidate_partition)
+from wordle.strategy.utils import filter_candidates
+from wordle.utils import evaluate_feedback, load_words
 
 DATA_ROOT = Path(__file__).parent.parent / "data"
 
@@ -30,6 +39,38 @@ class TestStrategy(unittest.TestCase):
         self.assertEqual(s.guesses, ["aaaaa"])
         self.assertEqual(s.feedback, ["XXXXX"])
 
+    def test_strategy_rollback(self):
+        s = Strategy(["abccc", "abbbb", "aaaaa"])
+        s.update("aaaaa", "X____")
+        self.assertEqual(s.candidates, ["abccc", "abbbb"])
+        s.update("abbbb", "XX___")
+        self.assertEqual(s.candidates, ["abccc"])
+
+        s.rollback()
+        self.assertEqual(s.guesses, ["aaaaa"])
+        self.assertEqual(s.candidates, ["abccc", "abbbb"])
+
+        with self.assertRaises(StrategyError):
+            s.rollback(2)
+
+        s.reset()
+        self.assertEqual(s.guesses, [])
+        self.assertEqual(s.candidates, ["abccc", "abbbb", "aaaaa"])
+
+    def test_strategy_set_history(self):
+        s = Strategy(self.dictionary)
+        s.set_history(["arose", "unity"], [".____", "__.._"])
+        self.assertIn("tacit", s.candidates)
+        trail = list(s._trail)
+
+        s.set_history(["arose", "unity", "plait"], [".____", "__.._", "__.XX"])
+        self.assertEqual(s._trail[:3], trail)
+        self.assertIn("tacit", s.candidates)
+
+        s.set_history(["arose"], ["_____"])
+        self.assertEqual(s.guesses, ["arose"])
+        self.assertNotIn("tacit", s.candidates)
+
     def test_heuristic(self):
         s = HeuristicStrategy(["abccc", "abbbb", "aaaaa"])
         self.assertEqual(s.occurrences, {"a": 3, "b": 2, "c": 1})
@@ -50,6 +91,44 @@ class TestStrategy(unittest.TestCase):
         with self.assertRaises(StrategyError):
             s.guess()
 
+    def test_heuristic_incremental(self):
+        words = self.dictionary[:500]
+        s = HeuristicStrategy(words)
+        rank = {w: i for i, w in enumerate(s.candidates)}
+
+        def build_occurrences(words):
+            occurrences = {}
+            for word in words:
+                for letter in set(word):
+                    occurrences[letter] = occurrences.get(letter, 0) + 1
+            return occurrences
+
+        def expected():
+            occurrences = build_occurrences(s.candidates)
+            return min(
+                s.candidates,
+                key=lambda w: (-sum(occurrences[x] for x in w), rank[w]),
+            )
+
+        for secret in (words[0], words[123], words[499], words[123]):
+            s.reset()
+            self.assertEqual(s.occurrences, build_occurrences(words))
+            while True:
+                guess = s.guess()
+                self.assertEqual(guess, expected())
+                if guess == secret:
+                    break
+                s.update(guess, evaluate_feedback(secret, guess))
+                self.assertEqual(s.occurrences, build_occurrences(s.candidates))
+
+        guesses = ["arose", "unity"]
+        s.set_history(guesses, [evaluate_feedback(words[300], g) for g in guesses])
+        self.assertEqual(s.guess(), expected())
+        s.rollback()
+        self.assertEqual(s.guess(), expected())
+        s.push("unity", evaluate_feedback(words[200], "unity"))
+        self.assertEqual(s.guess(), expected())
+
     def test_minmax(self):
         words = ["abccc", "abbbb", "aaaaa"]
         s = MinMaxStrategy(words)
@@ -69,6 +148,156 @@ class TestStrategy(unittest.TestCase):
         with self.assertRaises(StrategyError):
             s.guess()
 
+    def test_minmax_dictionary(self):
+        words = self.dictionary[:300]
+        best_score, best_guess = float("inf"), None
+        for guess in words:
+            counter = {}
+            for target in words:
+                f = evaluate_feedback(target, guess)
+                counter[f] = counter.get(f, 0) + 1
+            if max(counter.values()) < best_score:
+                best_score, best_guess = max(counter.values()), guess
+
+        self.assertEqual(MinMaxStrategy(words).guess(), best_guess)
+
+    def test_minmax_allowed(self):
+        words = ["aaaab", "aaaac", "aaaad", "aaaae"]
+        s = MinMaxStrategy(words, ["bcdez", "bcdef"])
+        # "bcdez" splits the candidates as "bcdef" does, and comes first
+        self.assertEqual(s.guess(), "bcdez")
+        s.update("bcdez", ".____")
+        self.assertEqual(s.candidates, ["aaaab"])
+        self.assertEqual(s.guess(), "aaaab")
+
+    def test_minmax_allowed_dictionary(self):
+        words = self.dictionary[:100]
+        allowed = self.dictionary[100:600]
+        pool = words + allowed
+
+        def best_guess(candidates):
+            scores = []
+            for guess in pool:
+                counter = {}
+                for target in candidates:
+                    f = evaluate_feedback(target, guess)
+                    counter[f] = counter.get(f, 0) + 1
+                scores.append(max(counter.values()))
+            best = [g for g, c in zip(pool, scores) if c == min(scores)]
+            return next((g for g in best if g in candidates), best[0])
+
+        s = MinMaxStrategy(words, allowed)
+        s.cache = None
+        for secret in words[::10]:
+            s.reset()
+            while len(s.candidates) > 1:
+                guess = s.guess()
+                self.assertEqual(guess, best_guess(s.candidates))
+                s.update(guess, evaluate_feedback(secret, guess))
+            # the pruned pools don't change the guess of the same candidates
+            fresh = MinMaxStrategy(words, allowed)
+            fresh.cache = None
+            fresh.set_history(s.guesses[:-1], s.feedback[:-1])
+            s.rollback()
+            self.assertEqual(fresh.guess(), s.guess())
+
+    def test_resolved_guesses(self):
+        candidates = encode_words(["abcde", "abcdf", "abcdg"])
+        guesses = encode_words(["abcxy", "xxxxe", "bacdx", "edcba"])
+        self.assertEqual(
+            resolved_guesses(guesses, candidates).tolist(),
+            [True, False, True, False],
+        )
+
+    def test_entropy(self):
+        words = ["abccc", "abbbb", "aaaaa"]
+        s = EntropyStrategy(words)
+        self.assertEqual(s.guess(), "abccc")
+
+        s.update("abccc", "X____")
+        self.assertEqual(s.candidates, ["aaaaa"])
+        self.assertEqual(s.guess(), "aaaaa")
+
+        s.update("aaaaa", "_____")
+        with self.assertRaises(StrategyError):
+            s.guess()
+
+    def test_entropy_dictionary(self):
+        words = self.dictionary[:300]
+        best_score, best_guess = -1, None
+        for guess in words:
+            counter = {}
+            for target in words:
+                f = evaluate_feedback(target, guess)
+                counter[f] = counter.get(f, 0) + 1
+            score = -sum(
+                c / len(words) * math.log2(c / len(words)) for c in counter.values()
+            )
+            if score > best_score + 1e-9:
+                best_score, best_guess = score, guess
+
+        self.assertEqual(EntropyStrategy(words).guess(), best_guess)
+
+    def test_entropy_function(self):
+        counts = entropy(np.array([[4, 0, 0, 0], [1, 1, 1, 1], [2, 2, 0, 0]]))
+        self.assertEqual(counts.tolist(), [0, 2, 1])
+
+    def test_multi_board(self):
+        words = self.dictionary[:300]
+        secrets = [words[10], words[150], words[10]]
+        s = MultiBoardStrategy(words, 3)
+        guess = s.guess()
+
+        def score(guess, boards):
+            total = 0
+            for candidates in boards:
+                counter = {}
+                for target in candidates:
+                    f = evaluate_feedback(target, guess)
+                    counter[f] = counter.get(f, 0) + 1
+                total -= sum(
+                    c / len(candidates) * math.log2(c / len(candidates))
+                    for c in counter.values()
+                )
+            return total
+
+        self.assertAlmostEqual(
+            score(guess, [words] * 3), max(score(g, [words] * 3) for g in words)
+        )
+        s.update(guess, [evaluate_feedback(x, guess) for x in secrets])
+        for board, secret in zip(s.boards, secrets):
+            self.assertIn(secret, board.candidates)
+            self.assertEqual(
+                board.candidates,
+                filter_candidates(words, s.guesses, [evaluate_feedback(secret, g)
+                                                     for g in s.guesses]),
+            )
+        # the first and third boards have the same secret, so the same candidates
+        boards = [b.candidates for b in s.boards]
+        self.assertEqual(boards[0], boards[2])
+        union = set(sum(boards, []))
+        self.assertAlmostEqual(
+            score(s.guess(), boards), max(score(g, boards) for g in union)
+        )
+
+        s.set_history([secrets[1]], [[evaluate_feedback(x, secrets[1])
+                                      for x in secrets]])
+        self.assertEqual(s.solved, [False, True, False])
+        self.assertEqual(s.boards[1].candidates, [secrets[1]])
+        s.update(secrets[0], [evaluate_feedback(x, secrets[0]) for x in secrets])
+        self.assertEqual(s.solved, [True, True, True])
+        with self.assertRaises(StrategyError):
+            s.guess()
+        with self.assertRaises(ValueError):
+            s.update(secrets[0], ["XXXXX"])
+
+        s.reset()
+        self.assertEqual(s.solved, [False, False, False])
+        s.update("zzzzz", ["_____", "X____", "_____"])
+        self.assertEqual(s.boards[1].candidates, [])
+        with self.assertRaises(StrategyError):
+            s.guess()
+
     def test_precomputed_heuristic(self):
         words = ["abccc", "abbbb", "aaaaa"]
         s = PrecomputedStrategy(words, HeuristicStrategy(words))
@@ -83,8 +312,9 @@ class TestStrategy(unittest.TestCase):
         with self.assertRaises(StrategyError):
             s.update("ccccc", "X____")
 
-        with self.assertRaises(StrategyError):
+        with self.assertRaises(StrategyError) as cm:
             s.update("aaaaa", "XX___")
+        self.assertEqual(cm.exception.args, ("unexpected feedback XX___",))
 
         s.update("aaaaa", "X____")
         guess = s.guess()
@@ -113,8 +343,16 @@ class TestStrategy(unittest.TestCase):
         s = PrecomputedStrategy(filename=filename)
 
         self.assertEqual(s.dictionary, ["aaaaa", "abbbb", "aabbb"])
+        self.assertEqual(s.candidates, ["aaaaa", "abbbb", "aabbb"])
         self.assertEqual(s.guess(), "aaaaa")
 
+        s.set_history(["aaaaa"], ["X____"])
+        self.assertEqual(s.guess(), "abbbb")
+        self.assertEqual(s.candidates, ["aaaaa", "abbbb", "aabbb"])
+        # following the tree doesn't filter the candidates
+        self.assertIsNone(s._constraints)
+        s.reset()
+
         s.update("aaaaa", "X____")
         self.assertEqual(s.guess(), "abbbb")
 
@@ -153,6 +391,38 @@ class TestStrategy(unittest.TestCase):
         tree = build_tree(Strategy([]), ["aaaaa"] * 7, ["_____"] * 7)
         self.assertIsNone(tree)
 
+    def test_candidate_partition(self):
+        words = ["abccc", "abbbb", "aaaaa", "acccc", "bbbbb"]
+        for s in (Strategy(words), MinMaxStrategy(words)):
+            partition = candidate_partition(s, "abbbb")
+            self.assertEqual(list(partition), ["XX___", "XXXXX", "X____", "_XXXX"])
+            self.assertEqual(
+                {f: [words[i] for i in p] for f, p in partition.items()},
+                {
+                    "XX___": ["abccc"],
+                    "XXXXX": ["abbbb"],
+                    "X____": ["aaaaa", "acccc"],
+                    "_XXXX": ["bbbbb"],
+                },
+            )
+
+    def test_build_tree_pushed_candidates(self):
+        # children built from the pushed parts match refiltering the history
+        words = self.dictionary[:300]
+        tree = build_tree(HeuristicStrategy(words), [], [])
+        s = HeuristicStrategy(words)
+        for f, subtree in tree.choice.items():
+            s.set_history([tree.guess], [f])
+            self.assertEqual(subtree.guess, s.guess())
+
+    def test_build_tree_parallel(self):
+        words = self.dictionary[:200]
+        serial = build_tree(MinMaxStrategy(words), [], [])
+        for depth in (1, 2):
+            tree = build_tree_parallel(MinMaxStrategy(words), 2, depth)
+            self.assertEqual(
+                json.dumps(tree.to_dict()), json.dumps(serial.to_dict()))
+
     def test_build_tree_from_dict(self):
         d = {
             "guess": "aaaaa",
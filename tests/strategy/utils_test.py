@@ -1,7 +1,11 @@
 import unittest
 
-from wordle.utils import evaluate_feedback
-from wordle.strategy.utils import filter_candidates, is_candidate
+import numpy as np
+
+from wordle.feedback import get_feedback_matrix
+from wordle.utils import FeedbackCache, evaluate_feedback, evaluate_feedback_code
+from wordle.strategy.constraints import ConstraintIndex
+from wordle.strategy.utils import filter_candidates, is_candidate, narrow_candidates
 
 
 class TestPlayerUtils(unittest.TestCase):
@@ -16,6 +20,36 @@ class TestPlayerUtils(unittest.TestCase):
         self.assertEqual(evaluate_feedback("pearl", "eerie"), "_X.__")
         self.assertEqual(evaluate_feedback("talon", "salsa"), "_XX__")
 
+    def test_evaluate_feedback_code(self):
+        self.assertEqual(evaluate_feedback_code("house", "house"), 242)
+        self.assertEqual(evaluate_feedback_code("house", "wrong"), 9)
+
+    def test_feedback_cache(self):
+        cache = FeedbackCache(2)
+        calls = []
+
+        def compute(word, guess):
+            calls.append((word, guess))
+            return evaluate_feedback_code(word, guess)
+
+        self.assertEqual(cache.get("house", "house", compute), 242)
+        self.assertEqual(cache.get("house", "house", compute), 242)
+        cache.get("house", "wrong", compute)
+        cache.get("house", "house", compute)
+        cache.get("abide", "speed", compute)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(
+            cache.stats(), {"entries": 2, "hits": 2, "misses": 3, "evictions": 1}
+        )
+        self.assertEqual(len(calls), 3)
+        # the least recently used entry is evicted
+        cache.get("house", "house", compute)
+        self.assertEqual(cache.hits, 3)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+
     def test_is_candidate(self):
         self.assertTrue(is_candidate("house", ["house"], ["XXXXX"]))
         self.assertFalse(is_candidate("house", ["wrong"], ["XXXXX"]))
@@ -71,3 +105,19 @@ class TestPlayerUtils(unittest.TestCase):
             ),
             ["aaaaa"],
         )
+
+    def test_invalid_feedback(self):
+        words = ["aaaaa", "bbbbb", "acccc"]
+        matrix = get_feedback_matrix(words)
+        constraints = ConstraintIndex(words)
+        candidates = np.arange(len(words), dtype=np.int32)
+        # a guess of the dictionary is looked up in the matrix, the others are
+        # evaluated or looked up in the constraint index: all agree with
+        # is_candidate
+        for guess in ("aaaaa", "abbbb"):
+            self.assertFalse(is_candidate("aaaaa", [guess], ["X?___"]))
+            self.assertEqual(filter_candidates(words, [guess], ["X?___"], matrix), [])
+            narrowed = narrow_candidates(
+                candidates, guess, "X?___", constraints, matrix
+            )
+            self.assertEqual(narrowed.tolist(), [])
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from wordle.benchmark import play_game
+from wordle.config import MAX_ATTEMPTS
+from wordle.strategy.heuristic_strategy import HeuristicStrategy
+from wordle.strategy.precomputed_strategy import DecisionTree, PrecomputedStrategy
+from wordle.tree_analysis import analyze_tree
+from wordle.utils import load_words
+
+DATA_ROOT = Path(__file__).parent / "data"
+
+
+class TestTreeAnalysis(unittest.TestCase):
+
+    def test_analyze_tree(self):
+        words = ["aaaaa", "abbbb", "aabbb", "ccccc"]
+        tree = DecisionTree("aaaaa", {
+            "X____": DecisionTree("aabbb", {
+                "X_XXX": DecisionTree("abbbb", {}),
+            }),
+            "XX___": DecisionTree("aabbb", {}),
+            # malformed feedback, reached by no secret
+            "?????": DecisionTree("ccccc", {}),
+        })
+        report = analyze_tree(tree, words)
+        self.assertEqual(report["secrets"], 4)
+        self.assertEqual(report["nodes"], 4)
+        self.assertEqual(report["avg guesses"], 2)
+        self.assertEqual(report["worst guesses"], 3)
+        self.assertEqual(
+            report["histogram"], {n: int(n <= 3) for n in range(1, MAX_ATTEMPTS + 1)}
+        )
+        self.assertEqual(report["failures"], [])
+        self.assertEqual(report["no branch"], ["ccccc"])
+
+    def test_analyze_tree_games(self):
+        words = load_words(DATA_ROOT / "words_test.txt")[:200]
+        strategy = PrecomputedStrategy(words, HeuristicStrategy(words))
+        report = analyze_tree(strategy.decision_tree, words)
+
+        histogram = {n: 0 for n in range(1, MAX_ATTEMPTS + 1)}
+        failures = []
+        for secret in words:
+            record = play_game(strategy, words, secret)
+            if record["solved"]:
+                histogram[len(record["guesses"])] += 1
+            else:
+                failures.append(secret)
+        self.assertEqual(
+            {n: c for n, c in report["histogram"].items() if n <= MAX_ATTEMPTS},
+            histogram,
+        )
+        self.assertEqual(sorted(report["failures"] + report["no branch"]), failures)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp) / "tree.tree"
+            strategy.save(filename)
+            mapped = PrecomputedStrategy(filename=filename)
+            self.assertEqual(analyze_tree(mapped.decision_tree, words), report)
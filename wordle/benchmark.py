@@ -0,0 +1,331 @@
+import cProfile
+import csv
+import io
+import json
+import pstats
+import random
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+
+from wordle.config import MAX_ATTEMPTS, SYMBOL_MATCH
+from wordle.dictionary import Dictionary, load_named_dictionary
+from wordle.game import Absurdle, Wordle
+from wordle.instrumentation import PhaseProfile, instrumentation
+from wordle.player.player import Player
+from wordle.strategy import Strategy, StrategyError
+from wordle.strategy.factory import select_strategy
+from wordle.utils import feedback_cache
+
+# number of chunks of secrets handed to each worker, to balance uneven games
+CHUNKS_PER_JOB = 4
+
+PERCENTILES = (50, 95, 99)
+
+# counters of the caches summed over the processes playing the games
+CACHE_COUNTERS = ("hits", "misses", "evictions")
+
+CSV_FIELDS = (
+    "secret",
+    "status",
+    "solved",
+    "attempts",
+    "guesses",
+    "feedback",
+    "execution_time",
+    "guess_times",
+    "message",
+)
+
+# strategies built by the current process, reused across chunks of secrets
+_strategies: Dict[Tuple, Tuple[List[str], Strategy]] = {}
+
+
+def load_benchmark(
+    strategy: str, dictionary: str, precomputed: bool, allowed: str = None
+) -> Tuple[List[str], Strategy]:
+    """Return the dictionary words and strategy, with the dictionary of `allowed`
+    guesses if named, built once per process. The compiled dictionary and large
+    feedback matrices are memory mapped from the cache, so that worker processes
+    share the pages loaded by the parent instead of computing their own."""
+    key = (strategy, dictionary, precomputed, allowed)
+    if key not in _strategies:
+        words = load_named_dictionary(dictionary)
+        guesses = load_allowed(allowed, words)
+        _strategies[key] = (
+            words,
+            select_strategy(strategy, words, precomputed, guesses),
+        )
+    return _strategies[key]
+
+
+def load_allowed(allowed: Optional[str], words: Dictionary) -> Optional[Dictionary]:
+    """Return the dictionary of allowed guesses named `allowed`, with words of the
+    same length of the dictionary words unless named with a length, if any."""
+    if allowed is None:
+        return None
+    return load_named_dictionary(allowed, word_length=words.word_length)
+
+
+def sample_secrets(words: List[str], sample: int, seed: int) -> List[str]:
+    """Sample the secrets from the whole dictionary, without changing the words
+    that the game and the strategy know about."""
+    if sample >= len(words):
+        return list(words)
+    return random.Random(seed).sample(words, sample)
+
+
+def play_game(
+    strategy: Strategy, words: List[str], secret: str, adversarial: bool = False
+) -> Dict:
+    """Play a game for the secret, or against an Absurdle game if `adversarial`,
+    whose record reports the last word left as the secret."""
+    if adversarial:
+        game = Absurdle(words)
+    else:
+        game = Wordle(words=words, secret=secret)
+    player = Player(game, strategy)
+    start = perf_counter()
+    try:
+        guesses, feedback = player.play()
+    except StrategyError as se:
+        return {
+            "secret": secret,
+            "status": "error",
+            "message": str(se),
+        }
+    execution_time = perf_counter() - start
+    player.strategy.reset()
+    secret = game.get_secret()
+    return {
+        "secret": secret,
+        "guesses": guesses,
+        "feedback": feedback,
+        "execution_time": execution_time,
+        "guess_times": player.timings,
+        "solved": bool(feedback) and feedback[-1] == SYMBOL_MATCH * len(secret),
+        "status": "complete",
+    }
+
+
+def cache_counters(strategy: Strategy) -> Dict[str, int]:
+    """Return the counters of the feedback cache and of the guess cache of the
+    strategy, if any, in the current process."""
+    caches = {"feedback cache": feedback_cache.stats()}
+    if strategy.cache is not None:
+        caches["guess cache"] = strategy.cache.stats()
+    return {
+        "{} {}".format(name, counter): stats[counter]
+        for name, stats in caches.items()
+        for counter in CACHE_COUNTERS
+    }
+
+
+def add_counters(total: Dict[str, int], before: Dict[str, int], after: Dict[str, int]):
+    """Add the difference of the counters to the total."""
+    for name, value in after.items():
+        total[name] = total.get(name, 0) + value - before.get(name, 0)
+
+
+def play_chunk(
+    strategy: str,
+    dictionary: str,
+    precomputed: bool,
+    secrets: List[str],
+    save_cache: bool = False,
+    allowed: str = None,
+    adversarial: bool = False,
+) -> Tuple[List[Dict], Dict[bytes, str], Dict[str, int]]:
+    """Play a game for each secret in a worker process, and return the records,
+    with `save_cache` the guesses computed for them, for the parent process to
+    save, and the cache counters of the games."""
+    words, s = load_benchmark(strategy, dictionary, precomputed, allowed)
+    before = cache_counters(s)
+    records = [play_game(s, words, secret, adversarial) for secret in secrets]
+    counters: Dict[str, int] = {}
+    add_counters(counters, before, cache_counters(s))
+    if save_cache and s.cache is not None:
+        return records, s.cache.take_added(), counters
+    return records, {}, counters
+
+
+def run_benchmark(
+    strategy: str,
+    dictionary: str,
+    secrets: List[str],
+    precomputed: bool,
+    jobs: int = 1,
+    save_cache: bool = False,
+    allowed: str = None,
+    adversarial: bool = False,
+    counters: Dict[str, int] = None,
+) -> Iterator[Dict]:
+    """Play a game for each secret and yield the records as soon as they are
+    available, in the order of the secrets whatever the number of jobs. With
+    `save_cache`, the guess cache of the strategy is saved once the games are
+    over, merged with the guesses computed by the worker processes. With
+    `adversarial`, the games are played against Absurdle and the secrets only
+    set their number. The cache counters of the games, in whatever process they
+    are played, are added to `counters` if given."""
+    words, s = load_benchmark(strategy, dictionary, precomputed, allowed)
+    if counters is None:
+        counters = {}
+
+    if jobs == 1:
+        before = cache_counters(s)
+        for secret in secrets:
+            yield play_game(s, words, secret, adversarial)
+        add_counters(counters, before, cache_counters(s))
+        if save_cache and s.cache is not None:
+            s.cache.save()
+        return
+
+    size = max(1, -(-len(secrets) // (effective_n_jobs(jobs) * CHUNKS_PER_JOB)))
+    chunks = [secrets[i : i + size] for i in range(0, len(secrets), size)]
+    # results are returned in order of submission, so merging is deterministic
+    for chunk, guesses, chunk_counters in Parallel(n_jobs=jobs, return_as="generator")(
+        delayed(play_chunk)(
+            strategy,
+            dictionary,
+            precomputed,
+            chunk,
+            save_cache,
+            allowed,
+            adversarial,
+        )
+        for chunk in chunks
+    ):
+        if s.cache is not None:
+            s.cache.merge(guesses)
+        add_counters(counters, {}, chunk_counters)
+        yield from chunk
+    # only the parent writes the cache, so that workers don't overwrite each other
+    if save_cache and s.cache is not None:
+        s.cache.save()
+
+
+class RecordWriter:
+    """Write benchmark records to a JSONL or CSV file, according to its suffix,
+    flushing each record as soon as it is written."""
+
+    FORMATS = ("jsonl", "csv")
+
+    def __init__(self, file: IO, fmt: str):
+        if fmt not in self.FORMATS:
+            raise ValueError("unknown records format: %s" % fmt)
+        self._file = file
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            self._csv.writeheader()
+
+    @classmethod
+    def format_of(cls, filename: str) -> str:
+        return Path(filename).suffix.lstrip(".").lower()
+
+    def write(self, record: Dict):
+        if self._csv is None:
+            self._file.write(json.dumps(record) + "\n")
+        else:
+            row = dict(record)
+            if "guesses" in record:
+                row["attempts"] = len(record["guesses"])
+                row["guesses"] = " ".join(record["guesses"])
+                row["feedback"] = " ".join(record["feedback"])
+                row["guess_times"] = " ".join(map(str, record["guess_times"]))
+            self._csv.writerow(row)
+        self._file.flush()
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    stats = {
+        "p{}".format(p): v
+        for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES).tolist())
+    }
+    stats["max"] = max(values)
+    return stats
+
+
+def summarize(records: List[Dict]) -> Dict:
+    """Aggregate the benchmark records: averages, latency percentiles of games
+    and guesses, histogram of the number of guesses of solved games, failures to
+    find the secret within MAX_ATTEMPTS and errors."""
+    complete = [r for r in records if r["status"] == "complete"]
+    solved = [r for r in complete if r["solved"]]
+    histogram = {n: 0 for n in range(1, MAX_ATTEMPTS + 1)}
+    for r in solved:
+        histogram[len(r["guesses"])] += 1
+    return {
+        "games": len(records),
+        "avg time": (
+            sum(r["execution_time"] for r in complete) / len(complete)
+            if complete
+            else None
+        ),
+        "avg guesses": (
+            sum(len(r["guesses"]) for r in complete) / len(complete)
+            if complete
+            else None
+        ),
+        "game latency": percentiles([r["execution_time"] for r in complete]),
+        "guess latency": percentiles([t for r in complete for t in r["guess_times"]]),
+        "histogram": histogram,
+        "failures": [r["secret"] for r in complete if not r["solved"]],
+        "errors": [r["secret"] for r in records if r["status"] == "error"],
+    }
+
+
+class BenchmarkProfiler:
+    """Profile the games played in the current process while in context: the
+    instrumentation hooks give the time of each phase (inclusive of the phases
+    it calls), counters and the number of candidates by move, while cProfile
+    and tracemalloc give the time by function and the peak memory. On exit the
+    report is written to `directory` as phases.json, profile.pstats and
+    profile.txt."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.report: Dict = {}
+        self._phases = PhaseProfile()
+        self._profile = cProfile.Profile()
+
+    def __enter__(self) -> "BenchmarkProfiler":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._cache = feedback_cache.stats()
+        instrumentation.subscribe(self._phases)
+        tracemalloc.start()
+        self._start = perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profile.disable()
+        wall = perf_counter() - self._start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        instrumentation.unsubscribe(self._phases)
+
+        cache = feedback_cache.stats()
+        self.report = {
+            "wall time": wall,
+            "tracemalloc peak": peak,
+            **self._phases.to_dict(),
+        }
+        for name in ("hits", "misses"):
+            self.report["counters"]["feedback cache " + name] = (
+                cache[name] - self._cache[name]
+            )
+
+        with open(self.directory / "phases.json", "w", encoding="utf8") as file:
+            json.dump(self.report, file, indent=2)
+        self._profile.dump_stats(self.directory / "profile.pstats")
+        text = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=text)
+        stats.sort_stats("cumulative").print_stats(40)
+        (self.directory / "profile.txt").write_text(text.getvalue(), encoding="utf8")
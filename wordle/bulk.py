@@ -0,0 +1,127 @@
+import io
+import json
+import select
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from wordle.config import BULK_BATCH_SIZE, MAX_ATTEMPTS
+from wordle.strategy import Strategy, StrategyError
+
+# guess and feedback of a step of a history
+Step = Tuple[str, str]
+
+
+class HistoryTrie:
+    """Prefix tree of histories, where each node is a history and lists the
+    requests that ask for its hint. Children are the histories one step longer
+    with that prefix."""
+
+    __slots__ = ("children", "requests")
+
+    def __init__(self):
+        self.children: Dict[Step, "HistoryTrie"] = {}
+        self.requests: List[int] = []
+
+    def insert(self, steps: List[Step], request: int):
+        node = self
+        for step in steps:
+            if step not in node.children:
+                node.children[step] = HistoryTrie()
+            node = node.children[step]
+        node.requests.append(request)
+
+    def walk(self, path: Tuple[Step, ...] = ()) -> Iterator[Tuple[Tuple, List[int]]]:
+        """Yield the histories with requests depth first, so that consecutive
+        histories share the longest prefixes."""
+        if self.requests:
+            yield path, self.requests
+        for step, child in self.children.items():
+            yield from child.walk(path + (step,))
+
+
+def parse_request(line: str) -> Tuple[Dict, Optional[List[Step]]]:
+    """Return the request object of a JSONL line and its history, or an error
+    record and None if the line is not a valid request."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return {"error": "invalid JSON line"}, None
+    if not isinstance(request, dict):
+        return {"error": "invalid request"}, None
+
+    guesses = request.get("guesses", [])
+    feedback = request.get("feedback", [])
+    if (
+        not isinstance(guesses, list)
+        or not isinstance(feedback, list)
+        or not all(isinstance(x, str) for x in guesses + feedback)
+    ):
+        error = "guesses and feedback must be lists of strings"
+        return dict(request, error=error), None
+    if len(guesses) != len(feedback) or len(guesses) > MAX_ATTEMPTS:
+        error = "guesses and feedback must be <= %d pairs" % MAX_ATTEMPTS
+        return dict(request, error=error), None
+    return request, list(zip(guesses, feedback))
+
+
+def bulk_hints(strategy: Strategy, lines: Iterable[str]) -> List[Dict]:
+    """Return the hint of each request line, in order, added to the request
+    object, or its error.
+
+    Requests are grouped by history in a HistoryTrie and visited depth first,
+    so that `Strategy.set_history` keeps the candidates of the prefix shared
+    with the previous history: each distinct prefix is filtered once, and each
+    distinct history scored once."""
+    records = []
+    trie = HistoryTrie()
+    for i, line in enumerate(lines):
+        record, steps = parse_request(line)
+        records.append(record)
+        if steps is not None:
+            trie.insert(steps, i)
+
+    for path, requests in trie.walk():
+        try:
+            strategy.set_history([g for g, _ in path], [f for _, f in path])
+            result = {"hint": strategy.guess()}
+        except (ValueError, StrategyError) as e:
+            result = {"error": str(e)}
+        for i in requests:
+            records[i] = dict(records[i], **result)
+    return records
+
+
+def run_bulk(
+    strategy: Strategy, input: IO, output: IO, batch_size: int = BULK_BATCH_SIZE
+) -> int:
+    """Stream the hints of the JSONL requests of the input to the output, one
+    batch of lines at a time, and return the number of requests.
+
+    A batch ends when it reaches the batch size or when no more input is ready,
+    so that the hints of an interactive input, e.g. a pipe, are written as soon
+    as their requests are read instead of when the input is closed."""
+    count = 0
+    batch = []
+    for line in input:
+        if line.strip():
+            batch.append(line)
+        if batch and (len(batch) >= batch_size or not _input_ready(input)):
+            count += _write_hints(strategy, batch, output)
+            batch = []
+    return count + _write_hints(strategy, batch, output)
+
+
+def _write_hints(strategy: Strategy, batch: List[str], output: IO) -> int:
+    for record in bulk_hints(strategy, batch):
+        output.write(json.dumps(record) + "\n")
+    output.flush()
+    return len(batch)
+
+
+def _input_ready(input: IO) -> bool:
+    """Return whether the input can be read without waiting. Inputs that are not
+    files, e.g. strings, are always ready."""
+    try:
+        ready, _, _ = select.select([input], [], [], 0)
+    except (io.UnsupportedOperation, OSError, ValueError, TypeError):
+        return True
+    return bool(ready)
@@ -9,5 +9,43 @@ SYMBOL_MISS: Final = "_"
 MAX_ATTEMPTS: Final = 6
 
 DATA_ROOT = Path(__file__).parent.parent / "data"
+CACHE_ROOT = Path(os.environ.get("WORDLE_CACHE", DATA_ROOT / "cache"))
 DEBUG = os.environ.get("DEBUG", False)
 LOG_LEVEL = logging.DEBUG if DEBUG else logging.WARNING
+
+# maximum number of feedback codes kept by the evaluate_feedback cache
+FEEDBACK_CACHE_SIZE = int(os.environ.get("WORDLE_FEEDBACK_CACHE_SIZE", 1 << 20))
+
+# maximum number of guesses kept by each strategy guess cache
+GUESS_CACHE_SIZE = int(os.environ.get("WORDLE_GUESS_CACHE_SIZE", 1 << 16))
+
+# suffix of the precomputed decision trees in the binary format
+TREE_SUFFIX: Final = ".tree"
+
+# depth of the decision tree below which subtrees are built in parallel
+PARALLEL_TREE_DEPTH: Final = 1
+
+# dictionaries smaller than this are cheaper to recompute than to load from disk
+MATRIX_PERSIST_MIN_WORDS: Final = 1024
+
+# largest feedback matrix kept in memory or on disk, in bytes, beyond which the
+# feedback codes are computed on demand
+MATRIX_MAX_BYTES = int(os.environ.get("WORDLE_MATRIX_MAX_BYTES", 1 << 30))
+
+# number of lines of a bulk hints input grouped together by history prefix
+BULK_BATCH_SIZE: Final = 100000
+
+# seconds after which idle sessions of the hint server are dropped
+SERVER_SESSION_TTL: Final = 3600
+
+# number of latencies of each route kept by the hint server metrics
+SERVER_LATENCY_WINDOW: Final = 10000
+
+# largest request body accepted by the hint server, in bytes
+SERVER_MAX_BODY: Final = 1 << 16
+
+# minimum duration of a round of calls of a performance case, in seconds
+PERF_MIN_TIME: Final = 0.05
+
+# fraction of its baseline by which a performance case can be slower
+PERF_THRESHOLD = float(os.environ.get("WORDLE_PERF_THRESHOLD", 0.5))
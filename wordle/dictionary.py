@@ -0,0 +1,244 @@
+import hashlib
+import os
+import struct
+from collections import Counter
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from wordle.config import CACHE_ROOT, DATA_ROOT
+from wordle.files import write_aside
+
+# Compiled dictionary format, all integers are little endian:
+# - header: magic, format version, word length, number of words, size and
+#   modification time in nanoseconds of the source text file, and sha256 digest
+#   of the words (see `dictionary_hash`);
+# - words: fixed width ascii records, i.e. a (words, word length) uint8 array.
+MAGIC = b"WDIC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQQ32s")
+
+
+def load_words(filename: str, word_length: int = None) -> List[str]:
+    """Return the words of the text file, one per line, of the given length or
+    otherwise of the most common length in the file."""
+    with open(filename, "r", encoding="utf8") as file:
+        words = file.read().splitlines()
+    if word_length is None:
+        lengths = Counter(len(w) for w in words if w)
+        word_length = lengths.most_common(1)[0][0] if lengths else 0
+    return [w for w in words if len(w) == word_length]
+
+
+def encode_words(words: List[str]) -> np.ndarray:
+    """Return the words as a (len(words), word length) array of letter bytes."""
+    if isinstance(words, Dictionary):
+        return words.letters
+    length = len(words[0]) if words else 0
+    data = "".join(words).encode("ascii")
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(words), length)
+
+
+def dictionary_hash(words: List[str]) -> str:
+    if isinstance(words, Dictionary):
+        return words.digest
+    return hashlib.sha256("\n".join(words).encode("utf8")).hexdigest()
+
+
+class Dictionary(Sequence):
+    """Immutable sequence of words of the same length, backed by an array of
+    their letter bytes that can be memory mapped from a compiled dictionary.
+
+    The strings are decoded once, on first access, and the content digest is
+    computed only when not known from the compiled file. Dictionaries are equal
+    to any sequence of the same words."""
+
+    def __init__(self, letters: np.ndarray, digest: str = None, filename: Path = None):
+        self.letters = letters
+        self.filename = filename
+        self._digest = digest
+        self._words: Optional[Tuple[str, ...]] = None
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_words(cls, words: List[str]) -> "Dictionary":
+        return cls(encode_words(list(words)))
+
+    @property
+    def word_length(self) -> int:
+        return self.letters.shape[1]
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = dictionary_hash(self.words)
+        return self._digest
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        if self._words is None:
+            data = self.letters.tobytes().decode("ascii")
+            length = self.word_length
+            self._words = tuple(
+                data[i : i + length] for i in range(0, len(data), length)
+            )
+        return self._words
+
+    def __len__(self) -> int:
+        return self.letters.shape[0]
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(i, slice):
+            return list(self.words[i])
+        return self.words[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.positions
+
+    def index(self, word: str, *args) -> int:
+        if word not in self.positions:
+            raise ValueError("{} is not in the dictionary".format(word))
+        return self.positions[word]
+
+    @property
+    def positions(self) -> Dict[str, int]:
+        """Index of each word, built on first use."""
+        if self._index is None:
+            self._index = {w: i for i, w in enumerate(self.words)}
+        return self._index
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Dictionary):
+            return len(self) == len(other) and self.digest == other.digest
+        if isinstance(other, (list, tuple)):
+            return list(self.words) == list(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __repr__(self) -> str:
+        return "Dictionary({} words, {})".format(len(self), self.digest[:12])
+
+    def __reduce__(self):
+        # processes map the compiled file, or get their own copy of the words
+        if self.filename is not None:
+            return open_dictionary, (self.filename,)
+        return intern_dictionary, (list(self.words),)
+
+
+def compile_dictionary(
+    source: Path, filename: Path, word_length: int = None
+) -> Dictionary:
+    """Compile the words of the source text file, as read by `load_words`,
+    writing aside and renaming so that readers never see a partial file."""
+    words = Dictionary.from_words(load_words(source, word_length))
+    stat = os.stat(source)
+    with write_aside(filename) as partial:
+        with open(partial, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    words.word_length,
+                    len(words),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    bytes.fromhex(words.digest),
+                )
+            )
+            file.write(words.letters.tobytes())
+    return words
+
+
+def read_header(filename: Path) -> Tuple:
+    with open(filename, "rb") as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size or header[:4] != MAGIC:
+        raise ValueError("{} is not a compiled dictionary".format(filename))
+    fields = HEADER.unpack(header)
+    if fields[1] != VERSION:
+        raise ValueError("unsupported dictionary version %d" % fields[1])
+    return fields
+
+
+_dictionaries: Dict[str, Dictionary] = {}
+_sources: Dict[Tuple[Path, Optional[int]], Dictionary] = {}
+
+
+def open_dictionary(filename: Path) -> Dictionary:
+    """Memory map a compiled dictionary, shared within the process."""
+    _, _, length, size, _, _, digest = read_header(filename)
+    digest = digest.hex()
+    if digest not in _dictionaries:
+        if size:
+            letters = np.memmap(
+                filename,
+                dtype=np.uint8,
+                mode="r",
+                offset=HEADER.size,
+                shape=(size, length),
+            )
+        else:
+            letters = np.zeros((0, length), dtype=np.uint8)
+        _dictionaries[digest] = Dictionary(letters, digest, Path(filename))
+    return _dictionaries[digest]
+
+
+def intern_dictionary(words: List[str]) -> Dictionary:
+    """Return the dictionary of the words shared within the process, so that
+    every component holds the same object."""
+    digest = dictionary_hash(words)
+    if digest not in _dictionaries:
+        if isinstance(words, Dictionary):
+            _dictionaries[digest] = words
+        else:
+            _dictionaries[digest] = Dictionary(encode_words(list(words)), digest)
+    return _dictionaries[digest]
+
+
+def load_dictionary(
+    source: Path, cache_root: Path = CACHE_ROOT, word_length: int = None
+) -> Dictionary:
+    """Return the dictionary of the source text file, shared within the process,
+    with the words of the given length (see `load_words`). The file is compiled
+    in the cache directory the first time, and compiled again only when its size
+    or modification time change."""
+    source = Path(source).resolve()
+    key = (source, word_length)
+    if key in _sources:
+        return _sources[key]
+
+    stat = os.stat(source)
+    path = str(source) if word_length is None else "{}:{}".format(source, word_length)
+    name = hashlib.sha256(path.encode("utf8")).hexdigest()[:16]
+    filename = Path(cache_root) / "dictionary_{}_{}.dict".format(source.stem, name)
+    try:
+        _, _, _, _, size, mtime, _ = read_header(filename)
+        stale = (size, mtime) != (stat.st_size, stat.st_mtime_ns)
+    except (OSError, ValueError):
+        stale = True
+    if stale:
+        compile_dictionary(source, filename, word_length)
+
+    _sources[key] = open_dictionary(filename)
+    return _sources[key]
+
+
+def load_named_dictionary(
+    name: str, cache_root: Path = CACHE_ROOT, word_length: int = None
+) -> Dictionary:
+    """Return the dictionary of a file of the data directory, named `<file>` or
+    `<file>:<word length>` to select the words of another length than the most
+    common one (or than `word_length` if given), e.g. "words.txt:6"."""
+    filename, _, length = name.partition(":")
+    return load_dictionary(
+        DATA_ROOT / "dictionaries" / filename,
+        cache_root,
+        int(length) if length else word_length,
+    )
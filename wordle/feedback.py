@@ -0,0 +1,309 @@
+import functools
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from wordle.config import (
+    CACHE_ROOT,
+    MATRIX_MAX_BYTES,
+    MATRIX_PERSIST_MIN_WORDS,
+    SYMBOL_MATCH,
+    SYMBOL_MISPLACED,
+    SYMBOL_MISS,
+)
+from wordle.dictionary import dictionary_hash, encode_words
+from wordle.files import write_aside
+
+# feedback symbols indexed by their digit in the base 3 feedback code
+FEEDBACK_SYMBOLS = (SYMBOL_MISS, SYMBOL_MISPLACED, SYMBOL_MATCH)
+FEEDBACK_DIGITS = {symbol: digit for digit, symbol in enumerate(FEEDBACK_SYMBOLS)}
+
+# upper bound of cells evaluated at once by the vectorized kernel
+BLOCK_CELLS = 1 << 23
+
+
+def feedback_codes(length: int) -> int:
+    """Return the number of distinct feedback codes of words of the length."""
+    return 3**length
+
+
+def feedback_dtype(length: int) -> np.dtype:
+    """Return the smallest unsigned integer type that holds the feedback codes of
+    words of the length: uint8 up to 5 letters, uint16 up to 10."""
+    return np.min_scalar_type(feedback_codes(length) - 1)
+
+
+def encode_feedback(feedback: str) -> int:
+    """Encode a feedback string as an integer in [0, 3^len(feedback)), where the
+    symbol at position i is the i-th base 3 digit."""
+    code = 0
+    for symbol in reversed(feedback):
+        if symbol not in FEEDBACK_DIGITS:
+            raise ValueError("invalid feedback symbol: %s" % symbol)
+        code = code * 3 + FEEDBACK_DIGITS[symbol]
+    return code
+
+
+@functools.lru_cache(maxsize=None)
+def decode_feedback(code: int, length: int) -> str:
+    """Decode an integer feedback code back to its string form."""
+    symbols = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        symbols.append(FEEDBACK_SYMBOLS[digit])
+    return "".join(symbols)
+
+
+def compute_feedback_block(guesses: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Vectorized `evaluate_feedback` of every encoded guess against every encoded
+    target, returned as a (len(guesses), len(targets)) array of feedback codes.
+
+    A guess letter that is not a match is misplaced when the target has more
+    unmatched occurrences of that letter than the unmatched occurrences of the
+    same letter earlier in the guess, i.e. misplaced symbols are assigned left to
+    right exactly as in `evaluate_feedback`."""
+    return _feedback_kernel(guesses[:, None, :], targets[None, :, :])
+
+
+def _feedback_kernel(g: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Return the feedback codes of the encoded guesses and targets, broadcast
+    against each other on all but the last axis, the letters."""
+    match = g == t
+    unmatched = ~match
+    # unmatched target letters, letter bytes are never zero
+    free = np.where(match, np.uint8(0), t)
+
+    dtype = feedback_dtype(g.shape[-1])
+    codes = np.zeros(match.shape[:-1], dtype=dtype)
+    for i in range(g.shape[-1]):
+        letter = g[..., i : i + 1]
+        available = (free == letter).sum(axis=-1, dtype=np.uint8)
+        previous = ((g[..., :i] == letter) & unmatched[..., :i]).sum(
+            axis=-1, dtype=np.uint8
+        )
+        digit = np.where(match[..., i], np.uint8(2), previous < available)
+        codes += digit.astype(dtype) * dtype.type(3**i)
+    return codes
+
+
+def evaluate_feedback_pairs(guesses: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Return the feedback code of each encoded guess against the target at the
+    same position, evaluated within BLOCK_CELLS cells at once."""
+    if guesses.shape != targets.shape:
+        raise ValueError("guesses and targets must have the same shape")
+    length = guesses.shape[1]
+    codes = np.empty(len(guesses), dtype=feedback_dtype(length))
+    block = max(1, BLOCK_CELLS // max(1, length) ** 2)
+    for start in range(0, len(guesses), block):
+        codes[start : start + block] = _feedback_kernel(
+            guesses[start : start + block], targets[start : start + block]
+        )
+    return codes
+
+
+def evaluate_feedback_many(guess: str, targets: List[str]) -> np.ndarray:
+    """Return the feedback code of the guess against each target, as
+    `evaluate_feedback_code` would. Targets are words or their letter array,
+    see `encode_words`."""
+    return _evaluate_blocks(encode_words([guess]), _encoded(targets))[0]
+
+
+def evaluate_feedback_guesses(guesses: List[str], target: str) -> np.ndarray:
+    """Return the feedback code of each guess against the target, as
+    `evaluate_feedback_code` would. Guesses are words or their letter array, see
+    `encode_words`."""
+    return _evaluate_blocks(_encoded(guesses), encode_words([target]))[:, 0]
+
+
+def _encoded(words: List[str]) -> np.ndarray:
+    if isinstance(words, np.ndarray):
+        return words
+    return encode_words(words)
+
+
+def _evaluate_blocks(guesses: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Compute the feedback block by block, within BLOCK_CELLS cells at once, so
+    that any number of guesses or targets fits in a bounded memory."""
+    length = max(guesses.shape[1], targets.shape[1])
+    codes = np.empty((len(guesses), len(targets)), dtype=feedback_dtype(length))
+    if not codes.size:
+        return codes
+    if guesses.shape[1] != targets.shape[1]:
+        raise ValueError("guesses and targets must have the same length")
+    cells = max(1, guesses.shape[1]) ** 2
+    if len(guesses) >= len(targets):
+        block = max(1, BLOCK_CELLS // (cells * len(targets)))
+        for start in range(0, len(guesses), block):
+            codes[start : start + block] = compute_feedback_block(
+                guesses[start : start + block], targets
+            )
+    else:
+        block = max(1, BLOCK_CELLS // (cells * len(guesses)))
+        for start in range(0, len(targets), block):
+            codes[:, start : start + block] = compute_feedback_block(
+                guesses, targets[start : start + block]
+            )
+    return codes
+
+
+def compute_feedback_matrix(
+    words: List[str], out: np.ndarray = None, guesses: List[str] = None
+) -> np.ndarray:
+    """Compute the feedback codes of every guess, by default every word, on the
+    rows, against every word, as a target on the columns. Rows are computed in
+    blocks, and written into `out` if given."""
+    encoded = encode_words(words)
+    rows = encoded if guesses is None else encode_words(guesses)
+    if out is None:
+        out = np.empty((len(rows), len(words)), dtype=feedback_dtype(encoded.shape[1]))
+    if not len(words) or not len(rows):
+        return out
+    block = max(1, BLOCK_CELLS // (len(words) * encoded.shape[1]))
+    for start in range(0, len(rows), block):
+        stop = min(start + block, len(rows))
+        out[start:stop] = compute_feedback_block(rows[start:stop], encoded)
+    return out
+
+
+def partition_counts(
+    matrix: "FeedbackMatrix", guesses: np.ndarray, targets: np.ndarray
+) -> Iterator[np.ndarray]:
+    """Yield, for consecutive blocks of guesses, the (block, feedback codes) array
+    with the number of targets that each guess maps to each feedback code.
+
+    Targets are scored in tiles, so that at most BLOCK_CELLS codes are held at
+    once whatever the number of guesses and targets, and the matrix never needs
+    to hold every code of the dictionary."""
+    bins = matrix.feedback_codes
+    tile = max(1, min(len(targets), BLOCK_CELLS))
+    block = max(1, BLOCK_CELLS // max(tile, bins))
+    for start in range(0, len(guesses), block):
+        rows = guesses[start : start + block]
+        # shift each row to its own range of codes to bincount them in one pass
+        offsets = np.arange(len(rows), dtype=np.int64)[:, None] * bins
+        counts = None
+        # a single empty tile when there are no targets, to count zeros
+        for t in range(0, max(1, len(targets)), tile):
+            codes = matrix.block(rows, targets[t : t + tile])
+            tile_counts = np.bincount(
+                (codes + offsets).ravel(), minlength=len(rows) * bins
+            )
+            if counts is None:
+                counts = tile_counts
+            else:
+                counts += tile_counts
+        yield counts.reshape(len(rows), bins)
+
+
+class FeedbackMatrix:
+    """Feedback codes of every guess against every target of a dictionary.
+
+    The guesses are the words of the dictionary, followed by the other words of
+    the `allowed` guesses if given, so that a word has the same index as a guess
+    and as a target. The codes are held in memory or memory mapped, unless the
+    whole matrix would exceed MATRIX_MAX_BYTES: then `codes` is None, and rows
+    and blocks are computed on demand from the letters of the words."""
+
+    def __init__(
+        self, words: List[str], codes: np.ndarray = None, allowed: List[str] = None
+    ):
+        self.words = words
+        self.codes = codes
+        self.allowed = allowed
+        self.guesses = guess_pool(words, allowed)
+        self.index = {w: i for i, w in enumerate(self.guesses)}
+        self.word_length = len(words[0]) if words else 0
+        self.feedback_codes = feedback_codes(self.word_length)
+        self._letters = None
+
+    @property
+    def letters(self) -> np.ndarray:
+        """Letters of the guesses, the first rows being those of the words."""
+        if self._letters is None:
+            self._letters = encode_words(self.guesses)
+        return self._letters
+
+    def row(self, guess: int, targets: np.ndarray) -> np.ndarray:
+        """Return the codes of the guess, by index, against the targets."""
+        if self.codes is not None:
+            return self.codes[guess, targets]
+        letters = self.letters
+        return _evaluate_blocks(letters[guess : guess + 1], letters[targets])[0]
+
+    def block(self, guesses: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Return the codes of the guesses against the targets, by index."""
+        if self.codes is not None:
+            return self.codes[np.ix_(guesses, targets)]
+        return _evaluate_blocks(self.letters[guesses], self.letters[targets])
+
+    def indices(self, words: List[str]) -> np.ndarray:
+        """Return the target indices of the words, or raise KeyError if any of
+        them is not a word of the dictionary."""
+        indices = np.fromiter(
+            (self.index[w] for w in words), dtype=np.int64, count=len(words)
+        )
+        if len(indices) and indices.max() >= len(self.words):
+            raise KeyError("not a word of the dictionary")
+        return indices
+
+    def code(self, target: str, guess: str) -> int:
+        return int(self.row(self.index[guess], [self.index[target]])[0])
+
+    def feedback(self, target: str, guess: str) -> str:
+        return decode_feedback(self.code(target, guess), self.word_length)
+
+    @classmethod
+    def load(
+        cls,
+        words: List[str],
+        cache_root: Path = CACHE_ROOT,
+        allowed: List[str] = None,
+    ) -> "FeedbackMatrix":
+        """Load the matrix of the dictionary as a read-only memory map, computing
+        and saving it first when not found in the cache. Matrices larger than
+        MATRIX_MAX_BYTES are computed on demand instead."""
+        guesses = guess_pool(words, allowed)
+        dtype = feedback_dtype(len(words[0]) if words else 0)
+        if len(guesses) * len(words) * dtype.itemsize > MATRIX_MAX_BYTES:
+            return cls(words, None, allowed)
+        if len(guesses) < MATRIX_PERSIST_MIN_WORDS:
+            codes = compute_feedback_matrix(words, None, guesses)
+            return cls(words, codes, allowed)
+
+        name = dictionary_hash(words)
+        if allowed is not None:
+            name += "_" + dictionary_hash(guesses)[:16]
+        filename = Path(cache_root) / "feedback_{}.npy".format(name)
+        if not filename.exists():
+            with write_aside(filename) as partial:
+                out = np.lib.format.open_memmap(
+                    partial, mode="w+", dtype=dtype, shape=(len(guesses), len(words))
+                )
+                compute_feedback_matrix(words, out, guesses)
+                out.flush()
+                del out
+        return cls(words, np.load(filename, mmap_mode="r"), allowed)
+
+
+def guess_pool(words: List[str], allowed: List[str] = None) -> List[str]:
+    """Return the words followed by the allowed guesses that are not words."""
+    if allowed is None:
+        return words
+    known = set(words)
+    return list(words) + [w for w in allowed if w not in known]
+
+
+_matrices: Dict[Tuple[str, Optional[str]], FeedbackMatrix] = {}
+
+
+def get_feedback_matrix(words: List[str], allowed: List[str] = None) -> FeedbackMatrix:
+    """Return the feedback matrix of the dictionary, and of the allowed guesses
+    if given, shared within the process."""
+    key = (
+        dictionary_hash(words),
+        None if allowed is None else dictionary_hash(allowed),
+    )
+    if key not in _matrices:
+        _matrices[key] = FeedbackMatrix.load(words, allowed=allowed)
+    return _matrices[key]
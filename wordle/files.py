@@ -0,0 +1,21 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def write_aside(filename: Path) -> Iterator[Path]:
+    """Yield a partial file next to the filename to write, renamed to the filename
+    when the block completes, so that readers never see a partial file. The
+    partial file is removed if the block fails."""
+    filename = Path(filename)
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    partial = filename.with_suffix(".{}.partial".format(os.getpid()))
+    try:
+        yield partial
+    except BaseException:
+        if partial.exists():
+            partial.unlink()
+        raise
+    os.replace(partial, filename)
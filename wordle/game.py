@@ -1,6 +1,15 @@
 import random
 from typing import List
 
+import numpy as np
+
+from wordle.config import MAX_ATTEMPTS
+from wordle.dictionary import encode_words
+from wordle.feedback import (
+    decode_feedback,
+    evaluate_feedback_guesses,
+    evaluate_feedback_many,
+)
 from wordle.strategy.utils import evaluate_feedback
 
 
@@ -14,8 +23,76 @@ class Wordle:
     def evaluate(self, guess: str) -> str:
         return evaluate_feedback(self._secret, guess)
 
+    def evaluate_many(self, guesses: List[str]) -> List[str]:
+        """Return the feedback of each guess, evaluated at once."""
+        if not len(guesses):
+            return []
+        codes = evaluate_feedback_guesses(guesses, self._secret)
+        return [decode_feedback(code, len(self._secret)) for code in codes.tolist()]
+
     def get_secret(self):
         return self._secret
 
     def get_words(self):
         return self._words
+
+
+class MultiWordle:
+    """Game of several boards, each with its own secret, where every guess is
+    played on all the boards, as in Dordle (2 boards), Quordle (4) and Octordle
+    (8). Each extra board grants an extra attempt."""
+
+    def __init__(self, words: List[str], boards: int = 4, secrets: List[str] = None):
+        self._words = words
+        if secrets is None:
+            secrets = random.sample(list(words), boards)
+        self._secrets = list(secrets)
+        self.attempts = MAX_ATTEMPTS + len(self._secrets) - 1
+
+    def evaluate(self, guess: str) -> List[str]:
+        """Return the feedback of the guess on each board, evaluated at once."""
+        codes = evaluate_feedback_many(guess, self._secrets)
+        return [decode_feedback(code, len(guess)) for code in codes.tolist()]
+
+    def get_secrets(self) -> List[str]:
+        return list(self._secrets)
+
+    def get_words(self):
+        return self._words
+
+
+class Absurdle:
+    """Adversarial game that doesn't pick a secret: it keeps every word that is
+    still consistent with the feedback given, and answers each guess with the
+    feedback shared by most of them, as in Absurdle. Ties go to the lowest
+    feedback code, see `encode_feedback`. A strategy playing against it faces
+    its worst case, whatever the secret."""
+
+    def __init__(self, words: List[str]):
+        self._words = words
+        self._letters = encode_words(words)
+        self.reset()
+
+    def reset(self):
+        self._candidates = np.arange(len(self._words), dtype=np.int32)
+
+    def evaluate(self, guess: str) -> str:
+        length = self._letters.shape[1]
+        if len(guess) != length:
+            raise ValueError("guess must have %d letters" % length)
+        # one batched evaluation of the guess against every candidate
+        codes = evaluate_feedback_many(guess, self._letters[self._candidates])
+        code = int(np.argmax(np.bincount(codes)))
+        self._candidates = self._candidates[codes == code]
+        return decode_feedback(code, length)
+
+    @property
+    def candidates(self) -> List[str]:
+        return [self._words[i] for i in self._candidates.tolist()]
+
+    def get_secret(self):
+        """Return the first word still consistent with the feedback given."""
+        return self._words[int(self._candidates[0])]
+
+    def get_words(self):
+        return self._words
@@ -0,0 +1,112 @@
+import functools
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List
+
+# Events emitted while instrumentation is enabled, with their data:
+# - "guess_start": move, candidates (number of candidates before the guess);
+# - "guess_end": move, guess, duration;
+# - "phase": name, duration, for the outermost call of each instrumented phase;
+# - "count": name, value.
+Listener = Callable[..., None]
+
+
+class Instrumentation:
+    """Hooks of the hot paths of players and strategies. Instrumented code checks
+    `enabled` before doing anything else, so that hooks cost a single attribute
+    lookup when nobody listens."""
+
+    def __init__(self):
+        self.enabled = False
+        self._listeners: List[Listener] = []
+        self._active = set()
+
+    def subscribe(self, listener: Listener):
+        self._listeners.append(listener)
+        self.enabled = True
+
+    def unsubscribe(self, listener: Listener):
+        self._listeners.remove(listener)
+        self.enabled = bool(self._listeners)
+
+    def emit(self, event: str, **data):
+        for listener in self._listeners:
+            listener(event, **data)
+
+    def count(self, name: str, value: int = 1):
+        self.emit("count", name=name, value=value)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as the named phase, unless already inside it, e.g. when
+        a strategy method calls the method it overrides."""
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.emit("phase", name=name, duration=perf_counter() - start)
+
+
+instrumentation = Instrumentation()
+
+
+def instrumented(name: str) -> Callable[[Callable], Callable]:
+    """Decorate a function to time its calls as the named phase."""
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            with instrumentation.phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class PhaseProfile:
+    """Listener that aggregates the events: number of calls and total time of each
+    phase and of the guesses, counters, and number of candidates by move."""
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.candidates: Dict[int, List[int]] = {}
+
+    def __call__(self, event: str, **data):
+        if event == "phase":
+            self._add(data["name"], data["duration"])
+        elif event == "guess_end":
+            self._add("player.guess", data["duration"])
+        elif event == "guess_start":
+            self.candidates.setdefault(data["move"], []).append(data["candidates"])
+        elif event == "count":
+            self.counters[data["name"]] = (
+                self.counters.get(data["name"], 0) + data["value"]
+            )
+
+    def _add(self, name: str, duration: float):
+        phase = self.phases.setdefault(name, {"calls": 0, "time": 0.0})
+        phase["calls"] += 1
+        phase["time"] += duration
+
+    def to_dict(self) -> Dict:
+        return {
+            "phases": self.phases,
+            "counters": self.counters,
+            "candidates": {
+                move: {
+                    "moves": len(sizes),
+                    "avg": sum(sizes) / len(sizes),
+                    "max": max(sizes),
+                }
+                for move, sizes in sorted(self.candidates.items())
+            },
+        }
@@ -0,0 +1,238 @@
+import json
+import platform
+import random
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from wordle.config import DATA_ROOT, PERF_MIN_TIME, PERF_THRESHOLD
+from wordle.dictionary import load_named_dictionary
+from wordle.feedback import get_feedback_matrix
+from wordle.strategy.constraints import ConstraintIndex
+from wordle.strategy.entropy_strategy import EntropyStrategy
+from wordle.strategy.heuristic_strategy import HeuristicStrategy
+from wordle.strategy.minmax_strategy import MinMaxStrategy
+from wordle.strategy.precomputed_strategy import PrecomputedStrategy, build_tree
+from wordle.strategy.utils import filter_candidates
+from wordle.utils import evaluate_feedback, feedback_cache
+
+PERF_DICTIONARIES = ("words_cfreshman.txt", "words_octokatherine.txt")
+
+BASELINES = DATA_ROOT / "perf" / "baselines.json"
+
+STRATEGIES = {
+    "heuristic": HeuristicStrategy,
+    "minmax": MinMaxStrategy,
+    "entropy": EntropyStrategy,
+}
+
+# number of candidates of the guess cases, 0 for the whole dictionary
+CANDIDATE_SIZES = (0, 1000, 100, 10)
+
+# number of (word, guess) pairs evaluated by the evaluate_feedback case
+FEEDBACK_PAIRS = 1000
+
+# timed function and the callable that prepares it
+Case = Tuple[str, Callable[[], Callable[[], object]]]
+
+
+def perf_cases(dictionary: str, workdir: Path) -> List[Case]:
+    """Return the cases of the dictionary. Each case is prepared only when run,
+    so that selecting a few cases doesn't load every strategy."""
+    words = load_named_dictionary(dictionary)
+    rng = random.Random(0)
+    cases = []
+
+    def feedback():
+        pairs = [(rng.choice(words), rng.choice(words)) for _ in range(FEEDBACK_PAIRS)]
+
+        def run():
+            # measure the evaluation, not the cache
+            feedback_cache.clear()
+            for word, guess in pairs:
+                evaluate_feedback(word, guess)
+
+        return run
+
+    cases.append(("evaluate_feedback/x%d" % FEEDBACK_PAIRS, feedback))
+
+    guesses = ["arise", "mount"]
+    secret = words[len(words) // 2]
+    history = [evaluate_feedback(secret, g) for g in guesses]
+    for name, matrix in (("matrix", True), ("batched", False)):
+
+        def filtering(matrix=matrix):
+            m = get_feedback_matrix(words) if matrix else None
+            candidates = list(words)
+            return lambda: filter_candidates(candidates, guesses, history, m)
+
+        cases.append(("filter_candidates/" + name, filtering))
+
+    def constraints():
+        index = ConstraintIndex(words)
+        root = np.arange(len(words), dtype=np.int32)
+
+        def run():
+            candidates = root
+            for g, f in zip(guesses, history):
+                candidates = index.filter(candidates, g, f)
+
+        return run
+
+    cases.append(("constraints/filter", constraints))
+
+    for strategy, cls in STRATEGIES.items():
+        for size in CANDIDATE_SIZES:
+            if size >= len(words):
+                continue
+
+            def guessing(cls=cls, size=size):
+                s = cls(words)
+                # measure the scoring, not the guess cache
+                s.cache = None
+                indices = np.arange(len(words), dtype=np.int32)
+                if size:
+                    indices = np.sort(
+                        np.random.default_rng(size).choice(indices, size, False)
+                    )
+
+                def run():
+                    s.push("", "", indices)
+                    s.guess()
+                    s.rollback()
+
+                return run
+
+            cases.append(("guess/{}/{}".format(strategy, size or "all"), guessing))
+
+        def building(cls=cls):
+            s = cls(words)
+            s.cache = None
+            return lambda: build_tree(s, [], [])
+
+        cases.append(("build_tree/" + strategy, building))
+
+    for suffix in (".json", ".tree"):
+
+        def loading(suffix=suffix):
+            filename = workdir / (Path(dictionary).stem + suffix)
+            if not filename.exists():
+                PrecomputedStrategy(words, HeuristicStrategy(words)).save(filename)
+            return lambda: PrecomputedStrategy(filename=filename)
+
+        cases.append(("load_precomputed/" + suffix.lstrip("."), loading))
+
+    return [("{}/{}".format(dictionary, name), prepare) for name, prepare in cases]
+
+
+def measure(run: Callable[[], object], repeat: int, min_time: float) -> float:
+    """Return the best time of a call, in seconds, over `repeat` rounds of calls
+    lasting at least `min_time` each."""
+    start = perf_counter()
+    run()
+    number = max(1, int(min_time / max(perf_counter() - start, 1e-9)))
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (perf_counter() - start) / number)
+    return best
+
+
+def run_suite(
+    cases: List[Case], repeat: int = 3, min_time: float = PERF_MIN_TIME
+) -> Iterator[Tuple[str, float]]:
+    for name, prepare in cases:
+        yield name, measure(prepare(), repeat, min_time)
+
+
+def environment() -> Dict[str, str]:
+    """Return the Python and numpy versions, down to the minor version, as the
+    timings depend on them."""
+    return {
+        "python": "{}.{}".format(*platform.python_version_tuple()[:2]),
+        "numpy": ".".join(np.__version__.split(".")[:2]),
+    }
+
+
+def _load_entries(filename: Path) -> List[Dict]:
+    """Return the baselines of each environment recorded in the file."""
+    if not Path(filename).exists():
+        return []
+    with open(filename, "r", encoding="utf8") as file:
+        return json.load(file)["environments"]
+
+
+def load_baselines(filename: Path = BASELINES) -> Dict[str, float]:
+    """Return the baselines recorded in the current environment, empty if none."""
+    for entry in _load_entries(filename):
+        if entry["environment"] == environment():
+            return entry["results"]
+    return {}
+
+
+def baselines_environments(filename: Path = BASELINES) -> List[Dict[str, str]]:
+    """Return the environments the baselines were recorded in."""
+    return [entry["environment"] for entry in _load_entries(filename)]
+
+
+def save_baselines(results: Dict[str, float], filename: Path = BASELINES):
+    """Save the results as the baselines of the current environment, merged with
+    its baselines of the cases not run. Baselines of other environments are
+    kept."""
+    baselines = load_baselines(filename)
+    baselines.update(results)
+    entries = [
+        entry
+        for entry in _load_entries(filename)
+        if entry["environment"] != environment()
+    ]
+    entries.append(
+        {
+            "machine": "{} {} Python {}".format(
+                platform.system(), platform.machine(), platform.python_version()
+            ),
+            "environment": environment(),
+            "results": dict(sorted(baselines.items())),
+        }
+    )
+    entries.sort(key=lambda entry: sorted(entry["environment"].items()))
+    Path(filename).parent.mkdir(parents=True, exist_ok=True)
+    with open(filename, "w", encoding="utf8") as file:
+        json.dump({"environments": entries}, file, indent=2)
+        file.write("\n")
+
+
+def compare(
+    results: Dict[str, float],
+    baselines: Dict[str, float],
+    threshold: float = PERF_THRESHOLD,
+) -> List[Dict]:
+    """Compare the results with the baselines: a case regresses when slower than
+    its baseline by more than the threshold, a fraction of the baseline."""
+    rows = []
+    for name, seconds in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            status, ratio = "new", None
+        else:
+            ratio = seconds / baseline
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+            else:
+                status = "ok"
+        rows.append(
+            {
+                "case": name,
+                "baseline": baseline,
+                "time": seconds,
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return rows
@@ -0,0 +1,64 @@
+import logging
+from time import perf_counter
+from typing import List, Tuple
+
+from wordle.game import MultiWordle
+from wordle.instrumentation import instrumentation
+from wordle.strategy import StrategyError
+from wordle.strategy.multi_board_strategy import MultiBoardStrategy
+
+
+class MultiPlayer:
+    """Player of a game of several boards, see wordle.game.MultiWordle."""
+
+    def __init__(self, game: MultiWordle, strategy: MultiBoardStrategy):
+        if game is None or strategy is None:
+            raise ValueError("game and strategy cannot be None")
+        self._game = game
+        self.strategy = strategy
+        # time spent by the strategy on each guess of the last game, in seconds
+        self.timings = []
+
+    def play(self) -> Tuple[List[str], List[List[str]]]:
+        """Play the game and return the guesses and, for each guess, its feedback
+        on each board."""
+        guesses = []
+        feedback = []
+        self.timings = []
+        self.strategy.reset()
+        for i in range(self._game.attempts):
+
+            if instrumentation.enabled:
+                instrumentation.emit(
+                    "guess_start",
+                    move=i,
+                    candidates=sum(
+                        len(b.candidate_indices) for b in self.strategy.active
+                    ),
+                )
+            start = perf_counter()
+            try:
+                g = self.strategy.guess()
+            except StrategyError as e:
+                logging.error(e)
+                break
+            finally:
+                self.timings.append(perf_counter() - start)
+            if instrumentation.enabled:
+                instrumentation.emit(
+                    "guess_end", move=i, guess=g, duration=self.timings[-1]
+                )
+            fb = self._game.evaluate(g)
+
+            guesses.append(g)
+            feedback.append(fb)
+
+            logging.debug("guess %d: %s -> %s", i, g, " ".join(fb))
+
+            self.strategy.update(g, fb)
+            if all(self.strategy.solved):
+                logging.debug("Found the words: %s", " ".join(self._game.get_secrets()))
+                return guesses, feedback
+
+        logging.debug("Words not found: %s", " ".join(self._game.get_secrets()))
+        return guesses, feedback
@@ -1,8 +1,10 @@
 import logging
+from time import perf_counter
 from typing import List, Tuple
 
 from wordle.config import MAX_ATTEMPTS, SYMBOL_MATCH
 from wordle.game import Wordle
+from wordle.instrumentation import instrumentation
 from wordle.strategy import Strategy, StrategyError
 
 
@@ -12,18 +14,34 @@ class Player:
             raise ValueError("game and strategy cannot be None")
         self._game = game
         self.strategy = strategy
+        # time spent by the strategy on each guess of the last game, in seconds
+        self.timings = []
 
     def play(self) -> Tuple[List[str], List[str]]:
         guesses = []
         feedback = []
+        self.timings = []
         self.strategy.reset()
         for i in range(MAX_ATTEMPTS):
 
+            if instrumentation.enabled:
+                instrumentation.emit(
+                    "guess_start",
+                    move=i,
+                    candidates=len(self.strategy.candidate_indices),
+                )
+            start = perf_counter()
             try:
                 g = self.strategy.guess()
             except StrategyError as e:
                 logging.error(e)
                 break
+            finally:
+                self.timings.append(perf_counter() - start)
+            if instrumentation.enabled:
+                instrumentation.emit(
+                    "guess_end", move=i, guess=g, duration=self.timings[-1]
+                )
             fb = self._game.evaluate(g)
 
             guesses.append(g)
@@ -31,7 +49,7 @@ class Player:
 
             logging.debug("guess %d: %s -> %s", i, g, fb)
 
-            if fb == SYMBOL_MATCH * 5:
+            if fb == SYMBOL_MATCH * len(g):
                 logging.debug("Found the word: %s", g)
                 return guesses, feedback
 
@@ -0,0 +1,378 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from time import monotonic, perf_counter
+from typing import Deque, Dict, List, Optional, Tuple
+
+from wordle.benchmark import load_benchmark, percentiles
+from wordle.config import (
+    MAX_ATTEMPTS,
+    SERVER_LATENCY_WINDOW,
+    SERVER_MAX_BODY,
+    SERVER_SESSION_TTL,
+)
+from wordle.strategy import StrategyError
+
+# (strategy, dictionary, precomputed) identifying a warm strategy
+StrategyKey = Tuple[str, str, bool]
+
+
+def warm_up(keys: List[StrategyKey]):
+    """Load the dictionaries, feedback matrices and trees of the strategies and
+    compute their first guess, so that the first requests don't pay for it."""
+    for key in keys:
+        _, strategy = load_benchmark(*key)
+        strategy.reset()
+        strategy.guess()
+
+
+def compute_hint(key: StrategyKey, guesses: List[str], feedback: List[str]) -> str:
+    """Return the next guess of the strategy after the history. Runs in a worker
+    of the pool, which keeps its strategies loaded across requests."""
+    _, strategy = load_benchmark(*key)
+    strategy.set_history(guesses, feedback)
+    return strategy.guess()
+
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Session:
+    def __init__(self, key: StrategyKey):
+        self.key = key
+        self.guesses: List[str] = []
+        self.feedback: List[str] = []
+        self.hint: Optional[str] = None
+        self.last_access = monotonic()
+        # held by an update from reading the history to storing it, so that
+        # concurrent updates extend it one after the other
+        self.lock = asyncio.Lock()
+
+    def to_dict(self, session_id: str) -> Dict:
+        return {
+            "session": session_id,
+            "strategy": self.key[0],
+            "dictionary": self.key[1],
+            "precomputed": self.key[2],
+            "guesses": self.guesses,
+            "feedback": self.feedback,
+            "hint": self.hint,
+        }
+
+
+class Metrics:
+    """Request counts and latencies by route, over the last `window` requests
+    of each route, and depth of the queue of scoring jobs."""
+
+    def __init__(self, window: int = SERVER_LATENCY_WINDOW):
+        self.window = window
+        self.requests: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    def record(self, route: str, latency: float, error: bool):
+        self.requests[route] = self.requests.get(route, 0) + 1
+        if error:
+            self.errors[route] = self.errors.get(route, 0) + 1
+        if route not in self.latencies:
+            self.latencies[route] = deque(maxlen=self.window)
+        self.latencies[route].append(latency)
+
+    def to_dict(self) -> Dict:
+        return {
+            "queue depth": self.queue_depth,
+            "max queue depth": self.max_queue_depth,
+            "routes": {
+                route: {
+                    "requests": count,
+                    "errors": self.errors.get(route, 0),
+                    "latency": percentiles(list(self.latencies[route])),
+                }
+                for route, count in self.requests.items()
+            },
+        }
+
+
+class HintServer:
+    """Hint service over HTTP/1.1, with JSON bodies:
+
+    - `POST /hint` returns the hint of a history, as the `play` subcommand;
+    - `POST /sessions` starts a game, `GET /sessions/<id>` returns it,
+      `POST /sessions/<id>/update` adds a guess and its feedback and `DELETE
+      /sessions/<id>` ends it;
+    - `GET /metrics` returns request latencies and the depth of the job queue;
+    - `GET /health` returns the warm strategies.
+
+    The event loop only parses requests and keeps the sessions, while the
+    strategies run in an executor: a single thread when `jobs` is 1, worker
+    processes otherwise. Each worker keeps its own warm strategies, so a
+    request can be scored by any of them."""
+
+    def __init__(
+        self,
+        strategies: List[StrategyKey],
+        jobs: int = 1,
+        session_ttl: float = SERVER_SESSION_TTL,
+    ):
+        if not strategies:
+            raise ValueError("no strategies to serve")
+        self.strategies = list(strategies)
+        self.jobs = jobs
+        self.session_ttl = session_ttl
+        # sessions by last access, the least recently used first
+        self.sessions: Dict[str, Session] = OrderedDict()
+        self.metrics = Metrics()
+        self._executor: Optional[Executor] = None
+
+    def start(self):
+        if self.jobs == 1:
+            self._executor = ThreadPoolExecutor(1)
+            self._executor.submit(warm_up, self.strategies).result()
+        else:
+            self._executor = ProcessPoolExecutor(
+                self.jobs, initializer=warm_up, initargs=(self.strategies,)
+            )
+            # start the workers now rather than on the first requests
+            for future in [self._executor.submit(int) for _ in range(self.jobs)]:
+                future.result()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def hint(
+        self, key: StrategyKey, guesses: List[str], feedback: List[str]
+    ) -> str:
+        self.metrics.queue_depth += 1
+        self.metrics.max_queue_depth = max(
+            self.metrics.max_queue_depth, self.metrics.queue_depth
+        )
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, compute_hint, key, guesses, feedback
+            )
+        except (ValueError, StrategyError) as e:
+            raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+        finally:
+            self.metrics.queue_depth -= 1
+
+    def strategy_key(self, body: Dict) -> StrategyKey:
+        default = self.strategies[0]
+        key = (
+            body.get("strategy", default[0]),
+            body.get("dictionary", default[1]),
+            bool(body.get("precomputed", default[2])),
+        )
+        if key not in self.strategies:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST, "strategy {} is not served".format(key)
+            )
+        return key
+
+    def session(self, session_id: str) -> Session:
+        self.expire_sessions()
+        if session_id not in self.sessions:
+            raise RequestError(HTTPStatus.NOT_FOUND, "unknown session")
+        session = self.sessions[session_id]
+        session.last_access = monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def expire_sessions(self):
+        """Drop the sessions idle for longer than the TTL. Sessions are kept by
+        last access, so the scan stops at the first one still alive."""
+        deadline = monotonic() - self.session_ttl
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.last_access >= deadline:
+                break
+            del self.sessions[session_id]
+
+    @staticmethod
+    def route(method: str, path: str) -> Optional[str]:
+        """Return the name of the route of a request, None if unknown."""
+        parts = [p for p in path.split("?")[0].split("/") if p]
+        if method == "GET" and parts == ["health"]:
+            return "health"
+        if method == "GET" and parts == ["metrics"]:
+            return "metrics"
+        if method == "POST" and parts == ["hint"]:
+            return "hint"
+        if method == "POST" and parts == ["sessions"]:
+            return "session create"
+        if len(parts) == 2 and parts[0] == "sessions":
+            return {"GET": "session get", "DELETE": "session delete"}.get(method)
+        if (
+            method == "POST"
+            and len(parts) == 3
+            and parts[::2] == ["sessions", "update"]
+        ):
+            return "session update"
+        return None
+
+    async def handle(self, method: str, path: str, body: Dict) -> Tuple[str, Dict]:
+        """Return the route and the response payload of a request."""
+        route = self.route(method, path)
+        parts = [p for p in path.split("?")[0].split("/") if p]
+
+        if route == "health":
+            return route, {"strategies": self.strategies}
+        if route == "metrics":
+            return route, {"sessions": len(self.sessions), **self.metrics.to_dict()}
+
+        if route == "hint":
+            key = self.strategy_key(body)
+            guesses = body.get("guesses", [])
+            feedback = body.get("feedback", [])
+            if not isinstance(guesses, list) or not isinstance(feedback, list):
+                raise RequestError(
+                    HTTPStatus.BAD_REQUEST, "guesses and feedback must be lists"
+                )
+            if not all(isinstance(x, str) for x in guesses + feedback):
+                raise RequestError(
+                    HTTPStatus.BAD_REQUEST, "guesses and feedback must be strings"
+                )
+            if len(guesses) != len(feedback) or len(guesses) > MAX_ATTEMPTS:
+                raise RequestError(
+                    HTTPStatus.BAD_REQUEST,
+                    "guesses and feedback must be <= %d pairs" % MAX_ATTEMPTS,
+                )
+            return route, {"hint": await self.hint(key, guesses, feedback)}
+
+        if route == "session create":
+            self.expire_sessions()
+            session = Session(self.strategy_key(body))
+            session.hint = await self.hint(session.key, [], [])
+            session_id = uuid.uuid4().hex
+            session.last_access = monotonic()
+            self.sessions[session_id] = session
+            return route, session.to_dict(session_id)
+
+        if route == "session get":
+            return route, self.session(parts[1]).to_dict(parts[1])
+        if route == "session delete":
+            self.session(parts[1])
+            del self.sessions[parts[1]]
+            return route, {"session": parts[1]}
+        if route == "session update":
+            session_id = parts[1]
+            session = self.session(session_id)
+            if not isinstance(body.get("guess"), str) or not isinstance(
+                body.get("feedback"), str
+            ):
+                raise RequestError(
+                    HTTPStatus.BAD_REQUEST, "guess and feedback are required"
+                )
+            async with session.lock:
+                if len(session.guesses) >= MAX_ATTEMPTS:
+                    raise RequestError(HTTPStatus.CONFLICT, "the game is over")
+                guesses = session.guesses + [body["guess"]]
+                feedback = session.feedback + [body["feedback"]]
+                session.hint = await self.hint(session.key, guesses, feedback)
+                session.guesses, session.feedback = guesses, feedback
+                return route, session.to_dict(session_id)
+
+        raise RequestError(HTTPStatus.NOT_FOUND, "unknown route")
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start = perf_counter()
+                route, error = "error", True
+                keep_alive = True
+                try:
+                    method, path, version = request_line.decode("latin1").split()
+                    # failures of known routes are recorded against them
+                    route = self.route(method, path) or route
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if not line.strip():
+                            break
+                        name, _, value = line.decode("latin1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    keep_alive = headers.get("connection", "").lower() != "close" and (
+                        version == "HTTP/1.1"
+                    )
+                    length = int(headers.get("content-length", 0))
+                    if length > SERVER_MAX_BODY:
+                        keep_alive = False
+                        raise RequestError(
+                            HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body too large"
+                        )
+                    raw = await reader.readexactly(length) if length else b"{}"
+                    try:
+                        body = json.loads(raw)
+                    except ValueError:
+                        raise RequestError(HTTPStatus.BAD_REQUEST, "invalid JSON body")
+                    if not isinstance(body, dict):
+                        raise RequestError(HTTPStatus.BAD_REQUEST, "invalid JSON body")
+                    _, payload = await self.handle(method, path, body)
+                    status, error = HTTPStatus.OK, False
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except ValueError:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "bad request"}
+                    keep_alive = False
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception:
+                    # the body was read, so the connection can serve the next one
+                    logging.exception(
+                        "%s failed", request_line.decode("latin1").strip()
+                    )
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    payload = {"error": "internal server error"}
+
+                data = json.dumps(payload).encode("utf8")
+                writer.write(
+                    (
+                        "HTTP/1.1 {} {}\r\n"
+                        "Content-Type: application/json\r\n"
+                        "Content-Length: {}\r\n"
+                        "Connection: {}\r\n\r\n"
+                    )
+                    .format(
+                        status.value,
+                        status.phrase,
+                        len(data),
+                        "keep-alive" if keep_alive else "close",
+                    )
+                    .encode("latin1")
+                    + data
+                )
+                await writer.drain()
+                self.metrics.record(route, perf_counter() - start, error)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = None, port: int = None, path: str = None):
+        """Serve on the Unix socket path if given, or on host and port, until
+        cancelled."""
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        for socket in server.sockets:
+            logging.warning("serving on %s", socket.getsockname())
+        async with server:
+            await server.serve_forever()
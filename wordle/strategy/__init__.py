@@ -1,37 +1,122 @@
 from typing import List
 
-from wordle.strategy.utils import filter_candidates
+import numpy as np
+
+from wordle.feedback import FeedbackMatrix, get_feedback_matrix
+from wordle.instrumentation import instrumented
+from wordle.strategy.cache import GuessCache
+from wordle.strategy.constraints import ConstraintIndex
+from wordle.strategy.utils import narrow_candidates
 
 
 class Strategy:
-    def __init__(self, dictionary: List[str]):
+    """Base strategy, that keeps track of the history of guesses and feedback and
+    of the dictionary words still candidates to be the secret.
+
+    Candidates are stored as arrays of dictionary indices, one per step of the
+    history, so that each update only narrows the previous candidates with the
+    newest guess and feedback, and rolling back a step is just a pop.
+
+    Strategies whose guess only depends on the candidates implement `_guess` and
+    pass a GuessCache, so that the guess of candidates seen before is reused."""
+
+    def __init__(
+        self,
+        dictionary: List[str],
+        matrix: FeedbackMatrix = None,
+        cache: GuessCache = None,
+    ):
         self.dictionary = dictionary
-        self.candidates = self.dictionary
+        self.matrix = matrix
+        self.cache = cache
         self.guesses = []
         self.feedback = []
-        self._filter_candidates()
+        self._root = np.arange(len(dictionary), dtype=np.int32)
+        self._trail = [self._root]
+        self._constraints = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # time the overrides as well, see wordle.instrumentation
+        for name in ("guess", "update"):
+            if name in cls.__dict__:
+                setattr(cls, name, instrumented("strategy." + name)(cls.__dict__[name]))
+
+    def __getstate__(self):
+        # the feedback matrix can be huge, processes load their own memory map
+        state = dict(self.__dict__)
+        if self.matrix is not None:
+            state["matrix"] = (self.matrix.allowed,)
+        state["_constraints"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.matrix is not None:
+            self.matrix = get_feedback_matrix(self.dictionary, *self.matrix)
+
+    @property
+    def constraints(self) -> ConstraintIndex:
+        if self._constraints is None:
+            self._constraints = ConstraintIndex(self.dictionary)
+        return self._constraints
 
+    @property
+    def candidates(self) -> List[str]:
+        return [self.dictionary[i] for i in self.candidate_indices.tolist()]
+
+    @property
+    def candidate_indices(self) -> np.ndarray:
+        return self._trail[-1]
+
+    @instrumented("strategy.guess")
     def guess(self) -> str:
+        if self.cache is None:
+            return self._guess()
+        return self.cache.get(self.candidate_indices, self._guess)
+
+    def _guess(self) -> str:
         raise NotImplementedError
 
     def reset(self):
-        self.candidates = self.dictionary
-        self.set_history([], [])
+        self.guesses = []
+        self.feedback = []
+        self._trail = [self._root]
 
+    @instrumented("strategy.update")
     def update(self, guess: str, feedback: str):
+        self.push(guess, feedback)
+
+    def push(self, guess: str, feedback: str, candidates: np.ndarray = None):
+        """Append a guess and its feedback to the history, narrowing the current
+        candidates unless the consistent ones are already known."""
+        if candidates is None:
+            candidates = narrow_candidates(
+                self.candidate_indices, guess, feedback, self.constraints, self.matrix
+            )
         self.guesses.append(guess)
         self.feedback.append(feedback)
-        self._filter_candidates()
+        self._trail.append(candidates)
+
+    def rollback(self, steps: int = 1):
+        """Undo the last steps of the history."""
+        if steps > len(self.guesses):
+            raise StrategyError("cannot rollback %d steps" % steps)
+        for _ in range(steps):
+            self.guesses.pop()
+            self.feedback.pop()
+            self._trail.pop()
 
     def set_history(self, guesses: List[str], feedback: List[str]):
-        self.guesses = guesses
-        self.feedback = feedback
-        self._filter_candidates()
-
-    def _filter_candidates(self):
-        self.candidates = filter_candidates(
-            self.candidates, self.guesses, self.feedback
-        )
+        # keep the candidates of the history prefix in common with the current one
+        common = 0
+        for step in zip(self.guesses, self.feedback, guesses, feedback):
+            if step[:2] != step[2:]:
+                break
+            common += 1
+        self.rollback(len(self.guesses) - common)
+        for g, f in zip(guesses[common:], feedback[common:]):
+            self.push(g, f)
 
 
 class StrategyError(Exception):
@@ -0,0 +1,176 @@
+import mmap
+import struct
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from wordle.dictionary import Dictionary, dictionary_hash
+from wordle.feedback import decode_feedback, encode_feedback
+from wordle.files import write_aside
+
+if TYPE_CHECKING:
+    from wordle.strategy.precomputed_strategy import DecisionTree
+
+# Binary decision tree format, all integers are little endian:
+# - header: magic, format version, word length, number of words, number of
+#   other guesses, number of nodes, offset of the root node and sha256 digest of
+#   the words, so that loading doesn't hash them again;
+# - dictionary: the words as fixed width ascii records, followed by the guesses
+#   of the tree that are not words, e.g. allowed guesses;
+# - nodes: index of the guess in the dictionary and number of children, followed
+#   by the feedback code and offset of each child. Codes take 16 bits, as words
+#   longer than 5 letters have more than 256 codes. Offsets are relative to the
+#   start of the nodes, and children are written before their parent.
+MAGIC = b"WDTR"
+VERSION = 4
+HEADER = struct.Struct("<4sHHIIII32s")
+NODE = struct.Struct("<IH")
+CHILD = struct.Struct("<HI")
+CHILD_DTYPE = np.dtype([("code", "<u2"), ("offset", "<u4")])
+
+
+def write_tree(tree: "DecisionTree", words: Sequence[str], filename: str):
+    """Stream the tree to a binary file, node by node, renamed into place once
+    complete."""
+    word_length = len(words[0]) if words else 0
+    known = set(words)
+    others = sorted({g for g in tree_guesses(tree) if g not in known})
+    for guess in others:
+        if len(guess) != word_length:
+            raise ValueError(
+                "guess {} is not {} letters long".format(guess, word_length)
+            )
+    index = {w: i for i, w in enumerate(list(words) + others)}
+    offsets = {}
+
+    with write_aside(filename) as partial, open(partial, "wb") as file:
+        header = (MAGIC, VERSION, word_length, len(words), len(others))
+        digest = bytes.fromhex(dictionary_hash(words))
+        file.write(HEADER.pack(*header, 0, 0, digest))
+        for word in list(words) + others:
+            file.write(word.encode("ascii"))
+        start = file.tell()
+
+        def write_node(node: "DecisionTree") -> int:
+            if id(node) in offsets:
+                return offsets[id(node)]
+            children = [
+                (encode_feedback(f), write_node(child))
+                for f, child in node.choice.items()
+                if child is not None
+            ]
+            offsets[id(node)] = file.tell() - start
+            file.write(NODE.pack(index[node.guess], len(children)))
+            for child in children:
+                file.write(CHILD.pack(*child))
+            return offsets[id(node)]
+
+        root = write_node(tree)
+        file.seek(0)
+        file.write(HEADER.pack(*header, len(offsets), root, digest))
+
+
+def tree_guesses(tree: "DecisionTree") -> List[str]:
+    """Return the guess of each node of the tree."""
+    guesses, seen, stack = [], set(), [tree]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        guesses.append(node.guess)
+        stack.extend(c for c in node.choice.values() if c is not None)
+    return guesses
+
+
+class MappedTree:
+    """Decision tree memory mapped from a binary file. Nodes are decoded only
+    when visited."""
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < HEADER.size:
+            raise ValueError("{} is not a decision tree file".format(filename))
+        # the version comes first, as the rest of the header depends on it
+        magic, version = struct.unpack_from("<4sH", self._buffer)
+        if magic != MAGIC:
+            raise ValueError("{} is not a decision tree file".format(filename))
+        if version != VERSION:
+            raise ValueError("unsupported decision tree version %d" % version)
+        header = HEADER.unpack_from(self._buffer)
+        _, _, self.word_length, size, others, self.nodes, root, digest = header
+        # guesses indexed by the nodes, the words followed by the other guesses
+        self.guesses = Dictionary(
+            np.frombuffer(
+                self._buffer, np.uint8, (size + others) * self.word_length, HEADER.size
+            ).reshape(size + others, self.word_length)
+        )
+        self.words = Dictionary(self.guesses.letters[:size], digest.hex())
+        self._start = HEADER.size + (size + others) * self.word_length
+        self.root = MappedNode(self, root)
+
+    def node(self, offset: int):
+        """Return the guess index and the (feedback code, offset) pairs of the
+        children of the node at the offset."""
+        position = self._start + offset
+        guess, children = NODE.unpack_from(self._buffer, position)
+        choice = CHILD.iter_unpack(
+            self._buffer[
+                position + NODE.size : position + NODE.size + children * CHILD.size
+            ]
+        )
+        return guess, choice
+
+    def child(self, offset: int, code: int) -> Optional[int]:
+        """Return the offset of the child of the node at the offset with the
+        feedback code, or None if there is no such branch."""
+        position = self._start + offset
+        _, children = NODE.unpack_from(self._buffer, position)
+        pairs = np.frombuffer(self._buffer, CHILD_DTYPE, children, position + NODE.size)
+        found = np.flatnonzero(pairs["code"] == code)
+        return int(pairs["offset"][found[0]]) if len(found) else None
+
+
+class MappedNode:
+    """Node of a MappedTree, exposing the same attributes of a DecisionTree."""
+
+    __slots__ = ("_tree", "_offset")
+
+    def __init__(self, tree: MappedTree, offset: int):
+        self._tree = tree
+        self._offset = offset
+
+    @property
+    def guess(self) -> str:
+        guess, _ = self._tree.node(self._offset)
+        # decode the one word, not the whole dictionary
+        return self._tree.guesses.letters[guess].tobytes().decode("ascii")
+
+    def child(self, feedback: str) -> Optional["MappedNode"]:
+        """Return the child of the feedback, or None if there is no such branch,
+        without decoding the other children."""
+        if len(feedback) != self._tree.word_length:
+            return None
+        try:
+            code = encode_feedback(feedback)
+        except ValueError:
+            return None
+        offset = self._tree.child(self._offset, code)
+        return None if offset is None else MappedNode(self._tree, offset)
+
+    @property
+    def choice(self) -> Dict[str, "MappedNode"]:
+        _, choice = self._tree.node(self._offset)
+        return {
+            decode_feedback(code, self._tree.word_length): MappedNode(
+                self._tree, offset
+            )
+            for code, offset in choice
+        }
+
+    def to_dict(self) -> Dict[str, Dict]:
+        return {
+            "guess": self.guess,
+            "choice": {f: tree.to_dict() for f, tree in self.choice.items()},
+        }
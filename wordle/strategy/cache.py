@@ -0,0 +1,155 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from wordle.config import CACHE_ROOT, GUESS_CACHE_SIZE
+from wordle.feedback import dictionary_hash
+from wordle.files import write_aside
+
+# version of the format of the cache files
+VERSION = 1
+
+
+class GuessCache:
+    """Least recently used cache of the guesses chosen by a strategy, keyed by
+    the set of candidates they were chosen for and bounded to `max_entries`.
+
+    Strategies whose guess only depends on the candidates, like minmax, find
+    the same guess for the same candidates in every game: the opening guess
+    and most of the following ones are then computed once. The cache can be
+    saved to and loaded from `filename`, so that later processes reuse it. The
+    file records the `fingerprint` of the strategy, e.g. its name and version,
+    and files of another fingerprint are ignored."""
+
+    def __init__(self, max_entries: int, filename: Path = None, fingerprint: str = ""):
+        self.max_entries = max_entries
+        self.filename = filename
+        self.fingerprint = fingerprint
+        self._guesses: "OrderedDict[bytes, str]" = OrderedDict()
+        # guesses computed since the last call to take_added, oldest first
+        self._added: Dict[bytes, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._guesses)
+
+    @staticmethod
+    def key(candidates: np.ndarray) -> bytes:
+        """Return the canonical key of a set of candidate indices, whatever
+        their order, as a fixed size digest."""
+        indices = np.sort(np.asarray(candidates, dtype=np.int32))
+        return hashlib.blake2b(indices.tobytes(), digest_size=16).digest()
+
+    def get(self, candidates: np.ndarray, compute: Callable[[], str]) -> str:
+        key = self.key(candidates)
+        guess = self._guesses.get(key)
+        if guess is not None:
+            self.hits += 1
+            self._guesses.move_to_end(key)
+            return guess
+
+        self.misses += 1
+        guess = compute()
+        self._store(key, guess)
+        self._added[key] = guess
+        if len(self._added) > self.max_entries:
+            # bounded as the cache, as the oldest would be evicted anyway
+            del self._added[next(iter(self._added))]
+        return guess
+
+    def take_added(self) -> Dict[bytes, str]:
+        """Return the guesses computed since the last call and forget them, so
+        that worker processes hand back only their own guesses."""
+        added, self._added = self._added, {}
+        return added
+
+    def merge(self, guesses: Dict[bytes, str]):
+        """Add guesses computed elsewhere, e.g. by worker processes."""
+        for key, guess in guesses.items():
+            self._store(key, guess)
+
+    def _store(self, key: bytes, guess: str):
+        if self.max_entries <= 0:
+            return
+        self._guesses[key] = guess
+        self._guesses.move_to_end(key)
+        if len(self._guesses) > self.max_entries:
+            self._guesses.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._guesses),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self._guesses.clear()
+        self._added.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def load(self):
+        """Add the guesses saved in the cache file, if any and saved by the same
+        version of the strategy."""
+        if self.filename is None or not Path(self.filename).exists():
+            return
+        with open(self.filename, "r", encoding="utf8") as file:
+            content = json.load(file)
+        header = (content.get("version"), content.get("fingerprint"))
+        if header != (VERSION, self.fingerprint):
+            logging.info("ignoring the stale guess cache %s", self.filename)
+            return
+        for key, guess in content["guesses"].items():
+            self._store(bytes.fromhex(key), guess)
+
+    def save(self):
+        """Save the cached guesses, least recently used first."""
+        if self.filename is None:
+            raise ValueError("the guess cache has no file")
+        with write_aside(self.filename) as partial:
+            with open(partial, "w", encoding="utf8") as file:
+                content = {
+                    "version": VERSION,
+                    "fingerprint": self.fingerprint,
+                    "guesses": {k.hex(): g for k, g in self._guesses.items()},
+                }
+                json.dump(content, file)
+
+
+_caches: Dict[Tuple[str, str, Optional[str]], GuessCache] = {}
+
+
+def get_guess_cache(
+    name: str,
+    words: List[str],
+    allowed: List[str] = None,
+    cache_root: Path = CACHE_ROOT,
+    version: int = 1,
+) -> GuessCache:
+    """Return the guess cache of the strategy name, dictionary and allowed
+    guesses, shared within the process and loaded from the cache directory when
+    saved before by the same version of the strategy. The dictionary and the
+    allowed guesses are keyed apart, as the same guesses can be chosen among the
+    candidates alone or among the allowed ones."""
+    key = (
+        name,
+        dictionary_hash(words),
+        None if allowed is None else dictionary_hash(allowed),
+    )
+    if key not in _caches:
+        filename = Path(cache_root) / "guesses_{}.json".format(
+            "_".join(k for k in key if k is not None)
+        )
+        fingerprint = "{}/{}".format(name, version)
+        _caches[key] = GuessCache(GUESS_CACHE_SIZE, filename, fingerprint)
+        _caches[key].load()
+    return _caches[key]
@@ -0,0 +1,80 @@
+from typing import List
+
+import numpy as np
+
+from wordle.config import SYMBOL_MATCH, SYMBOL_MISPLACED, SYMBOL_MISS
+from wordle.feedback import encode_words
+
+
+def pack(masks: np.ndarray) -> np.ndarray:
+    return np.packbits(masks, axis=-1, bitorder="little")
+
+
+class ConstraintIndex:
+    """Bitmasks over the words of a dictionary, to filter the words consistent with
+    a guess and its feedback by intersecting masks instead of evaluating feedback.
+
+    The index holds a mask of the words with a given letter in a given position,
+    and the masks of the words with at least or exactly a number of occurrences of
+    a given letter. A feedback is consistent with a word when:
+    - matches and only matches have the guess letter in the same position;
+    - a letter marked as a miss appears exactly as many times as it is marked as a
+      match or misplaced, otherwise at least as many times;
+    - misplaced symbols precede misses of the same letter, as they are assigned
+      left to right by `evaluate_feedback`."""
+
+    def __init__(self, words: List[str]):
+        self.size = len(words)
+        self.word_length = len(words[0]) if words else 0
+        encoded = encode_words(words)
+        self.letters = {chr(c): i for i, c in enumerate(np.unique(encoded).tolist())}
+        letters = np.array([ord(c) for c in self.letters], dtype=np.uint8)
+
+        # (position, letter) masks
+        positions = encoded.T[:, None, :] == letters[None, :, None]
+        self.positions = pack(positions)
+
+        # (letter, count) masks
+        counts = positions.sum(axis=0)
+        occurrences = np.arange(self.word_length + 1)
+        self.at_least = pack(counts[:, None, :] >= occurrences[None, :, None])
+        self.exactly = pack(counts[:, None, :] == occurrences[None, :, None])
+
+        self._empty = np.zeros(self.positions.shape[-1], dtype=np.uint8)
+        self._full = pack(np.ones(self.size, dtype=bool))
+
+    def mask(self, guess: str, feedback: str) -> np.ndarray:
+        """Return the mask of the words consistent with the guess and feedback."""
+        if len(guess) != self.word_length or len(feedback) != self.word_length:
+            return self._empty
+
+        mask = self._full.copy()
+        for i, (letter, symbol) in enumerate(zip(guess, feedback)):
+            if letter not in self.letters:
+                if symbol != SYMBOL_MISS:
+                    return self._empty
+                continue
+            if symbol == SYMBOL_MATCH:
+                mask &= self.positions[i, self.letters[letter]]
+            elif symbol in (SYMBOL_MISPLACED, SYMBOL_MISS):
+                mask &= ~self.positions[i, self.letters[letter]]
+            else:
+                return self._empty
+
+        for letter in set(guess) & self.letters.keys():
+            symbols = [f for g, f in zip(guess, feedback) if g == letter]
+            unmatched = "".join(f for f in symbols if f != SYMBOL_MATCH)
+            if SYMBOL_MISS + SYMBOL_MISPLACED in unmatched:
+                return self._empty
+            found = len(symbols) - symbols.count(SYMBOL_MISS)
+            if SYMBOL_MISS in symbols:
+                mask &= self.exactly[self.letters[letter], found]
+            else:
+                mask &= self.at_least[self.letters[letter], found]
+        return mask
+
+    def filter(self, candidates: np.ndarray, guess: str, feedback: str) -> np.ndarray:
+        """Return the candidate indices consistent with the guess and feedback."""
+        mask = self.mask(guess, feedback)
+        keep = np.unpackbits(mask, count=self.size, bitorder="little").view(bool)
+        return candidates[keep[candidates]]
@@ -0,0 +1,23 @@
+import numpy as np
+
+from wordle.strategy.partition_strategy import PartitionStrategy
+
+
+class EntropyStrategy(PartitionStrategy):
+    """Strategy that guesses the word with the highest Shannon entropy of the
+    partition of the candidates by feedback, i.e. the highest expected
+    information gained by the guess."""
+
+    name = "entropy"
+
+    def score(self, counts: np.ndarray) -> np.ndarray:
+        return -entropy(counts)
+
+
+def entropy(counts: np.ndarray) -> np.ndarray:
+    """Return the entropy, in bits, of each row of partition sizes."""
+    total = counts.sum(axis=1)
+    # n log n of each partition size, looked up instead of computed per cell
+    sizes = np.arange(total.max() + 1, dtype=np.float64)
+    nlogn = sizes * np.log2(np.maximum(sizes, 1))
+    return np.log2(total) - nlogn[counts].sum(axis=1) / total
@@ -0,0 +1,37 @@
+from pathlib import Path
+from typing import List
+
+from wordle.config import DATA_ROOT, TREE_SUFFIX
+from wordle.strategy import Strategy
+from wordle.strategy.entropy_strategy import EntropyStrategy
+from wordle.strategy.heuristic_strategy import HeuristicStrategy
+from wordle.strategy.minmax_strategy import MinMaxStrategy
+from wordle.strategy.precomputed_strategy import PrecomputedStrategy
+
+
+def select_strategy(
+    strategy: str, words: List[str], precomputed: bool, allowed: List[str] = None
+) -> Strategy:
+    """Return the strategy by name. `allowed` guesses, besides the words, are
+    supported by the strategies that score guesses by partition."""
+    if allowed is not None and (precomputed or strategy == "heuristic"):
+        raise ValueError("strategy %s only guesses dictionary words" % strategy)
+    if precomputed:
+        return PrecomputedStrategy(filename=precomputed_filename(strategy))
+    if strategy == "heuristic":
+        return HeuristicStrategy(words)
+    elif strategy == "minmax":
+        return MinMaxStrategy(words, allowed)
+    elif strategy == "entropy":
+        return EntropyStrategy(words, allowed)
+    else:
+        raise ValueError("unknown strategy: %s" % strategy)
+
+
+def precomputed_filename(strategy: str) -> Path:
+    """Return the file of the precomputed tree of the strategy, the binary one if
+    any or the JSON one otherwise."""
+    filename = DATA_ROOT / "strategies" / "{}{}".format(strategy, TREE_SUFFIX)
+    if not filename.exists():
+        filename = filename.with_suffix(".json")
+    return filename
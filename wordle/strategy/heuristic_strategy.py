@@ -1,47 +1,99 @@
-from typing import Callable, Dict, List
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from wordle.strategy import Strategy, StrategyError
 
 
 class HeuristicStrategy(Strategy):
+    """Strategy that guesses the candidate whose letters are the most frequent
+    among the candidates, counting each letter once per word.
+
+    The dictionary is ranked once. Each step then only subtracts the letters of
+    the words it eliminates, and finds the best candidate with a heap of upper
+    bounds of their values: letter counts only decrease while candidates narrow,
+    so stale values are re-evaluated only when they reach the top. Ties are
+    broken by the dictionary ranking."""
+
     def __init__(self, dictionary: List[str]):
         super().__init__(dictionary)
-        self._reset()
+        letters = sorted({letter for word in dictionary for letter in word})
+        self._letters = {letter: i for i, letter in enumerate(letters)}
+        self._multiplicity = np.zeros((len(dictionary), len(letters)), np.int64)
+        for i, word in enumerate(dictionary):
+            for letter in word:
+                self._multiplicity[i, self._letters[letter]] += 1
+        self._presence = (self._multiplicity > 0).astype(np.int64)
+
+        self._counts = self._presence.sum(axis=0)
+        values = self._multiplicity @ self._counts
+        # descending values, dictionary order among equal ones
+        self._root = np.lexsort((np.arange(len(dictionary)), -values)).astype(np.int32)
+        self._rank = np.empty(len(dictionary), dtype=np.int32)
+        self._rank[self._root] = np.arange(len(dictionary), dtype=np.int32)
+        self._trail = [self._root]
+
+        self._alive = np.ones(len(dictionary), dtype=bool)
+        # words eliminated by each step of the history, to undo it
+        self._eliminated: List[np.ndarray] = []
+        # (-value upper bound, rank) of the candidates, None if to be rebuilt
+        self._heap: Optional[List[Tuple[int, int]]] = None
+
+    @property
+    def occurrences(self) -> Dict[str, int]:
+        """Number of candidates that contain each letter."""
+        return {
+            letter: int(self._counts[i])
+            for letter, i in self._letters.items()
+            if self._counts[i]
+        }
 
     def reset(self):
+        self.rollback(len(self.guesses))
         super().reset()
-        self._reset()
 
-    def _reset(self):
-        self.occurrences = build_occurrences(self.dictionary)
-        self.candidates = sorted(
-            self.dictionary,
-            key=metric(self.occurrences),
-            reverse=True,
-        )
+    def push(self, guess: str, feedback: str, candidates: np.ndarray = None):
+        previous = self.candidate_indices
+        super().push(guess, feedback, candidates)
+        # previous candidates still alive once the new ones are set aside
+        self._alive[self.candidate_indices] = False
+        eliminated = previous[self._alive[previous]]
+        self._alive[self.candidate_indices] = True
+        self._alive[eliminated] = False
+        self._counts = self._counts - self._presence[eliminated].sum(axis=0)
+        self._eliminated.append(eliminated)
+
+    def rollback(self, steps: int = 1):
+        super().rollback(steps)
+        for _ in range(steps):
+            eliminated = self._eliminated.pop()
+            self._alive[eliminated] = True
+            self._counts = self._counts + self._presence[eliminated].sum(axis=0)
+        if steps:
+            # counts grew back, the heap values are no longer upper bounds
+            self._heap = None
 
     def guess(self) -> str:
-        if not self.candidates:
+        indices = self.candidate_indices
+        if not len(indices):
             raise StrategyError("no candidates left")
-        return self.candidates[0]
-
-
-def metric(occurrences: Dict[str, int]) -> Callable[[str], int]:
-    def value(word: str) -> int:
-        val = 0
-        for letter in word:
-            val += occurrences[letter]
-        return val
-
-    return value
+        if indices is self._root:
+            return self.dictionary[self._root[0]]
 
+        if self._heap is None:
+            values = self._multiplicity[indices] @ self._counts
+            self._heap = list(zip((-values).tolist(), self._rank[indices].tolist()))
+            heapq.heapify(self._heap)
 
-def build_occurrences(words: List[str]) -> Dict[str, int]:
-    occurrences = {}
-    for word in words:
-        for letter in set(word):
-            if letter in occurrences:
-                occurrences[letter] += 1
-            else:
-                occurrences[letter] = 1
-    return occurrences
+        heap = self._heap
+        while True:
+            bound, rank = heap[0]
+            index = int(self._root[rank])
+            if not self._alive[index]:
+                heapq.heappop(heap)
+                continue
+            value = -int(self._multiplicity[index] @ self._counts)
+            if value == bound:
+                return self.dictionary[index]
+            heapq.heapreplace(heap, (value, rank))
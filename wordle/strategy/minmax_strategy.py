@@ -1,29 +1,14 @@
-from typing import List
+import numpy as np
 
-from wordle.strategy import Strategy, StrategyError
-from wordle.strategy.utils import evaluate_feedback
+from wordle.strategy.partition_strategy import PartitionStrategy
 
 
-class MinMaxStrategy(Strategy):
-    def __init__(self, dictionary: List[str]):
-        super().__init__(dictionary)
+class MinMaxStrategy(PartitionStrategy):
+    """Strategy that guesses the word minimizing the largest part of the
+    partition of the candidates by feedback, i.e. the worst case number of
+    candidates left."""
 
-    def guess(self) -> str:
-        if not self.candidates:
-            raise StrategyError("no candidates left")
+    name = "minmax"
 
-        best_score = float("inf")
-        best_guess = None
-        for guess in self.candidates:
-            counter = dict()
-            for target in self.candidates:
-                f = evaluate_feedback(target, guess)
-                counter[f] = counter.setdefault(f, 0) + 1
-                if counter[f] > best_score:
-                    break
-            score = max(counter.values())
-            if score < best_score:
-                best_score = score
-                best_guess = guess
-
-        return best_guess
+    def score(self, counts: np.ndarray) -> np.ndarray:
+        return counts.max(axis=1)
@@ -0,0 +1,153 @@
+from typing import Dict, List
+
+import numpy as np
+
+from wordle.config import SYMBOL_MATCH
+from wordle.feedback import (
+    BLOCK_CELLS,
+    encode_feedback,
+    evaluate_feedback_many,
+    get_feedback_matrix,
+)
+from wordle.instrumentation import instrumented
+from wordle.strategy import Strategy, StrategyError
+from wordle.strategy.entropy_strategy import entropy
+
+
+class MultiBoardStrategy:
+    """Strategy of a game of several boards, where each guess is played on every
+    board and each board has its own secret, see wordle.game.MultiWordle.
+
+    Each board keeps its own candidates in a base Strategy, sharing the feedback
+    matrix. The feedback of a guess is evaluated once on the candidates of all
+    the unsolved boards, and each board narrows its candidates from it.
+
+    The guess is the one with the highest entropy of the joint partition of the
+    unsolved boards. As the secrets are independent, that is the sum of the
+    entropies of the partition of each board, and boards with the same
+    candidates are scored once. A board with a single candidate left is solved
+    first."""
+
+    def __init__(self, dictionary: List[str], boards: int, allowed: List[str] = None):
+        if boards < 1:
+            raise ValueError("boards must be >= 1")
+        self.dictionary = dictionary
+        self.matrix = get_feedback_matrix(dictionary, allowed)
+        self.boards = [Strategy(dictionary, self.matrix) for _ in range(boards)]
+        self.guesses = []
+        self.feedback = []
+
+    @property
+    def solved(self) -> List[bool]:
+        win = SYMBOL_MATCH * self.matrix.word_length
+        return [win in board.feedback for board in self.boards]
+
+    @property
+    def active(self) -> List[Strategy]:
+        return [b for b, s in zip(self.boards, self.solved) if not s]
+
+    @instrumented("strategy.guess")
+    def guess(self) -> str:
+        active = self.active
+        if not active:
+            raise StrategyError("all the boards are solved")
+        if any(not len(b.candidate_indices) for b in active):
+            raise StrategyError("no candidates left")
+        for board in active:
+            if len(board.candidate_indices) == 1:
+                return self.dictionary[int(board.candidate_indices[0])]
+
+        # boards with the same candidates, with their number
+        boards: Dict[bytes, List] = {}
+        for board in active:
+            key = board.candidate_indices.tobytes()
+            boards.setdefault(key, [board.candidate_indices, 0])[1] += 1
+        union = np.unique(np.concatenate([c for c, _ in boards.values()]))
+        columns = [(np.searchsorted(union, c), n) for c, n in boards.values()]
+
+        if self.matrix.allowed is None:
+            pool = union
+        else:
+            pool = np.arange(len(self.matrix.guesses), dtype=np.int32)
+        bins = self.matrix.feedback_codes
+        scores = np.zeros(len(pool), dtype=np.float64)
+        block = max(1, BLOCK_CELLS // max(len(union), bins))
+        for start in range(0, len(pool), block):
+            rows = pool[start : start + block]
+            codes = self.matrix.block(rows, union)
+            offsets = np.arange(len(rows), dtype=np.int64)[:, None] * bins
+            for cols, n in columns:
+                cells = (codes[:, cols] + offsets).ravel()
+                counts = np.bincount(cells, minlength=len(rows) * bins)
+                scores[start : start + len(rows)] += n * entropy(
+                    counts.reshape(len(rows), bins)
+                )
+
+        # among the best guesses, prefer one that can solve a board
+        best = scores >= scores.max() - 1e-9
+        candidate = np.isin(pool, union, assume_unique=True)
+        if (best & candidate).any():
+            best &= candidate
+        return self.matrix.guesses[int(pool[int(np.argmax(best))])]
+
+    def reset(self):
+        self.guesses = []
+        self.feedback = []
+        for board in self.boards:
+            board.reset()
+
+    @instrumented("strategy.update")
+    def update(self, guess: str, feedback: List[str]):
+        self.push(guess, feedback)
+
+    def push(self, guess: str, feedback: List[str]):
+        """Append a guess and its feedback on each board to the history,
+        evaluating the guess once on the candidates of all the unsolved
+        boards."""
+        if len(feedback) != len(self.boards):
+            raise ValueError("expected the feedback of %d boards" % len(self.boards))
+        solved, length = self.solved, self.matrix.word_length
+        active = [b.candidate_indices for b, s in zip(self.boards, solved) if not s]
+        union = np.unique(np.concatenate(active)) if active else np.arange(0)
+        if len(guess) != length:
+            codes = None
+        elif guess in self.matrix.index:
+            codes = self.matrix.row(self.matrix.index[guess], union)
+        else:
+            codes = evaluate_feedback_many(guess, self.matrix.letters[union])
+
+        for board, f, done in zip(self.boards, feedback, solved):
+            candidates = board.candidate_indices
+            if done:
+                # a solved board keeps its secret as the only candidate
+                pass
+            elif codes is None or len(f) != length:
+                candidates = candidates[:0]
+            else:
+                code = encode_feedback(f)
+                candidates = candidates[
+                    codes[np.searchsorted(union, candidates)] == code
+                ]
+            board.push(guess, f, candidates)
+        self.guesses.append(guess)
+        self.feedback.append(list(feedback))
+
+    def rollback(self, steps: int = 1):
+        """Undo the last steps of the history."""
+        if steps > len(self.guesses):
+            raise StrategyError("cannot rollback %d steps" % steps)
+        for board in self.boards:
+            board.rollback(steps)
+        del self.guesses[len(self.guesses) - steps :]
+        del self.feedback[len(self.feedback) - steps :]
+
+    def set_history(self, guesses: List[str], feedback: List[List[str]]):
+        # keep the candidates of the history prefix in common with the current one
+        common = 0
+        for step in zip(self.guesses, self.feedback, guesses, feedback):
+            if step[0] != step[2] or list(step[1]) != list(step[3]):
+                break
+            common += 1
+        self.rollback(len(self.guesses) - common)
+        for g, f in zip(guesses[common:], feedback[common:]):
+            self.push(g, f)
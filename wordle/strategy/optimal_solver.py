@@ -0,0 +1,479 @@
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from wordle.config import MAX_ATTEMPTS
+from wordle.feedback import decode_feedback, get_feedback_matrix, partition_counts
+from wordle.strategy import StrategyError
+from wordle.strategy.precomputed_strategy import DecisionTree
+
+OBJECTIVES = ("expected", "worst")
+
+# lower bound of the cost of each guess, and the guesses worth trying in order
+Ordering = Tuple[np.ndarray, np.ndarray]
+
+# seconds between two progress reports
+PROGRESS_INTERVAL = 1.0
+
+# candidates below which sorting the codes counts the parts faster than flagging
+SORT_MAX_SIZE = 16
+
+# witnesses compared with the codes of every guess at once
+WITNESS_BLOCK = 256
+
+
+class SolverStats:
+    def __init__(self):
+        self.nodes = 0
+        self.hits = 0
+        self.pruned = 0
+        self.start = perf_counter()
+        self.reported = self.start
+        self.timeout = False
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.start
+
+
+class OptimalSolver:
+    """Branch and bound search of the decision tree that minimizes either the
+    total number of guesses to find every word of the dictionary ("expected",
+    the average times the number of words) or the maximum number of guesses
+    ("worst"), within MAX_ATTEMPTS.
+
+    Guesses of each node are tried in order of a lower bound of their cost,
+    computed from the sizes of the partition they induce on the candidates, and
+    a guess is pruned as soon as its bound can't beat the best guess found so
+    far. Solved and failed candidate sets are kept in a transposition table, as
+    the same set is reached by many paths.
+
+    An exact search first builds the greedy tree, trying only the best guess by
+    lower bound at each node, and its cost at each of its nodes bounds the search
+    of that node: only trees cheaper than the greedy one are explored. The worst
+    objective is searched by iterative deepening, from the lowest depth bound
+    up, so that each depth only looks for trees within it. When only trees of 3
+    guesses are worth searching, a node looks for a first guess after which a
+    single guess splits each part into single words. The words of a part that
+    no guess splits are kept as a witness: later guesses that give the same
+    feedback to all of them are ruled out at once, in any set holding them.
+
+    The search is exact unless `width` limits the guesses tried at each node to
+    the best ones by lower bound, or the `time_budget`, in seconds, runs out: in
+    that case the remaining nodes only try their best guess by lower bound, and
+    the result is the best tree found rather than the optimal one."""
+
+    def __init__(
+        self,
+        dictionary: List[str],
+        objective: str = "expected",
+        width: int = None,
+        time_budget: float = None,
+        progress: Callable[[SolverStats], None] = None,
+    ):
+        if objective not in OBJECTIVES:
+            raise ValueError("unknown objective: %s" % objective)
+        self.dictionary = dictionary
+        self.objective = objective
+        self.width = width
+        self.time_budget = time_budget
+        self.progress = progress
+        self.matrix = get_feedback_matrix(dictionary)
+        # feedback code of a guess that matches the secret
+        self.win = self.matrix.feedback_codes - 1
+        self.guesses = np.arange(len(dictionary), dtype=np.int32)
+        # plain view of the codes, slicing a memory map has an overhead
+        self._codes = (
+            None if self.matrix.codes is None else np.asarray(self.matrix.codes)
+        )
+        self.stats = SolverStats()
+        # (attempts left, candidates) -> (cost, guess) of solved sets, or
+        # (lower bound, None) of sets bounded or that couldn't beat a bound
+        self._table: Dict[Tuple[int, bytes], Tuple[float, Optional[int]]] = {}
+        # (attempts left, candidates) -> cost of the greedy tree of the set
+        self._incumbent: Dict[Tuple[int, bytes], float] = {}
+        # sets of words that no single guess splits into single words, and the
+        # table of them padded to the longest one, None until built
+        self._witnesses: List[np.ndarray] = []
+        self._witness_table: Optional[np.ndarray] = None
+
+        # most feedback codes other than a match that a guess gives on the
+        # dictionary, and so on any set of candidates
+        self.max_parts = 0
+        for counts in partition_counts(self.matrix, self.guesses, self.guesses):
+            counts[:, self.win] = 0
+            self.max_parts = max(self.max_parts, int((counts > 0).sum(axis=1).max()))
+
+        sizes = np.arange(len(dictionary) + 1)
+        # lower bounds of the cost of a set of candidates by its size: a guess
+        # splits a set in at most `max_parts` unsolved parts
+        self._worst_bound = np.where(
+            sizes <= 1, sizes, 2 + (sizes > self.max_parts + 1)
+        )
+        self._expected_bound = sizes + np.maximum(
+            sizes - 1, 2 * (sizes - 1) - self.max_parts
+        )
+        self._expected_bound[0] = 0
+
+    @property
+    def optimal(self) -> bool:
+        """Return if the solution is proven optimal."""
+        return self.width is None and not self.stats.timeout
+
+    def solve(self) -> Tuple[DecisionTree, float]:
+        """Return the best decision tree and its cost."""
+        candidates = np.arange(len(self.dictionary), dtype=np.int32)
+        if not len(candidates):
+            raise StrategyError("no candidates to solve")
+        if self.width is None:
+            self._incumbent = self._greedy_costs()
+        if self.objective == "worst":
+            # iterative deepening: the first depth with a tree is the optimum, and
+            # the failures of the shallower depths are kept as lower bounds
+            for depth in range(self._bound(len(candidates)), MAX_ATTEMPTS + 1):
+                cost = self._search(candidates, MAX_ATTEMPTS, depth + 1)
+                if cost <= depth:
+                    break
+            else:
+                cost = float("inf")
+        else:
+            cost = self._search(candidates, MAX_ATTEMPTS, float("inf"))
+        if cost == float("inf"):
+            raise StrategyError(
+                "no decision tree finds every word within %d attempts" % MAX_ATTEMPTS
+            )
+        return self._tree(candidates, MAX_ATTEMPTS), cost
+
+    def _greedy_costs(self) -> Dict[Tuple[int, bytes], float]:
+        """Return the cost of the greedy tree at each of its nodes, empty if it
+        doesn't find every word within MAX_ATTEMPTS."""
+        greedy = OptimalSolver(self.dictionary, self.objective, width=1)
+        try:
+            greedy.solve()
+        except StrategyError:
+            return {}
+        self.stats.nodes += greedy.stats.nodes
+        return {
+            k: cost for k, (cost, guess) in greedy._table.items() if guess is not None
+        }
+
+    def _bound(self, size: int) -> int:
+        if self.objective == "expected":
+            return int(self._expected_bound[size])
+        return int(self._worst_bound[size])
+
+    def _search(
+        self,
+        candidates: np.ndarray,
+        attempts: int,
+        beta: float,
+        ordering: Ordering = None,
+    ) -> float:
+        """Return the cost of the candidates if lower than beta, or a lower bound
+        of it not lower than beta otherwise. The ordering of the guesses is
+        computed unless given."""
+        size = len(candidates)
+        if self._worst_bound[size] > attempts:
+            return float("inf")
+        if size <= 2:
+            # guessing a candidate is optimal
+            return self._bound(size)
+
+        key = (attempts, candidates.tobytes())
+        if key in self._table:
+            cost, guess = self._table[key]
+            if guess is not None or cost >= beta:
+                self.stats.hits += 1
+                return cost
+        # the greedy tree is a solution, only cheaper ones are worth searching
+        beta = min(beta, self._incumbent.get(key, beta - 1) + 1)
+
+        self._expand()
+        best, best_guess = beta, None
+        bounds, order = ordering if ordering is not None else self._order(candidates)
+        if (
+            self.objective == "worst"
+            and beta == 4
+            and attempts >= 3
+            and len(order)
+            and bounds[order[0]] == 3
+        ):
+            # only trees of 3 guesses are worth searching: find the first guess
+            # after which each part can be split into single words, without
+            # searching the parts one guess at a time
+            guess = self._splitting_guess(candidates, order)
+            if guess is None:
+                self._table[key] = (beta, None)
+                return beta
+            cost = self._evaluate(guess, candidates, attempts, beta)
+            self._table[key] = (cost, guess)
+            return cost
+        for i, guess in enumerate(order.tolist()):
+            if bounds[guess] >= best:
+                self.stats.pruned += len(order) - i
+                break
+            if self.stats.timeout and best_guess is not None:
+                # out of time: keep the best guess found so far
+                break
+            cost = self._evaluate(guess, candidates, attempts, best)
+            if cost < best:
+                best, best_guess = cost, guess
+
+        if best_guess is None:
+            lower = max(beta, float(bounds[order[0]]) if len(order) else beta)
+            self._table[key] = (lower, None)
+            return lower
+        self._table[key] = (best, best_guess)
+        return best
+
+    def _lower(
+        self, candidates: np.ndarray, attempts: int
+    ) -> Tuple[float, Optional[Ordering]]:
+        """Return a lower bound of the cost of the candidates, from the table or
+        from the lowest bound of their guesses, and the ordering of the guesses if
+        computed for it."""
+        size = len(candidates)
+        if self._worst_bound[size] > attempts:
+            return float("inf"), None
+        if size <= 2:
+            return self._bound(size), None
+        key = (attempts, candidates.tobytes())
+        if key in self._table:
+            return self._table[key][0], None
+        bounds, order = self._order(candidates)
+        lower = float(bounds[order[0]]) if len(order) else float("inf")
+        # the same set is often bounded again through another path
+        self._table[key] = (lower, None)
+        return lower, (bounds, order)
+
+    def _order(self, candidates: np.ndarray) -> Ordering:
+        """Return the lower bound of the cost of each guess and the guesses worth
+        trying, sorted by lower bound."""
+        size = len(candidates)
+        if size <= self.max_parts + 1:
+            # no part exceeds the size bound, so the number of parts is enough
+            wins, parts = self._parts(candidates)
+            useful = np.flatnonzero(parts + wins > 1)
+            if self.objective == "expected":
+                bounds = size + 2 * (size - wins) - parts
+            else:
+                bounds = 1 + np.where(size - wins > parts, 2, parts > 0)
+            # break ties by the number of parts, then by a possible match
+            tiebreak = -(2 * parts[useful].astype(np.int64) + wins[useful])
+        else:
+            counts = np.concatenate(
+                list(partition_counts(self.matrix, self.guesses, candidates))
+            )
+            counts[:, self.win] = 0
+            if self.objective == "expected":
+                bounds = size + self._expected_bound[counts].sum(axis=1)
+            else:
+                bounds = 1 + self._worst_bound[counts].max(axis=1)
+            # guesses that don't split the candidates make no progress
+            useful = np.flatnonzero(counts.max(axis=1) < size)
+            # break ties by the sum of squares of the sizes, i.e. the expected size
+            tiebreak = (counts[useful].astype(np.int64) ** 2).sum(axis=1)
+        order = useful[np.lexsort((tiebreak, bounds[useful]))]
+        if self.width is not None:
+            order = order[: self.width]
+        if self.stats.timeout:
+            order = order[:1]
+        return bounds, order
+
+    def _parts(self, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return whether each guess can match one of the candidates, and the
+        number of other feedback codes it gives them."""
+        codes = self._block(candidates)
+        if len(candidates) < SORT_MAX_SIZE:
+            rows = np.sort(codes, axis=1)
+            wins = rows[:, -1] == self.win
+            return wins, 1 + (rows[:, 1:] != rows[:, :-1]).sum(axis=1) - wins
+        # flag the codes of each guess, faster than sorting long rows
+        seen = np.zeros((len(codes), self.matrix.feedback_codes), dtype=bool)
+        seen[np.arange(len(codes))[:, None], codes] = True
+        wins = seen[:, self.win]
+        return wins, seen.sum(axis=1) - wins
+
+    def _block(self, candidates: np.ndarray) -> np.ndarray:
+        """Return the codes of every guess against the candidates."""
+        if self._codes is not None:
+            return self._codes[:, candidates]
+        return self.matrix.block(self.guesses, candidates)
+
+    def _splitting_guess(
+        self, candidates: np.ndarray, order: np.ndarray
+    ) -> Optional[int]:
+        """Return the first guess of the order after which a single guess splits
+        each part of the candidates into single words, so that every candidate is
+        found within 3 guesses, or None."""
+        codes = self._block(candidates)
+        size = len(candidates)
+        # columns of the candidates in the codes, by dictionary index
+        columns = np.full(len(self.dictionary), -1, dtype=np.int64)
+        columns[candidates] = np.arange(size)
+        witnesses = self._witnesses_within(columns)
+        ruled_out = self._unsplit(codes, columns[witnesses])
+
+        for guess in order.tolist():
+            if ruled_out[guess]:
+                self.stats.pruned += 1
+                continue
+            row = codes[guess]
+            positions = np.argsort(row, kind="stable")
+            starts = np.flatnonzero(
+                np.diff(row[positions].astype(np.int32), prepend=-1)
+            )
+            sizes = np.diff(np.append(starts, size))
+            # parts of one or two words are split by guessing one of them, and the
+            # largest parts are the most likely to fail
+            large = np.flatnonzero(sizes > 2)
+            for p in large[np.argsort(-sizes[large], kind="stable")].tolist():
+                part = positions[starts[p] : starts[p] + sizes[p]]
+                if not self._splittable(codes[:, part]):
+                    break
+            else:
+                return guess
+            self.stats.pruned += 1
+            # the words of the part that failed rule out the later guesses that
+            # keep them together, here and in every other set holding them
+            witness = self._witness(candidates[part])
+            self._witnesses.append(witness)
+            self._witness_table = None
+            ruled_out |= self._unsplit(codes, columns[witness][None])
+        return None
+
+    def _witnesses_within(self, columns: np.ndarray) -> np.ndarray:
+        """Return the witnesses whose words are all candidates, padded with their
+        last word, given the columns of the candidates by dictionary index."""
+        if self._witness_table is None:
+            width = max((len(w) for w in self._witnesses), default=1)
+            self._witness_table = np.array(
+                [np.pad(w, (0, width - len(w)), "edge") for w in self._witnesses],
+                dtype=np.int64,
+            ).reshape(-1, width)
+        table = self._witness_table
+        return table[(columns[table] >= 0).all(axis=1)]
+
+    def _unsplit(self, codes: np.ndarray, witnesses: np.ndarray) -> np.ndarray:
+        """Return the guesses giving a single feedback code to every word of one
+        of the witnesses, by columns in the codes."""
+        unsplit = np.zeros(len(codes), dtype=bool)
+        for start in range(0, len(witnesses), WITNESS_BLOCK):
+            block = codes[:, witnesses[start : start + WITNESS_BLOCK]]
+            unsplit |= (block == block[:, :, :1]).all(axis=2).any(axis=1)
+        return unsplit
+
+    def _witness(self, part: np.ndarray) -> np.ndarray:
+        """Return a few words of a part that no guess splits into single words,
+        as sorted dictionary indices: the words are added one at a time, each
+        leaving the fewest guesses telling them all apart, then dropped while the
+        others are still not split."""
+        codes = self._block(part)
+        chosen = [0]
+        apart = np.ones(len(codes), dtype=bool)
+        while apart.any():
+            # guesses telling apart the chosen words and each other word
+            differ = (codes[:, :, None] != codes[:, None, chosen]).all(axis=2)
+            differ &= apart[:, None]
+            counts = differ.sum(axis=0)
+            counts[chosen] = len(codes) + 1
+            word = int(np.argmin(counts))
+            chosen.append(word)
+            apart = differ[:, word]
+        for word in list(chosen):
+            rest = [w for w in chosen if w != word]
+            if not self._splittable(codes[:, rest]):
+                chosen = rest
+        return np.sort(part[chosen])
+
+    def _splittable(self, codes: np.ndarray) -> bool:
+        """Return if a guess splits the words of the codes into single words, by
+        giving each of them a different feedback code."""
+        size = codes.shape[1]
+        if size > self.max_parts + 1:
+            return False
+        rows = np.sort(codes, axis=1)
+        return bool((rows[:, 1:] != rows[:, :-1]).all(axis=1).any())
+
+    def _evaluate(
+        self, guess: int, candidates: np.ndarray, attempts: int, best: float
+    ) -> float:
+        """Return the cost of the guess if lower than best, or infinity."""
+        codes = self.matrix.row(guess, candidates)
+        order = np.argsort(codes, kind="stable")
+        values, starts = np.unique(codes[order], return_index=True)
+        parts = [
+            part
+            for value, part in zip(values, np.split(candidates[order], starts[1:]))
+            if value != self.win
+        ]
+        # the largest parts first, they are the most likely to exceed the bound
+        parts.sort(key=len, reverse=True)
+        # bound the parts by their best guess before searching any of them, so
+        # that most guesses are dropped without a search
+        lowers = [self._bound(len(part)) for part in parts]
+        orderings: List[Optional[Ordering]] = [None] * len(parts)
+
+        if self.objective == "expected":
+            total = len(candidates)
+            remaining = sum(lowers)
+            for i, part in enumerate(parts):
+                lower, orderings[i] = self._lower(part, attempts - 1)
+                remaining += lower - lowers[i]
+                lowers[i] = lower
+                if total + remaining >= best:
+                    return float("inf")
+            for part, lower, ordering in zip(parts, lowers, orderings):
+                remaining -= lower
+                beta = best - total - remaining
+                total += self._search(part, attempts - 1, beta, ordering)
+                if total + remaining >= best:
+                    return float("inf")
+            return total
+
+        for i, part in enumerate(parts):
+            # the best guess of a part adds at most one to the bound of its size
+            if 1 + self._bound(len(part)) + 1 < best:
+                continue
+            lower, orderings[i] = self._lower(part, attempts - 1)
+            if 1 + lower >= best:
+                return float("inf")
+        worst = 1
+        for part, ordering in zip(parts, orderings):
+            worst = max(worst, 1 + self._search(part, attempts - 1, best - 1, ordering))
+            if worst >= best:
+                return float("inf")
+        return worst
+
+    def _expand(self):
+        self.stats.nodes += 1
+        now = perf_counter()
+        timeout = (
+            self.time_budget is not None
+            and not self.stats.timeout
+            and now - self.stats.start > self.time_budget
+        )
+        if timeout:
+            self.stats.timeout = True
+        if timeout or now - self.stats.reported >= PROGRESS_INTERVAL:
+            self.stats.reported = now
+            if self.progress is not None:
+                self.progress(self.stats)
+
+    def _tree(self, candidates: np.ndarray, attempts: int) -> DecisionTree:
+        if len(candidates) <= 2:
+            guess = int(candidates[0])
+        else:
+            _, guess = self._table[(attempts, candidates.tobytes())]
+        codes = self.matrix.row(guess, candidates)
+        order = np.argsort(codes, kind="stable")
+        values, starts = np.unique(codes[order], return_index=True)
+        parts = np.split(candidates[order], starts[1:])
+        choice = {}
+        # branches in order of first appearance, as in build_tree
+        for i in np.argsort(order[starts], kind="stable").tolist():
+            if values[i] != self.win:
+                feedback = decode_feedback(int(values[i]), self.matrix.word_length)
+                choice[feedback] = self._tree(parts[i], attempts - 1)
+        return DecisionTree(self.dictionary[guess], choice)
@@ -0,0 +1,145 @@
+import hashlib
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from wordle.feedback import (
+    BLOCK_CELLS,
+    FeedbackMatrix,
+    get_feedback_matrix,
+    partition_counts,
+)
+from wordle.strategy import Strategy, StrategyError
+from wordle.strategy.cache import get_guess_cache
+
+
+class PartitionStrategy(Strategy):
+    """Base strategy that scores each guess by the partition it induces on the
+    candidates, i.e. by the number of candidates that give each feedback, and
+    guesses the first one with the lowest `score`.
+
+    The guesses are the candidates, unless a list of `allowed` guesses is given:
+    then every allowed word and dictionary word can be guessed, preferring the
+    candidates among the best ones. Guesses other than the candidates are pruned
+    as the candidates narrow: those whose letters are all resolved and those
+    inducing a single part are dropped, and those inducing the same partition as
+    an earlier one are collapsed into it. As both only hold more on fewer
+    candidates, each step scores the pool left by the previous one."""
+
+    # name of the guess cache of the strategy, and version of its guesses to bump
+    # when they change, so that the saved caches are not reused
+    name: str = None
+    version: int = 2
+
+    def __init__(self, dictionary: List[str], allowed: List[str] = None):
+        matrix = get_feedback_matrix(dictionary, allowed)
+        cache = get_guess_cache(self.name, dictionary, allowed, version=self.version)
+        super().__init__(dictionary, matrix, cache)
+        # guesses left to score at each step, None until scored at that step
+        self._pools: List[Optional[np.ndarray]] = [None]
+
+    def score(self, counts: np.ndarray) -> np.ndarray:
+        """Return the score of each row of partition counts, the lower the
+        better."""
+        raise NotImplementedError
+
+    def reset(self):
+        super().reset()
+        self._pools = [None]
+
+    def push(self, guess: str, feedback: str, candidates: np.ndarray = None):
+        super().push(guess, feedback, candidates)
+        self._pools.append(None)
+
+    def rollback(self, steps: int = 1):
+        super().rollback(steps)
+        del self._pools[len(self._trail) :]
+
+    def _guess(self) -> str:
+        indices = self.candidate_indices
+        if not len(indices):
+            raise StrategyError("no candidates left")
+        if self.matrix.allowed is None or len(indices) == 1:
+            scores = np.concatenate(
+                [
+                    self.score(counts)
+                    for counts in partition_counts(self.matrix, indices, indices)
+                ]
+            )
+            # argmin returns the first best guess in candidates order
+            return self.dictionary[indices[int(np.argmin(scores))]]
+
+        others = self._others(indices)
+        guesses, scores = [indices], [
+            self.score(counts)
+            for counts in partition_counts(self.matrix, indices, indices)
+        ]
+        for rows, counts in distinct_partitions(self.matrix, others, indices):
+            if not len(rows):
+                continue
+            guesses.append(rows)
+            scores.append(self.score(counts))
+        guesses, scores = np.concatenate(guesses), np.concatenate(scores)
+        self._pools[-1] = np.union1d(indices, guesses[len(indices) :])
+        # candidates come first, then the other guesses in dictionary order
+        return self.matrix.guesses[int(guesses[int(np.argmin(scores))])]
+
+    def _others(self, indices: np.ndarray) -> np.ndarray:
+        """Return the guesses other than the candidates left to score, from the
+        pool of the closest step scored before, without the resolved ones."""
+        pool = next((p for p in reversed(self._pools) if p is not None), None)
+        if pool is None:
+            pool = np.arange(len(self.matrix.guesses), dtype=np.int32)
+        others = pool[~np.isin(pool, indices, assume_unique=True)]
+        letters = self.matrix.letters
+        return others[~resolved_guesses(letters[others], letters[indices])]
+
+
+def resolved_guesses(guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Return the mask of the guesses, as letter arrays, whose letters are all
+    resolved: each letter of the guess is at its position in every candidate or
+    in none, and every candidate has the same number of it. Such a guess gives
+    the same feedback for every candidate."""
+    size, length = candidates.shape
+    resolved = np.ones(len(guesses), dtype=bool)
+    for i in range(length):
+        at = np.bincount(candidates[:, i], minlength=256)
+        resolved &= ((at == 0) | (at == size))[guesses[:, i]]
+
+    alphabet = np.unique(candidates)
+    counts = (candidates[:, :, None] == alphabet).sum(axis=1)
+    same = np.ones(256, dtype=bool)
+    same[alphabet] = (counts == counts[0]).all(axis=0)
+    return resolved & same[guesses].all(axis=1)
+
+
+def distinct_partitions(
+    matrix: FeedbackMatrix, guesses: np.ndarray, candidates: np.ndarray
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield, for consecutive blocks of guesses, the guesses that split the
+    candidates into a partition not induced by an earlier guess, with their
+    partition counts as in `partition_counts`.
+
+    Each candidate is labeled by the first candidate of its part, so that guesses
+    inducing the same partition with different feedback have the same labels."""
+    size, bins = len(candidates), matrix.feedback_codes
+    positions = np.arange(size, dtype=np.int64)
+    seen = set()
+    block = max(1, BLOCK_CELLS // max(size, bins))
+    for start in range(0, len(guesses), block):
+        rows = guesses[start : start + block]
+        cells = matrix.block(rows, candidates)
+        cells = (cells + np.arange(len(rows), dtype=np.int64)[:, None] * bins).ravel()
+        counts = np.bincount(cells, minlength=len(rows) * bins)
+        first = np.full(len(rows) * bins, size, dtype=np.int64)
+        np.minimum.at(first, cells, np.tile(positions, len(rows)))
+        labels = first[cells].astype(np.int32).reshape(len(rows), size)
+        counts = counts.reshape(len(rows), bins)
+
+        keep = []
+        for i in np.flatnonzero(counts.max(axis=1) < size).tolist():
+            key = hashlib.blake2b(labels[i].tobytes(), digest_size=16).digest()
+            if key not in seen:
+                seen.add(key)
+                keep.append(i)
+        yield rows[keep], counts[keep]
@@ -1,10 +1,17 @@
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from os.path import exists
 
-from wordle.config import SYMBOL_MATCH, MAX_ATTEMPTS
+import numpy as np
+from joblib import Parallel, delayed
+
+from wordle.config import SYMBOL_MATCH, MAX_ATTEMPTS, PARALLEL_TREE_DEPTH
+from wordle.dictionary import intern_dictionary
 from wordle.strategy import Strategy, StrategyError
-from wordle.strategy.utils import evaluate_feedback
+from wordle.strategy.binary_tree import MappedTree, write_tree
+from wordle.feedback import decode_feedback
+from wordle.files import write_aside
+from wordle.utils import evaluate_feedback_code
 
 
 class DecisionTree:
@@ -12,6 +19,10 @@ class DecisionTree:
         self.guess = guess
         self.choice = choice
 
+    def child(self, feedback: str) -> Optional["DecisionTree"]:
+        """Return the child of the feedback, or None if there is no such branch."""
+        return self.choice.get(feedback)
+
     def to_dict(self) -> Dict[str, Dict]:
         return {
             "guess": self.guess,
@@ -31,54 +42,164 @@ def build_tree_from_dict(d: Dict) -> DecisionTree:
     return DecisionTree(guess, choice)
 
 
+def candidate_partition(strategy: Strategy, guess: str) -> Dict[str, np.ndarray]:
+    """Partition the strategy candidates by their feedback to the guess, in order
+    of first appearance of each feedback. Each part keeps the candidates order."""
+    candidates = strategy.candidate_indices
+    matrix = strategy.matrix
+    if matrix is not None and guess in matrix.index:
+        codes = matrix.row(matrix.index[guess], candidates)
+    else:
+        codes = np.array(
+            [
+                evaluate_feedback_code(strategy.dictionary[i], guess)
+                for i in candidates.tolist()
+            ],
+            dtype=np.int64,
+        )
+    order = np.argsort(codes, kind="stable")
+    values, starts = np.unique(codes[order], return_index=True)
+    parts = np.split(candidates[order], starts[1:])
+    # order[starts] is the first appearance of each code
+    return {
+        decode_feedback(int(values[i]), len(guess)): parts[i]
+        for i in np.argsort(order[starts], kind="stable").tolist()
+    }
+
+
 def build_tree(
     strategy: Strategy, guesses: List[str], feedback: List[str]
 ) -> DecisionTree:
     if len(guesses) > MAX_ATTEMPTS:
         return None
-    choice = dict()
     strategy.reset()
     strategy.set_history(guesses, feedback)
+    return _build_subtree(strategy)
+
+
+def _build_subtree(strategy: Strategy) -> DecisionTree:
+    """Build the tree from the current strategy state, handing each branch the
+    part of the candidates that gives its feedback instead of filtering them
+    again."""
+    if len(strategy.guesses) > MAX_ATTEMPTS:
+        return None
+
+    choice = dict()
     g = strategy.guess()
-    for target in strategy.candidates:
-        f = evaluate_feedback(target, g)
-        if f in choice:
-            continue
-        if f == SYMBOL_MATCH * 5:
+    for f, candidates in candidate_partition(strategy, g).items():
+        if f == SYMBOL_MATCH * len(g):
             continue
-        guesses.append(g)
-        feedback.append(f)
-        tree = build_tree(strategy, guesses, feedback)
+        strategy.push(g, f, candidates)
+        tree = _build_subtree(strategy)
+        strategy.rollback()
         if tree is not None:
             choice[f] = tree
-        guesses.pop()
-        feedback.pop()
+
+    return DecisionTree(g, choice)
+
+
+Subtask = Tuple[int, List[str], List[str], Dict[str, DecisionTree]]
+
+
+def build_tree_parallel(
+    strategy: Strategy, jobs: int, depth: int = PARALLEL_TREE_DEPTH
+) -> DecisionTree:
+    """Build the same tree of `build_tree`, expanding the nodes above `depth`
+    serially and building the subtrees below it in a pool of `jobs` processes.
+
+    Subtrees are submitted one at a time from the largest candidates set to the
+    smallest, so that idle workers pick up the next largest subtree and the huge
+    branches don't end up last."""
+    subtasks = []
+    strategy.reset()
+    tree = _build_frontier(strategy, depth, subtasks)
+    subtasks.sort(key=lambda subtask: subtask[0], reverse=True)
+    subtrees = Parallel(n_jobs=jobs, batch_size=1, pre_dispatch="all")(
+        delayed(build_tree)(strategy, guesses, feedback)
+        for _, guesses, feedback, _ in subtasks
+    )
+    for (_, _, feedback, choice), subtree in zip(subtasks, subtrees):
+        if subtree is None:
+            del choice[feedback[-1]]
+        else:
+            choice[feedback[-1]] = subtree
+    return tree
+
+
+def _build_frontier(
+    strategy: Strategy, depth: int, subtasks: List[Subtask]
+) -> DecisionTree:
+    """Build the tree down to `depth`, appending a subtask for each subtree below
+    it. Subtrees are replaced by placeholders to keep the choice order."""
+    if len(strategy.guesses) > MAX_ATTEMPTS:
+        return None
+    choice = dict()
+    g = strategy.guess()
+    for f, candidates in candidate_partition(strategy, g).items():
+        if f == SYMBOL_MATCH * len(g):
+            continue
+        strategy.push(g, f, candidates)
+        if len(strategy.guesses) < depth:
+            tree = _build_frontier(strategy, depth, subtasks)
+            if tree is not None:
+                choice[f] = tree
+        else:
+            choice[f] = None
+            history = (list(strategy.guesses), list(strategy.feedback))
+            subtasks.append((len(candidates), *history, choice))
+        strategy.rollback()
 
     return DecisionTree(g, choice)
 
 
 class PrecomputedStrategy(Strategy):
+    """Strategy that follows a decision tree, either given, built from another
+    strategy or loaded from a file. Files ending with `.json` are parsed into a
+    DecisionTree, while binary files are memory mapped and only the nodes of the
+    played path are decoded.
+
+    The guesses follow the tree, so the candidates are never narrowed: they stay
+    the whole dictionary."""
+
     def __init__(
         self,
         dictionary: List[str] = None,
         strategy: Strategy = None,
         filename: str = None,
+        jobs: int = 1,
+        depth: int = PARALLEL_TREE_DEPTH,
+        decision_tree: DecisionTree = None,
     ):
-        if strategy is not None and dictionary is not None:
+        if decision_tree is not None and dictionary is not None:
+            super().__init__(dictionary)
+            self._decision_tree = decision_tree
+            self._reset()
+        elif strategy is not None and dictionary is not None:
             super().__init__(dictionary)
-            self._decision_tree = build_tree(strategy, [], [])
+            if jobs == 1:
+                self._decision_tree = build_tree(strategy, [], [])
+            else:
+                self._decision_tree = build_tree_parallel(strategy, jobs, depth)
             self._reset()
         elif filename is not None:
-            super().__init__([])
             if not exists(filename):
                 raise FileNotFoundError("file {} does not exist".format(filename))
-            content = json.loads(open(filename, "r").read())
-            self.dictionary = content["dictionary"]
-            self._decision_tree = build_tree_from_dict(content["decision_tree"])
+            if str(filename).endswith(".json"):
+                content = json.loads(open(filename, "r").read())
+                super().__init__(intern_dictionary(content["dictionary"]))
+                self._decision_tree = build_tree_from_dict(content["decision_tree"])
+            else:
+                tree = MappedTree(filename)
+                super().__init__(intern_dictionary(tree.words))
+                self._decision_tree = tree.root
             self._reset()
         else:
             raise StrategyError("no strategy or filename given")
 
+    @property
+    def decision_tree(self) -> DecisionTree:
+        return self._decision_tree
+
     def guess(self) -> str:
         return self._current_subtree.guess
 
@@ -93,14 +214,21 @@ class PrecomputedStrategy(Strategy):
                         f"{self._current_subtree.guess}"
                     )
                 )
-            self._current_subtree = self._current_subtree.choice[f]
+            child = self._current_subtree.child(f)
+            if child is None:
+                raise StrategyError("unexpected feedback {} for {}".format(f, g))
+            self._current_subtree = child
+
+    def push(self, guess: str, feedback: str, candidates: np.ndarray = None):
+        super().push(guess, feedback, self.candidate_indices)
 
     def update(self, guess: str, feedback: str):
         if guess != self._current_subtree.guess:
             raise StrategyError("guess does not match")
-        if feedback not in self._current_subtree.choice:
-            raise StrategyError("unexpected feedback %s", feedback)
-        self._current_subtree = self._current_subtree.choice[feedback]
+        child = self._current_subtree.child(feedback)
+        if child is None:
+            raise StrategyError("unexpected feedback {}".format(feedback))
+        self._current_subtree = child
 
     def reset(self):
         super().reset()
@@ -113,8 +241,18 @@ class PrecomputedStrategy(Strategy):
         return json.dumps(
             {
                 "decision_tree": self._decision_tree.to_dict(),
-                "dictionary": self.dictionary,
+                "dictionary": list(self.dictionary),
             },
             indent=2,
             sort_keys=True,
         )
+
+    def save(self, filename: str):
+        """Save the decision tree, as JSON if the filename ends with `.json` or in
+        the binary format otherwise."""
+        if str(filename).endswith(".json"):
+            with write_aside(filename) as partial:
+                with open(partial, "w", encoding="utf8") as f:
+                    f.write(self.json())
+        else:
+            write_tree(self._decision_tree, self.dictionary, filename)
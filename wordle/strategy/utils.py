@@ -1,5 +1,16 @@
 from typing import List
 
+import numpy as np
+
+from wordle.dictionary import encode_words
+from wordle.feedback import (
+    FEEDBACK_DIGITS,
+    FeedbackMatrix,
+    encode_feedback,
+    evaluate_feedback_many,
+)
+from wordle.instrumentation import instrumented
+from wordle.strategy.constraints import ConstraintIndex
 from wordle.utils import evaluate_feedback
 
 
@@ -13,7 +24,63 @@ def is_candidate(word: str, guesses: List[str], feedback: List[str]) -> bool:
     return True
 
 
+def _valid_feedback(feedback: str) -> bool:
+    """Return if every symbol of the feedback is a feedback symbol: no word is
+    consistent with an invalid feedback."""
+    return all(symbol in FEEDBACK_DIGITS for symbol in feedback)
+
+
+@instrumented("filter_candidates")
 def filter_candidates(
-    candidates: List[str], guesses: List[str], feedback: List[str]
+    candidates: List[str],
+    guesses: List[str],
+    feedback: List[str],
+    matrix: FeedbackMatrix = None,
 ) -> List[str]:
-    return list(filter(lambda word: is_candidate(word, guesses, feedback), candidates))
+    """Filter the candidates that are consistent with the history of guesses and
+    feedback, looking feedback up in the matrix when all the words are part of
+    its dictionary, or evaluating each guess against the candidates otherwise."""
+    if not all(_valid_feedback(f) for f in feedback):
+        return []
+    if matrix is not None and all(g in matrix.index for g in guesses):
+        try:
+            indices = matrix.indices(candidates)
+        except KeyError:
+            pass
+        else:
+            keep = np.ones(len(indices), dtype=bool)
+            for g, f in zip(guesses, feedback):
+                if len(f) != matrix.word_length:
+                    return []
+                keep &= matrix.row(matrix.index[g], indices) == encode_feedback(f)
+            return [c for c, k in zip(candidates, keep) if k]
+
+    if not guesses or not len(candidates):
+        return list(candidates)
+    letters = encode_words(candidates)
+    keep = np.ones(len(candidates), dtype=bool)
+    for g, f in zip(guesses, feedback):
+        if len(g) != letters.shape[1] or len(f) != letters.shape[1]:
+            return []
+        keep &= evaluate_feedback_many(g, letters) == encode_feedback(f)
+    return [c for c, k in zip(candidates, keep.tolist()) if k]
+
+
+@instrumented("narrow_candidates")
+def narrow_candidates(
+    candidates: np.ndarray,
+    guess: str,
+    feedback: str,
+    constraints: ConstraintIndex,
+    matrix: FeedbackMatrix = None,
+) -> np.ndarray:
+    """Return the indices of the candidate words consistent with a single guess
+    and its feedback, looking feedback up in the matrix of the words if given."""
+    if not _valid_feedback(feedback):
+        return candidates[:0]
+    if matrix is not None and guess in matrix.index:
+        if len(feedback) != matrix.word_length:
+            return candidates[:0]
+        code = encode_feedback(feedback)
+        return candidates[matrix.row(matrix.index[guess], candidates) == code]
+    return constraints.filter(candidates, guess, feedback)
@@ -0,0 +1,95 @@
+from typing import Dict, List
+
+import numpy as np
+
+from wordle.config import MAX_ATTEMPTS
+from wordle.dictionary import encode_words
+from wordle.feedback import encode_feedback, evaluate_feedback_pairs, feedback_codes
+from wordle.strategy.precomputed_strategy import DecisionTree
+
+
+def analyze_tree(tree: DecisionTree, words: List[str]) -> Dict:
+    """Return the number of guesses the tree takes for each secret among the
+    words, without playing the games.
+
+    The secrets are pushed down the tree a level at a time: the feedback of the
+    guess of each node against each secret reaching it is evaluated in one batch
+    for the whole level, and the secrets are grouped by node and feedback to
+    reach the children. Each node reached is visited once, so that the work is
+    linear in the nodes and in the secrets of each level, and the nodes of binary
+    trees are decoded only when reached.
+
+    The report has the histogram, average and maximum of the number of guesses
+    of the solved secrets, the secrets solved in more than MAX_ATTEMPTS guesses
+    (failures) and those whose feedback has no branch in the tree."""
+    letters = encode_words(words)
+    length = letters.shape[1]
+    bins = feedback_codes(length)
+    depths = np.zeros(len(words), dtype=np.int64)
+    missing = []
+    nodes = 0
+
+    level = [(tree, np.arange(len(words)))]
+    depth = 1
+    while level:
+        nodes += len(level)
+        guesses = [node.guess for node, _ in level]
+        valid = [len(g) == length for g in guesses]
+        missing += [s for (_, s), v in zip(level, valid) if not v]
+        level = [x for x, v in zip(level, valid) if v]
+        guesses = encode_words([g for g, v in zip(guesses, valid) if v])
+        if not level:
+            break
+
+        secrets = np.concatenate([s for _, s in level])
+        owners = np.repeat(np.arange(len(level)), [len(s) for _, s in level])
+        codes = evaluate_feedback_pairs(guesses[owners], letters[secrets])
+        solved = codes == bins - 1
+        depths[secrets[solved]] = depth
+
+        keys = owners[~solved] * bins + codes[~solved]
+        order = np.argsort(keys, kind="stable")
+        values, starts = np.unique(keys[order], return_index=True)
+        parts = np.split(secrets[~solved][order], starts[1:])
+        choices = {}
+        next_level = []
+        for key, part in zip(values.tolist(), parts):
+            owner, code = divmod(key, bins)
+            if owner not in choices:
+                choices[owner] = _children(level[owner][0], length)
+            child = choices[owner].get(code)
+            if child is None:
+                missing.append(part)
+            else:
+                next_level.append((child, part))
+        level = next_level
+        depth += 1
+
+    solved = depths[depths > 0]
+    worst = int(solved.max()) if len(solved) else 0
+    histogram = np.bincount(solved, minlength=max(worst, MAX_ATTEMPTS) + 1)
+    missing = np.sort(np.concatenate(missing)) if missing else np.arange(0)
+    failures = np.flatnonzero(depths > MAX_ATTEMPTS)
+    return {
+        "secrets": len(words),
+        "nodes": nodes,
+        "avg guesses": float(solved.mean()) if len(solved) else None,
+        "worst guesses": worst,
+        "histogram": {n: int(histogram[n]) for n in range(1, len(histogram))},
+        "failures": [words[i] for i in failures.tolist()],
+        "no branch": [words[i] for i in missing.tolist()],
+    }
+
+
+def _children(node: DecisionTree, length: int) -> Dict[int, DecisionTree]:
+    """Return the children of the node by feedback code. Branches of malformed
+    feedback are left out, as no secret reaches them."""
+    children = {}
+    for feedback, child in node.choice.items():
+        if child is None or len(feedback) != length:
+            continue
+        try:
+            children[encode_feedback(feedback)] = child
+        except ValueError:
+            pass
+    return children
@@ -1,18 +1,81 @@
-import functools
-from typing import List
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
 
-from wordle.config import SYMBOL_MATCH, SYMBOL_MISPLACED, SYMBOL_MISS
+from wordle.config import (
+    FEEDBACK_CACHE_SIZE,
+    SYMBOL_MATCH,
+    SYMBOL_MISPLACED,
+    SYMBOL_MISS,
+)
+from wordle.dictionary import load_words  # noqa: F401
+from wordle.feedback import decode_feedback, encode_feedback
+from wordle.instrumentation import instrumentation
 
 
-def load_words(filename: str) -> List[str]:
-    with open(filename, "r", encoding="utf8") as file:
-        words = file.read().splitlines()
-        words = list(filter(lambda w: len(w) == 5, words))
-    return words
+class FeedbackCache:
+    """Least recently used cache of feedback codes by (word, guess), bounded to
+    `max_entries` codes and counting hits, misses and evictions."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._codes: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def get(self, word: str, guess: str, compute: Callable[[str, str], int]) -> int:
+        key = (word, guess)
+        code = self._codes.get(key)
+        if code is not None:
+            self.hits += 1
+            self._codes.move_to_end(key)
+            return code
+
+        self.misses += 1
+        code = compute(word, guess)
+        if self.max_entries > 0:
+            self._codes[key] = code
+            if len(self._codes) > self.max_entries:
+                self._codes.popitem(last=False)
+                self.evictions += 1
+        return code
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._codes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self._codes.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+feedback_cache = FeedbackCache(FEEDBACK_CACHE_SIZE)
 
 
-@functools.cache
 def evaluate_feedback(word: str, guess: str) -> str:
+    return decode_feedback(evaluate_feedback_code(word, guess), len(guess))
+
+
+def evaluate_feedback_code(word: str, guess: str) -> int:
+    """Return the feedback of the guess on the word as an integer code, see
+    `wordle.feedback.encode_feedback`."""
+    if instrumentation.enabled:
+        instrumentation.count("evaluate_feedback")
+    return feedback_cache.get(word, guess, _evaluate_feedback_code)
+
+
+def _evaluate_feedback_code(word: str, guess: str) -> int:
+    return encode_feedback(compute_feedback(word, guess))
+
+
+def compute_feedback(word: str, guess: str) -> str:
     feedback = []
     word_indexes = {}
     for guess_index, guess_letter in enumerate(guess):